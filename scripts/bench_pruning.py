@@ -0,0 +1,83 @@
+"""Size, latency and accuracy of one MLP pruned to increasing sparsities.
+
+The reference model is either an exported ``.mlpc`` file (``--model``) or a
+freshly initialized network compiled from ``--architecture``. With
+``--mnist`` the comparison runs on the MNIST test set and reports accuracy;
+otherwise random inputs are used and only agreement with the dense model is
+shown.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if SRC_DIR.exists():  # pragma: no branch - guard against missing path
+    sys.path.insert(0, str(SRC_DIR))
+
+from mlp_compiler.compiler import compile_model
+from mlp_compiler.export import load_mlp
+from mlp_compiler.pruning import SCOPES, pruning_report
+
+
+DEFAULT_ARCHITECTURE = "Dense(300, relu) -> Dense(100, relu) -> Dense(10, softmax)"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", type=Path, default=None, help="Modelo exportado (.mlpc).")
+    parser.add_argument("--architecture", type=str, default=DEFAULT_ARCHITECTURE)
+    parser.add_argument("--input-dim", type=int, default=784)
+    parser.add_argument("--mnist", action="store_true", help="Evalúa sobre el test de MNIST.")
+    parser.add_argument("--samples", type=int, default=2000, help="Filas evaluadas.")
+    parser.add_argument(
+        "--sparsities",
+        type=lambda value: [float(item) for item in value.split(",")],
+        default=[0.5, 0.8, 0.9, 0.95, 0.98],
+        help="Fracciones de pesos a podar, separadas por comas.",
+    )
+    parser.add_argument("--scope", choices=SCOPES, default="global", help="Umbral global o por capa.")
+    parser.add_argument("--batch-size", type=int, default=256, help="Filas por llamada al medir latencia.")
+    parser.add_argument("--calls", type=int, default=200, help="Llamadas medidas por modelo.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.model is not None:
+        reference = load_mlp(args.model, mmap=False)
+    else:
+        reference = compile_model(args.architecture, input_dim=args.input_dim, backend="numpy")
+    input_dim = reference.layers[0].in_features
+
+    y = None
+    if args.mnist:
+        from mlp_compiler.training import load_mnist
+
+        _, (x, y) = load_mnist(limit_train=1, limit_test=args.samples)
+        x = np.asarray(x)
+    else:
+        x = np.random.rand(args.samples, input_dim)
+
+    rows = pruning_report(
+        reference, args.sparsities, x, y, scope=args.scope, batch_size=args.batch_size, calls=args.calls
+    )
+    print(
+        f"{'modelo':<10} {'poda':>6} {'CSR':>4} {'bytes':>10} {'x menor':>8} "
+        f"{'acuerdo':>8} {'precisión':>10} {'latencia':>12}"
+    )
+    for row in rows:
+        accuracy = f"{row['accuracy']:.4f}" if row["accuracy"] is not None else "-"
+        label = "reference" if row["target"] is None else f"{row['target']:.1%}"
+        print(
+            f"{label:<10} {row['sparsity']:>6.1%} {row['sparse_layers']:>4d} {row['nbytes']:>10d} "
+            f"{row['size_ratio']:>8.2f} {row['agreement']:>8.4f} {accuracy:>10} {row['latency'] * 1e3:>9.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
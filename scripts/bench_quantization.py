@@ -0,0 +1,92 @@
+"""Size, latency and accuracy of float64/float32/float16/int8 variants of one MLP.
+
+The reference model is either an exported ``.mlpc`` file (``--model``) or a
+freshly initialized network compiled from ``--architecture``. With
+``--mnist`` the comparison runs on the MNIST test set and reports accuracy;
+otherwise random inputs are used and only agreement with float64 is shown.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if SRC_DIR.exists():  # pragma: no branch - guard against missing path
+    sys.path.insert(0, str(SRC_DIR))
+
+from mlp_compiler.compiler import compile_model
+from mlp_compiler.export import load_mlp
+from mlp_compiler.quantization import quantization_report, quantize_mlp
+
+
+DEFAULT_ARCHITECTURE = "Dense(300, relu) -> Dense(100, relu) -> Dense(10, softmax)"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", type=Path, default=None, help="Modelo exportado (.mlpc).")
+    parser.add_argument("--architecture", type=str, default=DEFAULT_ARCHITECTURE)
+    parser.add_argument("--input-dim", type=int, default=784)
+    parser.add_argument("--mnist", action="store_true", help="Evalúa sobre el test de MNIST.")
+    parser.add_argument("--samples", type=int, default=2000, help="Filas evaluadas.")
+    parser.add_argument("--calibration", type=int, default=256, help="Filas de calibración int8.")
+    parser.add_argument("--batch-size", type=int, default=256, help="Filas por llamada al medir latencia.")
+    parser.add_argument("--calls", type=int, default=200, help="Llamadas medidas por modelo.")
+    return parser.parse_args()
+
+
+def _latency(fn: Callable[[], Any], calls: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    args = parse_args()
+    if args.model is not None:
+        reference = load_mlp(args.model, mmap=False).astype("float64")
+    else:
+        reference = compile_model(args.architecture, input_dim=args.input_dim, backend="numpy")
+    input_dim = reference.layers[0].in_features
+
+    y = None
+    if args.mnist:
+        from mlp_compiler.training import load_mnist
+
+        (x_cal, _), (x, y) = load_mnist(limit_train=args.calibration, limit_test=args.samples)
+        x, x_cal = np.asarray(x), np.asarray(x_cal)
+    else:
+        x = np.random.rand(args.samples, input_dim)
+        x_cal = np.random.rand(args.calibration, input_dim)
+
+    candidates = {
+        "float32": reference.astype("float32"),
+        "float16": reference.astype("float16"),
+        "int8": quantize_mlp(reference, x_cal),
+    }
+    rows = quantization_report(reference, candidates, x, y)
+    models = {"reference": reference, **candidates}
+    batch = x[: args.batch_size].astype("float32")
+
+    print(f"{'modelo':<10} {'bytes':>10} {'x menor':>8} {'acuerdo':>8} {'precisión':>10} {'latencia':>12}")
+    for row in rows:
+        model = models[row["model"]]
+        inputs = x[: args.batch_size] if row["model"] == "reference" else batch
+        latency = _latency(lambda: model.predict(inputs), args.calls)
+        accuracy = f"{row['accuracy']:.4f}" if row["accuracy"] is not None else "-"
+        print(
+            f"{row['model']:<10} {row['nbytes']:>10d} {row['size_ratio']:>8.2f} "
+            f"{row['agreement']:>8.4f} {accuracy:>10} {latency * 1e3:>9.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measure wall time and peak RSS of ``import mlp_compiler`` in fresh interpreters."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_kb = rss // 1024 if sys.platform == "darwin" else rss
+except ImportError:  # Windows
+    rss_kb = None
+print(json.dumps({{"seconds": elapsed, "max_rss_kb": rss_kb, "tensorflow_loaded": "tensorflow" in sys.modules}}))
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="mlp_compiler", help="Módulo a importar.")
+    parser.add_argument("--repeat", type=int, default=5, help="Número de intérpretes lanzados.")
+    parser.add_argument("--json", action="store_true", help="Imprime el resultado en JSON.")
+    return parser.parse_args()
+
+
+def measure(module: str, repeat: int) -> dict:
+    env = os.environ.copy()
+    pythonpath = env.get("PYTHONPATH")
+    env["PYTHONPATH"] = str(SRC_DIR) + (os.pathsep + pythonpath if pythonpath else "")
+
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", _PROBE.format(module=module)], env=env, text=True
+        )
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    seconds = [s["seconds"] for s in samples]
+    rss = [s["max_rss_kb"] for s in samples if s["max_rss_kb"] is not None]
+    return {
+        "module": module,
+        "repeat": repeat,
+        "median_seconds": statistics.median(seconds),
+        "min_seconds": min(seconds),
+        "max_rss_kb": max(rss) if rss else None,
+        "tensorflow_loaded": any(s["tensorflow_loaded"] for s in samples),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    result = measure(args.module, args.repeat)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"import {result['module']}: mediana {result['median_seconds'] * 1000:.1f} ms "
+          f"(mínimo {result['min_seconds'] * 1000:.1f} ms, {result['repeat']} repeticiones)")
+    if result["max_rss_kb"] is not None:
+        print(f"RSS máximo: {result['max_rss_kb'] / 1024:.1f} MiB")
+    print(f"TensorFlow cargado: {'sí' if result['tensorflow_loaded'] else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Reproducible benchmark suite for the NumPy MLP, the compiler and the training loop.
+
+Benchmarks are grouped so that parts can be run on their own (``--only``):
+
+- ``numpy``: ``neuron_forward``, ``Layer.forward`` and ``MLP.predict`` swept
+  over batch size, width and dtype, plus a K-model ensemble evaluated model by
+  model and stacked (:class:`MLPEnsemble`), and dense versus CSR inputs.
+- ``compiler``: parsing/normalizing and building long architecture strings
+  (NumPy backend, plus Keras when TensorFlow is installed).
+- ``data``: ``load_mnist`` cold (empty cache directory) and warm.
+- ``training``: samples/sec per epoch of ``train_mlp`` and ``build_and_train``.
+
+Every result is reduced to one ``value`` with its unit and direction, written
+as JSON with ``--output``; ``--baseline`` compares against a stored run and
+exits with status 1 when something regressed beyond ``--threshold``.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if SRC_DIR.exists():  # pragma: no branch - guard against missing path
+    sys.path.insert(0, str(SRC_DIR))
+
+from mlp_compiler.compiler import compile_model, normalize_architecture
+from mlp_compiler.ensemble import MLPEnsemble
+from mlp_compiler.numpy_mlp import Layer, MLP, neuron_forward
+from mlp_compiler.numpy_training import train_mlp
+from mlp_compiler.sparse import CSRMatrix
+
+GROUPS = ("numpy", "compiler", "data", "training")
+Results = Dict[str, Dict[str, Any]]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", type=str, default=",".join(GROUPS), help="Grupos separados por comas.")
+    parser.add_argument("--quick", action="store_true", help="Barrido reducido (para CI).")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por medida (se usa la mediana).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Guarda los resultados en JSON.")
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON de referencia a comparar.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Empeoramiento relativo tolerado frente a la referencia."
+    )
+    return parser.parse_args()
+
+
+def _time_per_call(fn: Callable[[], Any], repeat: int, min_seconds: float = 0.05) -> float:
+    """Median seconds per call, calibrating the loop count to ``min_seconds`` per sample."""
+
+    fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_seconds or number >= 1 << 20:
+            break
+        number *= 2
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples)
+
+
+def _seconds(value: float, **params: Any) -> Dict[str, Any]:
+    return {"value": value, "unit": "s", "higher_is_better": False, "params": params}
+
+
+def _throughput(value: float, **params: Any) -> Dict[str, Any]:
+    return {"value": value, "unit": "samples/s", "higher_is_better": True, "params": params}
+
+
+def _key(name: str, **params: Any) -> str:
+    inner = ",".join(f"{k}={v}" for k, v in params.items())
+    return f"{name}[{inner}]" if inner else name
+
+
+def bench_numpy(args: argparse.Namespace, rng: np.random.Generator) -> Results:
+    batches = (1, 64, 1024) if args.quick else (1, 16, 64, 256, 1024)
+    widths = (128, 512) if args.quick else (64, 256, 512, 1024)
+    dtypes = ("float64", "float32") if args.quick else ("float64", "float32", "float16")
+    results: Results = {}
+    for dtype in dtypes:
+        for width in widths:
+            layer = Layer(width, width, "relu", dtype=dtype)
+            mlp = MLP([Layer(width, width, "relu", dtype=dtype) for _ in range(3)])
+            w = layer.W[:, 0].copy()
+            for batch in batches:
+                X = rng.random((batch, width)).astype(dtype)
+                params = {"batch": batch, "width": width, "dtype": dtype}
+                results[_key("neuron_forward", **params)] = _seconds(
+                    _time_per_call(lambda: neuron_forward(X, w, 0.1, "relu"), args.repeat), **params
+                )
+                results[_key("layer_forward", **params)] = _seconds(
+                    _time_per_call(lambda: layer.forward(X), args.repeat), **params
+                )
+                results[_key("mlp_predict", **params)] = _seconds(
+                    _time_per_call(lambda: mlp.predict(X), args.repeat), **params
+                )
+
+    members = [MLP([Layer(256, 256, "relu", dtype="float32") for _ in range(3)]) for _ in range(8)]
+    ensemble = MLPEnsemble(members)
+    for batch in batches:
+        X = rng.random((batch, 256)).astype("float32")
+        params = {"batch": batch, "models": len(members)}
+        results[_key("ensemble_loop", **params)] = _seconds(
+            _time_per_call(lambda: [member.predict(X) for member in members], args.repeat), **params
+        )
+        results[_key("ensemble_stacked", **params)] = _seconds(
+            _time_per_call(lambda: ensemble.predict_all(X), args.repeat), **params
+        )
+
+    mlp = MLP([Layer(784, 300, "relu"), Layer(300, 10, "softmax")])
+    for density in (0.05, 0.2):
+        for batch in batches:
+            X = rng.random((batch, 784)) * (rng.random((batch, 784)) < density)
+            sparse = CSRMatrix.from_dense(X)
+            params = {"batch": batch, "density": density}
+            results[_key("predict_dense_input", **params)] = _seconds(
+                _time_per_call(lambda: mlp.predict(X), args.repeat), **params
+            )
+            results[_key("predict_csr_input", **params)] = _seconds(
+                _time_per_call(lambda: mlp.predict(sparse), args.repeat), **params
+            )
+    return results
+
+
+def _long_architecture(depth: int) -> str:
+    hidden = [f"Dense({64 + i % 7}, relu) -> Dropout(0.1)" for i in range(depth)]
+    return "Input(784) -> " + " -> ".join(hidden) + " -> Dense(10, softmax)"
+
+
+def bench_compiler(args: argparse.Namespace, rng: np.random.Generator) -> Results:
+    depths = (10, 100) if args.quick else (10, 100, 500)
+    has_tf = importlib.util.find_spec("tensorflow") is not None
+    results: Results = {}
+    for depth in depths:
+        arch = _long_architecture(depth)
+        results[_key("compile_parse", depth=depth)] = _seconds(
+            _time_per_call(lambda: normalize_architecture(arch), args.repeat), depth=depth
+        )
+        results[_key("compile_numpy", depth=depth)] = _seconds(
+            _time_per_call(lambda: compile_model(arch, backend="numpy"), args.repeat), depth=depth
+        )
+        if has_tf and depth <= 100:
+            results[_key("compile_keras", depth=depth)] = _seconds(
+                _time_per_call(lambda: compile_model(arch), max(1, args.repeat // 2), min_seconds=0.0),
+                depth=depth,
+            )
+    return results
+
+
+def bench_data(args: argparse.Namespace, rng: np.random.Generator) -> Results:
+    from mlp_compiler.training import load_mnist
+
+    results: Results = {}
+    with tempfile.TemporaryDirectory(prefix="mlp-bench-") as tmp:
+        # Cold: the .npy cache is rebuilt from the raw dataset (the download
+        # itself is cached by Keras and excluded when already present).
+        start = time.perf_counter()
+        load_mnist(cache_dir=Path(tmp))
+        results["load_mnist_cold"] = _seconds(time.perf_counter() - start)
+        results["load_mnist_warm"] = _seconds(
+            _time_per_call(lambda: load_mnist(cache_dir=Path(tmp)), args.repeat, min_seconds=0.0)
+        )
+    return results
+
+
+def _epoch_timer() -> Any:
+    from tensorflow import keras
+
+    class EpochTimer(keras.callbacks.Callback):
+        def __init__(self) -> None:
+            super().__init__()
+            self.seconds: List[float] = []
+
+        def on_epoch_begin(self, epoch: int, logs: Optional[Dict[str, float]] = None) -> None:
+            self._start = time.perf_counter()
+
+        def on_epoch_end(self, epoch: int, logs: Optional[Dict[str, float]] = None) -> None:
+            self.seconds.append(time.perf_counter() - self._start)
+
+    return EpochTimer()
+
+
+def bench_training(args: argparse.Namespace, rng: np.random.Generator) -> Results:
+    results: Results = {}
+    epochs = 2 if args.quick else 3
+    n = 5000 if args.quick else 20000
+    batch_size = 128
+
+    x = rng.random((n, 784)).astype("float32")
+    y = rng.integers(0, 10, n)
+    for dtype in ("float64", "float32"):
+        mlp = compile_model(
+            "Dense(300, relu) -> Dense(100, relu) -> Dense(10, softmax)", 784, backend="numpy", dtype=dtype
+        )
+        start = time.perf_counter()
+        train_mlp(mlp, x, y, epochs=epochs, batch_size=batch_size, seed=args.seed, verbose=0)
+        results[_key("train_mlp", dtype=dtype)] = _throughput(
+            n * epochs / (time.perf_counter() - start), samples=n, epochs=epochs, batch_size=batch_size
+        )
+
+    if importlib.util.find_spec("tensorflow") is None:
+        print("TensorFlow no está instalado: se omite build_and_train.", file=sys.stderr)
+        return results
+    from mlp_compiler.training import build_and_train
+
+    timer = _epoch_timer()
+    validation_split = 0.1
+    build_and_train(
+        "Dense(300, relu) -> Dropout(0.2) -> Dense(100, relu) -> Dense(10, softmax)",
+        input_dim=784,
+        epochs=epochs,
+        batch_size=batch_size,
+        validation_split=validation_split,
+        verbose=0,
+        limit_train=n,
+        limit_test=1000,
+        callbacks=[timer],
+        seed=args.seed,
+    )
+    train_rows = int(n * (1 - validation_split))
+    per_epoch = [train_rows / seconds for seconds in timer.seconds]
+    # The first epoch includes graph tracing, so the steady state excludes it.
+    steady = per_epoch[1:] or per_epoch
+    entry = _throughput(statistics.median(steady), samples=train_rows, epochs=epochs, batch_size=batch_size)
+    entry["per_epoch"] = per_epoch
+    results["build_and_train"] = entry
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace, np.random.Generator], Results]] = {
+    "numpy": bench_numpy,
+    "compiler": bench_compiler,
+    "data": bench_data,
+    "training": bench_training,
+}
+
+
+def _meta(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "omp_num_threads": os.environ.get("OMP_NUM_THREADS"),
+        "quick": args.quick,
+        "repeat": args.repeat,
+        "seed": args.seed,
+    }
+
+
+def compare(current: Results, baseline: Results, threshold: float) -> List[str]:
+    """Print a comparison table and return the keys that regressed beyond ``threshold``."""
+
+    regressions: List[str] = []
+    print(f"\n{'benchmark':<56} {'referencia':>12} {'actual':>12} {'cambio':>9}")
+    for key, entry in current.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        ratio = entry["value"] / base["value"] if base["value"] else float("inf")
+        # Positive change always means "worse", whatever the unit.
+        change = (1 / ratio - 1) if entry["higher_is_better"] else (ratio - 1)
+        flag = "  REGRESIÓN" if change > threshold else ""
+        if flag:
+            regressions.append(key)
+        print(f"{key:<56} {base['value']:>12.4g} {entry['value']:>12.4g} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    np.random.seed(args.seed)
+
+    results: Results = {}
+    for group in [g.strip() for g in args.only.split(",") if g.strip()]:
+        if group not in BENCHMARKS:
+            raise SystemExit(f"Grupo desconocido: {group} (disponibles: {', '.join(GROUPS)})")
+        try:
+            results.update(BENCHMARKS[group](args, rng))
+        except ImportError as exc:
+            print(f"Se omite el grupo {group}: {exc}", file=sys.stderr)
+
+    for key, entry in results.items():
+        print(f"{key:<56} {entry['value']:>12.4g} {entry['unit']}")
+
+    report = {"meta": _meta(args), "results": results}
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) empeoran más de un {args.threshold:.0%}.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Load test for online inference: per-request predict vs dynamic micro-batching.
+
+Without ``--url`` the test runs in-process on a NumPy MLP compiled from
+``--architecture`` and compares calling ``predict`` once per request with
+routing the same requests through :class:`MicroBatcher`. With ``--url`` it
+sends single-sample requests to a running ``/predict`` endpoint.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if SRC_DIR.exists():  # pragma: no branch - guard against missing path
+    sys.path.insert(0, str(SRC_DIR))
+
+from mlp_compiler.compiler import compile_model
+from mlp_compiler.serving import MicroBatcher
+
+
+DEFAULT_ARCHITECTURE = "Dense(300, relu) -> Dropout(0.2) -> Dense(100, relu) -> Dense(10, softmax)"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", type=str, default=None, help="URL de /predict (modo HTTP).")
+    parser.add_argument("--model", type=str, default=None, help="Id del modelo para el modo HTTP.")
+    parser.add_argument("--architecture", type=str, default=DEFAULT_ARCHITECTURE)
+    parser.add_argument("--input-dim", type=int, default=784)
+    parser.add_argument("--requests", type=int, default=5000, help="Peticiones totales.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Clientes simultáneos.")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    return parser.parse_args()
+
+
+def run_load(send: Callable[[np.ndarray], object], samples: np.ndarray, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+
+    def one(i: int) -> None:
+        start = time.perf_counter()
+        send(samples[i])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(samples.shape[0])))
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.array(latencies) * 1000.0
+    return {
+        "requests": float(samples.shape[0]),
+        "throughput_rps": samples.shape[0] / elapsed,
+        "p50_ms": float(np.percentile(lat_ms, 50)),
+        "p99_ms": float(np.percentile(lat_ms, 99)),
+    }
+
+
+def _report(name: str, stats: Dict[str, float]) -> None:
+    print(
+        f"{name:<16} {stats['throughput_rps']:10.0f} req/s   "
+        f"p50 {stats['p50_ms']:7.2f} ms   p99 {stats['p99_ms']:7.2f} ms"
+    )
+
+
+def _http_sender(url: str, model: str) -> Callable[[np.ndarray], object]:
+    def send(sample: np.ndarray) -> object:
+        body = json.dumps({"model": model, "input": sample.tolist()}).encode("utf-8")
+        req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            return json.loads(resp.read())
+
+    return send
+
+
+def main() -> None:
+    args = parse_args()
+    samples = np.random.rand(args.requests, args.input_dim).astype("float32")
+
+    if args.url:
+        if not args.model:
+            raise SystemExit("--model es obligatorio con --url")
+        _report("HTTP /predict", run_load(_http_sender(args.url, args.model), samples, args.concurrency))
+        return
+
+    mlp = compile_model(args.architecture, input_dim=args.input_dim, backend="numpy")
+    _report("por petición", run_load(lambda x: mlp.predict(x[None, :]), samples, args.concurrency))
+
+    batcher = MicroBatcher(mlp.predict, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    try:
+        _report("micro-batching", run_load(batcher.predict, samples, args.concurrency))
+    finally:
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
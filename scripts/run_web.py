@@ -1,6 +1,13 @@
-"""Cross-platform launcher for the Flask demo application."""
+"""Cross-platform launcher for the Flask demo application.
+
+By default it starts Flask's single-process development server. With
+``--production`` it starts gunicorn (not available on Windows) with several
+worker processes that share TensorFlow and MNIST preloaded by the master; see
+``web/gunicorn.conf.py``.
+"""
 from __future__ import annotations
 
+import argparse
 import os
 import subprocess
 import sys
@@ -32,11 +39,33 @@ def _check_merge_conflicts(repo_dir: Path) -> None:
         )
 
 
-def ensure_dependencies(requirements: Path) -> None:
-    """Install Flask (and the rest of the requirements) if it is missing."""
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        help="Servidor gunicorn multiproceso con TensorFlow y MNIST precargados.",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Puerto (5000 en desarrollo, 8000 en producción).")
+    parser.add_argument("--workers", type=int, default=2, help="Procesos del servidor de producción.")
+    parser.add_argument(
+        "--http-threads", type=int, default=8, help="Hilos de peticiones por proceso (cada flujo SSE ocupa uno)."
+    )
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=None,
+        help="Hilos de TensorFlow por proceso (por defecto núcleos / workers).",
+    )
+    return parser.parse_args()
+
+
+def ensure_dependencies(requirements: Path, module: str = "flask") -> None:
+    """Install ``module`` (and the rest of the requirements) if it is missing."""
 
     try:  # pragma: no cover - runtime dependency check
-        import flask  # type: ignore  # noqa: F401
+        __import__(module)
         return
     except ModuleNotFoundError:
         pass
@@ -52,7 +81,35 @@ def ensure_dependencies(requirements: Path) -> None:
     ])
 
 
+def run_production(args: argparse.Namespace, repo_dir: Path, env: dict) -> None:
+    if sys.platform == "win32":
+        raise SystemExit("gunicorn no funciona en Windows: usa el servidor de desarrollo (sin --production).")
+    if args.workers <= 0:
+        raise SystemExit("--workers debe ser positivo")
+    ensure_dependencies(repo_dir / "requirements.txt", "gunicorn")
+
+    port = args.port or 8000
+    env["MLP_WEB_BIND"] = f"{args.host}:{port}"
+    env["MLP_WEB_WORKERS"] = str(args.workers)
+    env["MLP_WEB_HTTP_THREADS"] = str(args.http_threads)
+    if args.threads_per_worker:
+        env["MLP_WEB_TF_THREADS"] = str(args.threads_per_worker)
+
+    print(f"[run_web] Lanzando gunicorn con {args.workers} procesos en http://{args.host}:{port}")
+    subprocess.check_call([
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--config",
+        str(repo_dir / "web" / "gunicorn.conf.py"),
+        "--chdir",
+        str(repo_dir),
+        "web.app:app",
+    ], env=env)
+
+
 def main() -> None:
+    args = parse_args()
     repo_dir: Final[Path] = Path(__file__).resolve().parents[1]
     requirements = repo_dir / "requirements.txt"
     src_dir = repo_dir / "src"
@@ -68,16 +125,21 @@ def main() -> None:
     env["PYTHONPATH"] = new_pythonpath
     env.setdefault("FLASK_APP", "web.app")
 
-    print("[run_web] Lanzando la aplicación Flask en http://127.0.0.1:5000")
+    if args.production:
+        run_production(args, repo_dir, env)
+        return
+
+    port = args.port or 5000
+    print(f"[run_web] Lanzando la aplicación Flask en http://{args.host}:{port}")
     subprocess.check_call([
         sys.executable,
         "-m",
         "flask",
         "run",
         "--host",
-        "127.0.0.1",
+        args.host,
         "--port",
-        "5000",
+        str(port),
     ], env=env)
 
 
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import argparse
+import io
 import sys
+from dataclasses import asdict
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 import matplotlib.pyplot as plt
 
@@ -14,10 +16,23 @@ SRC_DIR = PROJECT_ROOT / "src"
 if SRC_DIR.exists():  # pragma: no branch - guard against missing path
     sys.path.insert(0, str(SRC_DIR))
 
-from mlp_compiler.training import TrainingResult, build_and_train
+from mlp_compiler.compiler import ArchitectureError, validate_architecture
+from mlp_compiler.cost import BUDGET_MODES, BudgetExceededError, CostBudget, analyze_architecture, enforce_budget
+from mlp_compiler.export import export_keras, export_mlp
+from mlp_compiler.optimizer import optimize_architecture, optimize_model
+from mlp_compiler.result_cache import CachedResult, ResultCache, is_cacheable, result_key
+from mlp_compiler.sweep import Leaderboard, load_trials, run_sweep
+from mlp_compiler.training import (
+    CheckpointConfig,
+    EarlyStoppingConfig,
+    PipelineConfig,
+    build_and_train,
+    load_mnist,
+)
 
 
 DEFAULT_ARCHITECTURE = "Dense(300, relu) -> Dropout(0.2) -> Dense(100, relu) -> Dense(10, softmax)"
+PLOT_ARTIFACT = "history.png"
 
 
 def parse_args() -> argparse.Namespace:
@@ -60,26 +75,159 @@ def parse_args() -> argparse.Namespace:
         default=784,
         help="Dimensión de entrada para la primera capa Dense.",
     )
+    parser.add_argument(
+        "--tf-data",
+        action="store_true",
+        help="Alimenta el entrenamiento con un pipeline tf.data (cache/shuffle/prefetch).",
+    )
+    parser.add_argument(
+        "--shuffle-buffer",
+        type=int,
+        default=10_000,
+        help="Tamaño del buffer de shuffle del pipeline tf.data (0 lo desactiva).",
+    )
+    parser.add_argument(
+        "--data-cache",
+        type=str,
+        default="none",
+        help="Cache del pipeline tf.data: 'none' (por defecto), 'memory' o una ruta en disco.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Semilla para resultados reproducibles; sin ella el resultado no se cachea.",
+    )
+    parser.add_argument(
+        "--no-result-cache",
+        action="store_true",
+        help="Entrena siempre aunque exista un resultado cacheado para los mismos parámetros.",
+    )
+    parser.add_argument(
+        "--export",
+        type=Path,
+        default=None,
+        help="Exporta el modelo entrenado a un fichero .mlpc (implica entrenar aunque haya caché).",
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Con --export, guarda el modelo optimizado para inferencia (sin Dropout, capas lineales plegadas).",
+    )
+    stopping = parser.add_argument_group("checkpoints y parada temprana")
+    stopping.add_argument(
+        "--checkpoint-dir",
+        type=Path,
+        default=None,
+        help="Guarda pesos y estado del optimizador en este directorio y reanuda desde el último checkpoint.",
+    )
+    stopping.add_argument(
+        "--checkpoint-every", type=int, default=1, help="Épocas entre checkpoints (siempre se guarda al terminar)."
+    )
+    stopping.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Empieza desde cero aunque --checkpoint-dir contenga un checkpoint.",
+    )
+    stopping.add_argument(
+        "--early-stopping-patience",
+        type=int,
+        default=0,
+        help="Épocas sin mejora antes de parar (0 desactiva la parada temprana).",
+    )
+    stopping.add_argument(
+        "--early-stopping-monitor", type=str, default="val_loss", help="Métrica vigilada (val_loss, val_accuracy...)."
+    )
+    stopping.add_argument("--min-delta", type=float, default=0.0, help="Mejora mínima que cuenta como mejora.")
+    stopping.add_argument(
+        "--restore-best-weights",
+        action="store_true",
+        help="Devuelve los pesos de la mejor época en lugar de los de la última.",
+    )
+    budget = parser.add_argument_group("presupuesto de coste (análisis estático, sin TensorFlow)")
+    budget.add_argument(
+        "--analyze",
+        action="store_true",
+        help="Muestra parámetros, FLOPs y memoria estimada de la arquitectura y termina.",
+    )
+    budget.add_argument("--max-params", type=int, default=None, help="Límite de parámetros.")
+    budget.add_argument("--max-flops", type=int, default=None, help="Límite de FLOPs por muestra.")
+    budget.add_argument(
+        "--max-memory-mb", type=int, default=None, help="Límite de memoria estimada de entrenamiento (MB)."
+    )
+    budget.add_argument(
+        "--budget-mode",
+        choices=BUDGET_MODES,
+        default="reject",
+        help="Qué hacer si se supera un límite: no entrenar (por defecto) o solo avisar.",
+    )
+    sweep = parser.add_argument_group("barrido de arquitecturas")
+    sweep.add_argument(
+        "--sweep",
+        type=Path,
+        default=None,
+        help="Fichero con una arquitectura por línea o un JSON con la rejilla/lista de pruebas.",
+    )
+    sweep.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        metavar="PARAM=V1,V2",
+        help="Valores a combinar para un hiperparámetro (epochs, batch_size, validation_split, "
+        "train_size, seed). Se puede repetir.",
+    )
+    sweep.add_argument("--workers", type=int, default=1, help="Procesos de entrenamiento simultáneos.")
+    sweep.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=None,
+        help="Hilos de TensorFlow por proceso (por defecto núcleos / workers).",
+    )
+    sweep.add_argument(
+        "--leaderboard",
+        type=Path,
+        default=Path("sweep_leaderboard.csv"),
+        help="Clasificación de resultados (.csv o .json); permite reanudar un barrido interrumpido.",
+    )
     return parser.parse_args()
 
 
-def _maybe_plot(history: TrainingResult, plot_path: Optional[Path]) -> None:
-    if plot_path is None:
-        return
+def _pipeline_config(args: argparse.Namespace) -> Optional[PipelineConfig]:
+    if not args.tf_data:
+        return None
+    cache = {"memory": True, "none": False}.get(args.data_cache, args.data_cache)
+    return PipelineConfig(cache=cache, shuffle_buffer=args.shuffle_buffer)
 
-    plot_path.parent.mkdir(parents=True, exist_ok=True)
 
+def _checkpoint_config(args: argparse.Namespace) -> Optional[CheckpointConfig]:
+    if args.checkpoint_dir is None:
+        return None
+    return CheckpointConfig(args.checkpoint_dir, every_epochs=args.checkpoint_every, resume=not args.no_resume)
+
+
+def _early_stopping_config(args: argparse.Namespace) -> Optional[EarlyStoppingConfig]:
+    if args.early_stopping_patience <= 0:
+        return None
+    return EarlyStoppingConfig(
+        monitor=args.early_stopping_monitor,
+        patience=args.early_stopping_patience,
+        min_delta=args.min_delta,
+        restore_best_weights=args.restore_best_weights,
+    )
+
+
+def _render_plot(history: Dict[str, list]) -> bytes:
     fig, axes = plt.subplots(1, 2, figsize=(12, 4))
-    axes[0].plot(history.history["accuracy"], label="train")
-    axes[0].plot(history.history.get("val_accuracy", []), label="val")
+    axes[0].plot(history["accuracy"], label="train")
+    axes[0].plot(history.get("val_accuracy", []), label="val")
     axes[0].set_title("Accuracy")
     axes[0].set_xlabel("Época")
     axes[0].set_ylabel("Accuracy")
     axes[0].legend()
     axes[0].grid(True)
 
-    axes[1].plot(history.history["loss"], label="train")
-    axes[1].plot(history.history.get("val_loss", []), label="val")
+    axes[1].plot(history["loss"], label="train")
+    axes[1].plot(history.get("val_loss", []), label="val")
     axes[1].set_title("Pérdida")
     axes[1].set_xlabel("Época")
     axes[1].set_ylabel("Loss")
@@ -87,29 +235,240 @@ def _maybe_plot(history: TrainingResult, plot_path: Optional[Path]) -> None:
     axes[1].grid(True)
 
     fig.tight_layout()
-    fig.savefig(plot_path)
-    print(f"Curvas de entrenamiento guardadas en {plot_path}")
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    plt.close(fig)
+    return buffer.getvalue()
 
 
-def main() -> None:
-    args = parse_args()
+def _save_plot(png: bytes, plot_path: Path) -> None:
+    plot_path.parent.mkdir(parents=True, exist_ok=True)
+    plot_path.write_bytes(png)
+    print(f"Curvas de entrenamiento guardadas en {plot_path}")
 
-    print("Arquitectura:", args.architecture)
-    result = build_and_train(
+
+def _cache_key(args: argparse.Namespace) -> str:
+    extra: Dict[str, Any] = {}
+    stopping = _early_stopping_config(args)
+    if stopping is not None:
+        # Only added when enabled, so keys of plain runs stay unchanged.
+        extra["early_stopping"] = asdict(stopping)
+    if args.tf_data:
+        # Both change the batch order, hence the trained weights. Where the
+        # rows are cached (memory or a file) does not.
+        extra["shuffle_buffer"] = args.shuffle_buffer
+        extra["data_cache"] = args.data_cache != "none"
+    return result_key(
         args.architecture,
         input_dim=args.input_dim,
         epochs=args.epochs,
         batch_size=args.batch_size,
         validation_split=args.validation_split,
-        limit_train=args.train_size,
-        limit_test=args.test_size,
-        verbose=2,
+        train_size=args.train_size,
+        test_size=args.test_size,
+        seed=args.seed,
+        tf_data=args.tf_data,
+        **extra,
     )
 
-    print(f"\nPrecisión en test: {result.test_accuracy:.4f}")
-    print(f"Pérdida en test: {result.test_loss:.4f}")
 
-    _maybe_plot(result, args.plot_path)
+def _parse_value(raw: str) -> Any:
+    if raw.lower() == "none":
+        return None
+    for convert in (int, float):
+        try:
+            return convert(raw)
+        except ValueError:
+            pass
+    return raw
+
+
+def _sweep_defaults(args: argparse.Namespace) -> Dict[str, List[Any]]:
+    defaults: Dict[str, List[Any]] = {
+        "epochs": [args.epochs],
+        "batch_size": [args.batch_size],
+        "validation_split": [args.validation_split],
+        "train_size": [args.train_size],
+        "seed": [args.seed],
+    }
+    for item in args.grid:
+        name, _, values = item.partition("=")
+        name = name.strip().replace("-", "_")
+        if name not in defaults or not values:
+            raise SystemExit(f"--grid no válido: {item}")
+        defaults[name] = [_parse_value(value.strip()) for value in values.split(",")]
+    return defaults
+
+
+def _budget(args: argparse.Namespace) -> CostBudget:
+    return CostBudget(
+        max_params=args.max_params,
+        max_flops_per_sample=args.max_flops,
+        max_training_bytes=args.max_memory_mb * 1024 * 1024 if args.max_memory_mb else None,
+    )
+
+
+def _within_budget(args: argparse.Namespace, architecture: str, batch_size: int) -> bool:
+    """Print the static cost of ``architecture`` and apply ``--budget-mode``."""
+
+    cost = analyze_architecture(architecture, args.input_dim)
+    print(
+        f"Coste estimado: {cost.params:,} parámetros ({cost.weight_bytes('float32') / 2**20:.1f} MB en float32), "
+        f"{cost.flops_per_sample:,} FLOPs/muestra, ~{cost.training_bytes(batch_size) / 2**20:.1f} MB "
+        f"para entrenar con batch {batch_size}"
+    )
+    try:
+        enforce_budget(
+            cost,
+            _budget(args),
+            batch_size=batch_size,
+            mode=args.budget_mode,
+            warn=lambda message: print(f"Aviso de presupuesto: {message}"),
+        )
+    except BudgetExceededError as exc:
+        print(exc)
+        return False
+    return True
+
+
+def _print_analysis(args: argparse.Namespace) -> None:
+    summary = analyze_architecture(args.architecture, args.input_dim).summary(args.batch_size)
+    print(f"Arquitectura: {summary['architecture']}")
+    print(f"{'capa':>4} {'tipo':<8} {'entrada':>8} {'salida':>8} {'parámetros':>12} {'FLOPs':>14}")
+    for layer in summary["layers"]:
+        print(
+            f"{layer['index']:>4} {layer['kind']:<8} {layer['in_features']:>8} {layer['out_features']:>8} "
+            f"{layer['params']:>12,} {layer['flops']:>14,}"
+        )
+    print(f"Parámetros: {summary['params']:,}")
+    for dtype, nbytes in summary["weight_bytes"].items():
+        print(f"  pesos en {dtype:<8} {nbytes / 2**20:10.2f} MB")
+    print(f"FLOPs por muestra (forward): {summary['flops_per_sample']:,}")
+    print(f"Pico de activaciones en inferencia (batch {args.batch_size}): "
+          f"{summary['peak_activation_bytes'] / 2**20:.2f} MB")
+    print(f"Memoria estimada de entrenamiento: {summary['training_bytes'] / 2**20:.2f} MB")
+    print("\nOptimización para inferencia:")
+    print(optimize_architecture(args.architecture, args.input_dim).report.summary())
+
+
+def run_sweep_cli(args: argparse.Namespace) -> None:
+    trials = load_trials(args.sweep, **_sweep_defaults(args))
+    affordable = [trial for trial in trials if _within_budget(args, trial.architecture, trial.batch_size)]
+    if len(affordable) < len(trials):
+        print(f"Se omiten {len(trials) - len(affordable)} pruebas por superar el presupuesto.")
+    trials = affordable
+    leaderboard = Leaderboard(args.leaderboard)
+    pending = len(trials) - len(leaderboard.completed_keys() & {t.key(args.input_dim, args.test_size) for t in trials})
+    print(f"{len(trials)} pruebas, {pending} pendientes; clasificación en {args.leaderboard}")
+    if not pending:
+        return
+
+    sizes = [trial.train_size for trial in trials]
+    limit_train = None if None in sizes else max(sizes)
+    data = load_mnist(one_hot=False, limit_train=limit_train, limit_test=args.test_size)
+
+    def report(row: Dict[str, Any]) -> None:
+        if row["status"] == "ok":
+            outcome = f"precisión {row['test_accuracy']:.4f}"
+        else:
+            outcome = f"error: {row['error']}"
+        print(f"[{row['seconds']:7.1f} s] {row['architecture']} (epochs={row['epochs']}, "
+              f"batch_size={row['batch_size']}, seed={row['seed']}): {outcome}")
+
+    run_sweep(
+        trials,
+        data,
+        leaderboard,
+        input_dim=args.input_dim,
+        test_size=args.test_size,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        on_result=report,
+    )
+    best = leaderboard.best()
+    if best is not None:
+        print(f"\nMejor: {best['architecture']} ({float(best['test_accuracy']):.4f})")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.analyze:
+        _print_analysis(args)
+        return
+    if args.sweep is not None:
+        run_sweep_cli(args)
+        return
+
+    print("Arquitectura:", args.architecture)
+    try:
+        validate_architecture(args.architecture, args.input_dim, backend="keras")
+    except ArchitectureError as exc:
+        raise SystemExit(f"Arquitectura no válida: {exc}") from None
+    if not _within_budget(args, args.architecture, args.batch_size):
+        raise SystemExit("Entrenamiento cancelado: la arquitectura supera el presupuesto (usa --budget-mode warn).")
+    # Unseeded runs are not reproducible, so they are neither served nor stored.
+    cache = None if args.no_result_cache or not is_cacheable(args.seed) else ResultCache()
+    key = _cache_key(args) if cache is not None else None
+    # A cached result has no weights, so exporting always trains; resuming from
+    # a checkpoint is an explicit request to train as well.
+    cached = cache.get(key) if cache is not None and args.export is None and args.checkpoint_dir is None else None
+    needs_store = cached is None
+
+    if cached is not None:
+        print("Resultado servido desde la caché (misma arquitectura, hiperparámetros y semilla).")
+    else:
+        result = build_and_train(
+            args.architecture,
+            input_dim=args.input_dim,
+            epochs=args.epochs,
+            batch_size=args.batch_size,
+            validation_split=args.validation_split,
+            limit_train=args.train_size,
+            limit_test=args.test_size,
+            verbose=2,
+            pipeline=_pipeline_config(args),
+            seed=args.seed,
+            checkpoint=_checkpoint_config(args),
+            early_stopping=_early_stopping_config(args),
+        )
+        if result.initial_epoch:
+            print(f"Reanudado desde la época {result.initial_epoch} ({args.checkpoint_dir})")
+        if result.stopped_early:
+            print(f"Parada temprana tras {result.epochs_completed} épocas (mejor época: {result.best_epoch})")
+        if result.checkpoint_path is not None:
+            print(f"Último checkpoint: {result.checkpoint_path}")
+        cached = CachedResult(
+            metrics={
+                "test_accuracy": result.test_accuracy,
+                "test_loss": result.test_loss,
+                "epochs_completed": result.epochs_completed,
+                "stopped_early": result.stopped_early,
+                "best_epoch": result.best_epoch,
+            },
+            history=result.history,
+        )
+        if args.export is not None and args.optimize:
+            plan = optimize_model(result.model)
+            print(plan.report.summary())
+            export_mlp(plan.to_mlp(), args.export, architecture=plan.report.optimized_architecture, dtype="float32")
+            print(f"Modelo optimizado exportado en {args.export}")
+        elif args.export is not None:
+            export_keras(result.model, args.export)
+            print(f"Modelo exportado en {args.export}")
+
+    print(f"\nPrecisión en test: {cached.metrics['test_accuracy']:.4f}")
+    print(f"Pérdida en test: {cached.metrics['test_loss']:.4f}")
+
+    if args.plot_path is not None:
+        png = cached.artifacts.get(PLOT_ARTIFACT)
+        if png is None:
+            png = _render_plot(cached.history)
+            cached.artifacts[PLOT_ARTIFACT] = png
+            needs_store = True
+        _save_plot(png, args.plot_path)
+
+    if cache is not None and needs_store:
+        cache.put(key, cached.metrics, cached.history, cached.artifacts)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,50 @@
 """Utilities for building simple MLPs and compiling textual architectures."""
 from .activations import ACTIVATIONS, SUPPORTED_ACTIVATIONS, get_activation
-from .numpy_mlp import Layer, MLP, neuron_forward
+from .sparse import CSRMatrix
+from .numpy_mlp import InferenceWorkspace, Layer, MLP, neuron_forward
+from .numpy_training import SGD, Adam, evaluate_mlp, train_mlp
+from .parallel import ParallelPredictor
+from .streaming import iter_chunks, predict_batches, predict_stream
 from .compiler import compile_model, ArchitectureError
+from .export import export_keras, export_mlp, load_mlp
+from .profiling import Profiler, profile
+from .quantization import QuantizedMLP, quantization_report, quantize_mlp
+from .ensemble import MLPEnsemble
+from .optimizer import InferencePlan, optimize_architecture, optimize_model
+from .pruning import PrunedMLP, prune_mlp, pruning_report
 
 __all__ = [
     "ACTIVATIONS",
     "SUPPORTED_ACTIVATIONS",
     "get_activation",
+    "CSRMatrix",
     "Layer",
     "MLP",
+    "InferenceWorkspace",
     "neuron_forward",
+    "SGD",
+    "Adam",
+    "train_mlp",
+    "evaluate_mlp",
+    "ParallelPredictor",
+    "iter_chunks",
+    "predict_batches",
+    "predict_stream",
     "compile_model",
     "ArchitectureError",
+    "export_keras",
+    "export_mlp",
+    "load_mlp",
+    "Profiler",
+    "profile",
+    "QuantizedMLP",
+    "quantize_mlp",
+    "quantization_report",
+    "MLPEnsemble",
+    "InferencePlan",
+    "optimize_architecture",
+    "optimize_model",
+    "PrunedMLP",
+    "prune_mlp",
+    "pruning_report",
 ]
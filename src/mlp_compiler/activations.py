@@ -1,28 +1,114 @@
 """Activation functions used in the NumPy-based MLP implementation."""
 from __future__ import annotations
 
+from typing import Optional
+
 import numpy as np
 
+# Every activation accepts an optional ``out`` buffer (which may be ``z``
+# itself) so that inference can run without allocating temporaries.
+
+
+def _floating(z: np.ndarray) -> np.ndarray:
+    """``z`` itself when it is floating point, a float64 copy otherwise.
+
+    The in-place kernels below would otherwise allocate an integer ``out``
+    for integer input and fail on ``exp``.
+    """
+    z = np.asarray(z)
+    return z if np.issubdtype(z.dtype, np.inexact) else z.astype(np.float64)
 
-def sigmoid(z: np.ndarray) -> np.ndarray:
-    """Sigmoid activation."""
-    return 1.0 / (1.0 + np.exp(-z))
 
+def sigmoid(z: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Numerically stable sigmoid.
 
-def relu(z: np.ndarray) -> np.ndarray:
+    Evaluated piecewise from ``e = exp(-|z|)``, which never overflows:
+    ``1 / (1 + e)`` for ``z >= 0`` and ``e / (1 + e) = 1 / (1 + 1/e)`` for
+    ``z < 0``. Only a boolean mask is allocated.
+    """
+    z = _floating(z)
+    negative = z < 0
+    if out is None:
+        # Also keeps a 0-d z (one sample through ``neuron_forward``) an array.
+        out = np.empty_like(z)
+    np.abs(z, out=out)
+    np.negative(out, out=out)
+    np.exp(out, out=out)
+    # 1/e overflows to inf for z < -709, which correctly yields 0 below.
+    with np.errstate(divide="ignore", over="ignore"):
+        np.reciprocal(out, out=out, where=negative)
+    out += 1.0
+    np.reciprocal(out, out=out)
+    return out if out.ndim else out[()]
+
+
+def relu(z: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
     """Rectified Linear Unit (ReLU) activation."""
-    return np.maximum(0.0, z)
+    return np.maximum(z, 0.0, out=out)
+
+
+def tanh(z: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Hyperbolic tangent activation."""
+    return np.tanh(z, out=out)
+
+
+def elu(z: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Exponential Linear Unit (``alpha=1``); ``expm1`` only runs on ``z <= 0``."""
+    z = _floating(z)
+    negative = z <= 0
+    if out is None:
+        out = z.copy()
+    elif out is not z:
+        np.copyto(out, z)
+    np.expm1(out, out=out, where=negative)
+    return out if out.ndim else out[()]
 
 
-def linear(z: np.ndarray) -> np.ndarray:
+def softplus(z: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Softplus ``log(1 + exp(z))`` computed as ``logaddexp(z, 0)`` (no overflow)."""
+    return np.logaddexp(z, 0.0, out=out)
+
+
+def swish(z: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Swish / SiLU ``z * sigmoid(z)``."""
+    z = _floating(z)
+    return np.multiply(z, sigmoid(z), out=out)
+
+
+def linear(z: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
     """Identity activation."""
-    return z
+    if out is None or out is z:
+        return z
+    np.copyto(out, z)
+    return out
+
+
+def softmax(z: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Row-wise softmax (shifted by the row maximum for numerical stability)."""
+    z = _floating(z)
+    out = np.subtract(z, z.max(axis=-1, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= out.sum(axis=-1, keepdims=True)
+    return out
+
+
+def log_softmax(z: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Row-wise log-softmax ``z - logsumexp(z)``, max-shifted so it never overflows."""
+    z = _floating(z)
+    out = np.subtract(z, z.max(axis=-1, keepdims=True), out=out)
+    out -= np.log(np.exp(out).sum(axis=-1, keepdims=True))
+    return out
 
 
 ACTIVATIONS = {
     "sigmoid": sigmoid,
     "relu": relu,
-    "tanh": np.tanh,
+    "tanh": tanh,
+    "elu": elu,
+    "softplus": softplus,
+    "swish": swish,
+    "softmax": softmax,
+    "log_softmax": log_softmax,
     "linear": linear,
 }
 
@@ -30,6 +116,78 @@ ACTIVATIONS = {
 SUPPORTED_ACTIVATIONS = frozenset(ACTIVATIONS.keys())
 
 
+def _sigmoid_grad(z: np.ndarray, a: np.ndarray) -> np.ndarray:
+    return a * (1.0 - a)
+
+
+def _relu_grad(z: np.ndarray, a: np.ndarray) -> np.ndarray:
+    return z > 0
+
+
+def _tanh_grad(z: np.ndarray, a: np.ndarray) -> np.ndarray:
+    return 1.0 - a * a
+
+
+def _elu_grad(z: np.ndarray, a: np.ndarray) -> np.ndarray:
+    # For z <= 0, d/dz (exp(z) - 1) = exp(z) = a + 1.
+    return np.where(z > 0, 1.0, a + 1.0)
+
+
+def _softplus_grad(z: np.ndarray, a: np.ndarray) -> np.ndarray:
+    return sigmoid(z)
+
+
+def _swish_grad(z: np.ndarray, a: np.ndarray) -> np.ndarray:
+    s = sigmoid(z)
+    # d/dz z*s = s + z*s*(1 - s) = s + a*(1 - s)
+    return s + a * (1.0 - s)
+
+
+def _linear_grad(z: np.ndarray, a: np.ndarray) -> np.ndarray:
+    return np.ones_like(z)
+
+
+# Element-wise derivatives ``da/dz`` evaluated from the pre-activation ``z`` and
+# the activation output ``a`` (whichever is cheaper for each function).
+ACTIVATION_DERIVATIVES = {
+    "sigmoid": _sigmoid_grad,
+    "relu": _relu_grad,
+    "tanh": _tanh_grad,
+    "elu": _elu_grad,
+    "softplus": _softplus_grad,
+    "swish": _swish_grad,
+    "linear": _linear_grad,
+}
+
+
+def activation_backward(
+    name: str,
+    grad_output: np.ndarray,
+    z: np.ndarray,
+    a: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Return ``dL/dz`` given ``dL/da`` for the activation ``name``.
+
+    Softmax and log-softmax couple all the outputs of a row, so they use their
+    vector-Jacobian products instead of an element-wise derivative. ``out``
+    may be ``grad_output`` itself to update the gradient in place.
+    """
+
+    if name == "softmax":
+        dot = (grad_output * a).sum(axis=-1, keepdims=True)
+        return np.multiply(a, grad_output - dot, out=out)
+    if name == "log_softmax":
+        total = grad_output.sum(axis=-1, keepdims=True)
+        return np.subtract(grad_output, np.exp(a) * total, out=out)
+    if name == "linear":
+        if out is None or out is grad_output:
+            return grad_output
+        np.copyto(out, grad_output)
+        return out
+    return np.multiply(grad_output, ACTIVATION_DERIVATIVES[name](z, a), out=out)
+
+
 def get_activation(name: str):
     """Return an activation function by name.
 
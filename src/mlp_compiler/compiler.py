@@ -1,20 +1,28 @@
-<<<<<<< HEAD
-    """Text to Keras model compiler used in the project."""
-=======
->>>>>>> origin/main
+"""Text to model compiler used in the project (Keras or NumPy backend)."""
 from __future__ import annotations
 
-"""Text to Keras model compiler used in the project."""
-
 import re
 from dataclasses import dataclass
-from typing import List, Sequence
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple, Union
+
+from .activations import SUPPORTED_ACTIVATIONS
+from .numpy_mlp import Layer, MLP
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from tensorflow import keras
 
-from tensorflow import keras
-from tensorflow.keras import layers
+# TensorFlow is imported lazily in ``_build_keras`` so that parsing and the
+# NumPy backend work (and ``import mlp_compiler`` stays fast) without it.
 
 _LAYER_REGEX = re.compile(r"(?P<name>[A-Za-z]+)\s*\((?P<args>[^)]*)\)\s*$")
-_SUPPORTED_ACTIVATIONS = {"relu", "sigmoid", "tanh", "softmax", "linear"}
+_SUPPORTED_ACTIVATIONS = SUPPORTED_ACTIVATIONS
+# Activations each backend can build. tf.keras 2.x has no "log_softmax"
+# activation, and build_and_train's loss expects probabilities, not log-probabilities.
+BACKEND_ACTIVATIONS = {
+    "numpy": SUPPORTED_ACTIVATIONS,
+    "keras": SUPPORTED_ACTIVATIONS - {"log_softmax"},
+}
+_BACKENDS = set(BACKEND_ACTIVATIONS)
 
 
 class ArchitectureError(ValueError):
@@ -51,16 +59,24 @@ def _parse_layer(token: str) -> ParsedLayer:
     return ParsedLayer(name=name, args=args)
 
 
-def compile_model(architecture_string: str, input_dim: int | None = None) -> keras.Sequential:
-    """Compile a textual architecture description into a ``tf.keras.Sequential`` model."""
+def resolve_layers(
+    architecture_string: str, input_dim: Optional[int]
+) -> Tuple[Optional[int], List[ParsedLayer]]:
+    """Parse and validate an architecture string.
+
+    Returns the input dimension of the first ``Dense`` layer and the list of
+    computational layers with normalized arguments: ``dense`` layers carry
+    ``[units, activation_or_None]`` and ``dropout`` layers ``[rate]``.
+    ``Input`` nodes are consumed.
+    """
 
     tokens = [tok.strip() for tok in architecture_string.split("->") if tok.strip()]
     if not tokens:
         raise ArchitectureError("La arquitectura no puede estar vacía")
 
     parsed = [_parse_layer(tok) for tok in tokens]
-    model_layers: List[layers.Layer] = []
-    inferred_input_dim: int | None = None
+    resolved: List[ParsedLayer] = []
+    inferred_input_dim: Optional[int] = None
 
     for layer in parsed:
         if layer.name == "input":
@@ -82,16 +98,7 @@ def compile_model(architecture_string: str, input_dim: int | None = None) -> ker
                 activation = layer.args[1]
                 if activation not in _SUPPORTED_ACTIVATIONS:
                     raise ArchitectureError(f"Activación no soportada: {activation}")
-
-            if not model_layers:
-                first_input = input_dim if input_dim is not None else inferred_input_dim
-                if first_input is None:
-                    raise ArchitectureError(
-                        "La primera capa Dense requiere 'input_dim' o un nodo Input(dim)."
-                    )
-                model_layers.append(layers.Dense(units, activation=activation, input_shape=(first_input,)))
-            else:
-                model_layers.append(layers.Dense(units, activation=activation))
+            resolved.append(ParsedLayer(name="dense", args=[units, activation]))
             continue
 
         if layer.name == "dropout":
@@ -100,9 +107,107 @@ def compile_model(architecture_string: str, input_dim: int | None = None) -> ker
             rate = float(layer.args[0])
             if not 0 <= rate < 1:
                 raise ArchitectureError("Dropout rate debe estar entre 0 y 1")
-            model_layers.append(layers.Dropout(rate))
+            resolved.append(ParsedLayer(name="dropout", args=[rate]))
             continue
 
         raise ArchitectureError(f"Tipo de capa no soportado: {layer.name}")
 
+    first_input = input_dim if input_dim is not None else inferred_input_dim
+    if resolved and resolved[0].name == "dense" and first_input is None:
+        raise ArchitectureError("La primera capa Dense requiere 'input_dim' o un nodo Input(dim).")
+    return first_input, resolved
+
+
+def normalize_architecture(architecture_string: str, input_dim: Optional[int] = None) -> str:
+    """Return a canonical spelling of an architecture string.
+
+    Whitespace, case and number formatting are normalized, ``Dense`` layers
+    always spell their activation (``linear`` by default) and the resolved
+    input dimension is written as a leading ``Input(dim)`` node, so equivalent
+    descriptions map to the same string (e.g. for cache keys).
+    """
+
+    first_input, resolved = resolve_layers(architecture_string, input_dim)
+    tokens = [f"Input({first_input})"] if first_input is not None else []
+    for layer in resolved:
+        if layer.name == "dense":
+            units, activation = layer.args
+            tokens.append(f"Dense({units}, {activation or 'linear'})")
+        else:
+            tokens.append(f"Dropout({layer.args[0]:g})")
+    return " -> ".join(tokens)
+
+
+def validate_architecture(architecture_string: str, input_dim: Optional[int] = None, *, backend: str = "keras") -> None:
+    """Raise :class:`ArchitectureError` unless ``backend`` can build the architecture.
+
+    Besides the syntax checks of :func:`normalize_architecture`, every
+    activation must be available in ``backend`` (see ``BACKEND_ACTIVATIONS``).
+    """
+
+    if backend not in _BACKENDS:
+        raise ArchitectureError(f"Backend no soportado: {backend}")
+    _, resolved = resolve_layers(architecture_string, input_dim)
+    for layer in resolved:
+        activation = layer.args[1] if layer.name == "dense" else None
+        if activation is not None and activation not in BACKEND_ACTIVATIONS[backend]:
+            raise ArchitectureError(f"Activación no soportada con backend='{backend}': {activation}")
+
+
+def _build_keras(first_input: Optional[int], resolved: List[ParsedLayer]) -> "keras.Sequential":
+    from tensorflow import keras
+    from tensorflow.keras import layers
+
+    model_layers: List[layers.Layer] = []
+    for layer in resolved:
+        if layer.name == "dense":
+            units, activation = layer.args
+            if not model_layers:
+                model_layers.append(layers.Dense(units, activation=activation, input_shape=(first_input,)))
+            else:
+                model_layers.append(layers.Dense(units, activation=activation))
+        else:
+            model_layers.append(layers.Dropout(layer.args[0]))
     return keras.Sequential(model_layers, name="compiled_from_text")
+
+
+def _build_numpy(first_input: Optional[int], resolved: List[ParsedLayer], dtype: Any = None) -> MLP:
+    # Dropout is the identity at inference time, so it is simply skipped.
+    mlp_layers: List[Layer] = []
+    in_features = first_input
+    if in_features is None:
+        raise ArchitectureError("El backend NumPy requiere 'input_dim' o un nodo Input(dim).")
+    for layer in resolved:
+        if layer.name != "dense":
+            continue
+        units, activation = layer.args
+        mlp_layers.append(Layer(in_features, units, activation or "linear", dtype=dtype))
+        in_features = units
+    if not mlp_layers:
+        raise ArchitectureError("El backend NumPy requiere al menos una capa Dense")
+    return MLP(mlp_layers)
+
+
+def compile_model(
+    architecture_string: str,
+    input_dim: int | None = None,
+    *,
+    backend: str = "keras",
+    dtype: Any = None,
+) -> Union["keras.Sequential", MLP]:
+    """Compile a textual architecture description into a model.
+
+    With ``backend="keras"`` (default) a ``tf.keras.Sequential`` is returned.
+    With ``backend="numpy"`` the result is a :class:`~mlp_compiler.numpy_mlp.MLP`
+    with freshly initialized weights; ``Dropout`` layers are dropped because
+    they are a no-op at inference. ``dtype`` (float64, float32 or float16)
+    sets the weight storage precision and is only supported by that backend.
+    """
+
+    validate_architecture(architecture_string, input_dim, backend=backend)
+    first_input, resolved = resolve_layers(architecture_string, input_dim)
+    if backend == "numpy":
+        return _build_numpy(first_input, resolved, dtype)
+    if dtype is not None:
+        raise ArchitectureError("dtype solo está soportado con backend='numpy'")
+    return _build_keras(first_input, resolved)
@@ -0,0 +1,211 @@
+"""Static cost analysis of architecture strings, without building any model.
+
+Uses the compiler's parser to count parameters, forward FLOPs per sample
+and activation memory, so expensive submissions can be rejected (or
+flagged) before any compute or memory is spent. TensorFlow is never
+imported.
+
+FLOPs count a multiply-add as two operations plus one operation per output
+element for the bias and one for the activation. Memory figures only cover
+weights and activations, not framework overhead.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .compiler import ArchitectureError, normalize_architecture, resolve_layers
+
+# Adam keeps the weights, their gradients and two moment estimates.
+_TRAINING_WEIGHT_COPIES = 4
+
+
+def dense_flops(in_features: int, out_features: int) -> int:
+    """Forward FLOPs per sample of ``act(x @ W + b)`` with the module's counting rule."""
+
+    return 2 * in_features * out_features + 2 * out_features
+
+
+# What to do with an over-budget architecture (see enforce_budget).
+BUDGET_MODES = ("reject", "warn")
+
+
+class BudgetExceededError(ArchitectureError):
+    """Raised when an architecture exceeds a configured :class:`CostBudget`."""
+
+
+@dataclass
+class LayerCost:
+    index: int
+    kind: str
+    in_features: int
+    out_features: int
+    params: int
+    flops: int
+
+
+@dataclass
+class ArchitectureCost:
+    """Per-sample costs of an architecture; byte helpers take dtype and batch size."""
+
+    architecture: str
+    input_dim: int
+    layers: List[LayerCost] = field(default_factory=list)
+
+    @property
+    def params(self) -> int:
+        return sum(layer.params for layer in self.layers)
+
+    @property
+    def flops_per_sample(self) -> int:
+        return sum(layer.flops for layer in self.layers)
+
+    def weight_bytes(self, dtype: Any = "float32") -> int:
+        return self.params * np.dtype(dtype).itemsize
+
+    def peak_activation_bytes(self, batch_size: int, dtype: Any = "float32") -> int:
+        """Inference peak: the largest input + output pair alive at once."""
+
+        widest = max((layer.in_features + layer.out_features for layer in self.layers), default=self.input_dim)
+        return widest * batch_size * np.dtype(dtype).itemsize
+
+    def training_bytes(self, batch_size: int, dtype: Any = "float32") -> int:
+        """Rough training footprint: every activation kept for backprop plus optimizer state."""
+
+        kept = self.input_dim + sum(layer.out_features for layer in self.layers)
+        itemsize = np.dtype(dtype).itemsize
+        return kept * batch_size * itemsize + _TRAINING_WEIGHT_COPIES * self.params * itemsize
+
+    def summary(self, batch_size: int = 1, dtype: Any = "float32") -> Dict[str, Any]:
+        return {
+            "architecture": self.architecture,
+            "params": self.params,
+            "weight_bytes": {name: self.weight_bytes(name) for name in ("float64", "float32", "float16", "int8")},
+            "flops_per_sample": self.flops_per_sample,
+            "batch_size": batch_size,
+            "dtype": str(np.dtype(dtype)),
+            "peak_activation_bytes": self.peak_activation_bytes(batch_size, dtype),
+            "training_bytes": self.training_bytes(batch_size, dtype),
+            "layers": [asdict(layer) for layer in self.layers],
+        }
+
+
+def analyze_architecture(architecture_string: str, input_dim: Optional[int] = None) -> ArchitectureCost:
+    """Return the static costs of ``architecture_string``.
+
+    Raises :class:`~mlp_compiler.compiler.ArchitectureError` for invalid
+    strings, like :func:`~mlp_compiler.compiler.compile_model`.
+    """
+
+    first_input, resolved = resolve_layers(architecture_string, input_dim)
+    if first_input is None:
+        raise ArchitectureError("El análisis de coste requiere 'input_dim' o un nodo Input(dim).")
+
+    cost = ArchitectureCost(normalize_architecture(architecture_string, input_dim), first_input)
+    width = first_input
+    for index, layer in enumerate(resolved):
+        if layer.name == "dense":
+            units = layer.args[0]
+            if units <= 0:
+                raise ArchitectureError("El argumento 'units' debe ser positivo")
+            params = width * units + units
+            flops = dense_flops(width, units)
+            cost.layers.append(LayerCost(index, "dense", width, units, params, flops))
+            width = units
+        else:
+            # Dropout is the identity at inference.
+            cost.layers.append(LayerCost(index, "dropout", width, width, 0, 0))
+    return cost
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(float(value)) if value else None
+
+
+@dataclass
+class CostBudget:
+    """Upper limits checked by :func:`check_budget`; ``None`` disables a limit."""
+
+    max_params: Optional[int] = None
+    max_flops_per_sample: Optional[int] = None
+    max_training_bytes: Optional[int] = None
+    dtype: str = "float32"
+
+    @classmethod
+    def from_env(
+        cls,
+        prefix: str = "MLP_BUDGET_",
+        *,
+        max_params: Optional[int] = None,
+        max_flops_per_sample: Optional[int] = None,
+        max_memory_mb: Optional[int] = None,
+    ) -> "CostBudget":
+        """Read ``<prefix>MAX_PARAMS``, ``MAX_FLOPS`` and ``MAX_MEMORY_MB``.
+
+        The keyword arguments are the defaults used for unset variables; set a
+        variable to ``0`` to disable that limit.
+        """
+
+        def read(name: str, default: Optional[int]) -> Optional[int]:
+            value = _env_int(f"{prefix}{name}")
+            if value is None:
+                return default
+            return value or None
+
+        memory_mb = read("MAX_MEMORY_MB", max_memory_mb)
+        return cls(
+            max_params=read("MAX_PARAMS", max_params),
+            max_flops_per_sample=read("MAX_FLOPS", max_flops_per_sample),
+            max_training_bytes=memory_mb * 1024 * 1024 if memory_mb is not None else None,
+        )
+
+
+def check_budget(cost: ArchitectureCost, budget: CostBudget, *, batch_size: int) -> List[str]:
+    """Return one message per exceeded limit (empty when within budget)."""
+
+    problems = []
+    if budget.max_params is not None and cost.params > budget.max_params:
+        problems.append(f"{cost.params:,} parámetros superan el límite de {budget.max_params:,}")
+    if budget.max_flops_per_sample is not None and cost.flops_per_sample > budget.max_flops_per_sample:
+        problems.append(
+            f"{cost.flops_per_sample:,} FLOPs por muestra superan el límite de {budget.max_flops_per_sample:,}"
+        )
+    if budget.max_training_bytes is not None:
+        needed = cost.training_bytes(batch_size, budget.dtype)
+        if needed > budget.max_training_bytes:
+            problems.append(
+                f"~{needed / 2**20:,.0f} MB de memoria de entrenamiento (batch {batch_size}) superan el "
+                f"límite de {budget.max_training_bytes / 2**20:,.0f} MB"
+            )
+    return problems
+
+
+def enforce_budget(
+    cost: ArchitectureCost,
+    budget: CostBudget,
+    *,
+    batch_size: int,
+    mode: str = "reject",
+    warn: Optional[Callable[[str], None]] = None,
+) -> List[str]:
+    """Apply ``budget`` to ``cost`` and return the exceeded limits.
+
+    Over budget, ``mode="reject"`` raises :class:`BudgetExceededError` with
+    every problem; ``mode="warn"`` only passes the same message to ``warn``
+    (e.g. a logger) when given.
+    """
+
+    if mode not in BUDGET_MODES:
+        raise ValueError(f"Modo de presupuesto desconocido: {mode} (usa {', '.join(BUDGET_MODES)})")
+    problems = check_budget(cost, budget, batch_size=batch_size)
+    if problems:
+        message = "Arquitectura demasiado costosa: " + "; ".join(problems)
+        if mode == "reject":
+            raise BudgetExceededError(message)
+        if warn is not None:
+            warn(message)
+    return problems
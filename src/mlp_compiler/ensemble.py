@@ -0,0 +1,130 @@
+"""Batched inference for ensembles of same-shape NumPy MLPs.
+
+The weights of ``K`` networks with identical layer shapes and activations are
+stacked into one ``(K, in, out)`` array per layer, so each layer of the whole
+ensemble is a single broadcast ``np.matmul``: the first layer multiplies the
+shared ``(n, in)`` input by every model at once and later layers run a
+batched ``(K, n, in) @ (K, in, out)`` product. Python dispatch no longer grows
+with ``K`` and each weight block is streamed through the cache once per call.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, List, Sequence, Union
+
+import numpy as np
+
+from .activations import ACTIVATIONS
+from .numpy_mlp import MLP, _assert_ndarray, compute_dtype
+
+AGGREGATIONS = ("mean", "vote", "none")
+
+
+class MLPEnsemble:
+    """Evaluate ``K`` same-shape :class:`~mlp_compiler.numpy_mlp.MLP` models together.
+
+    Parameters
+    ----------
+    models:
+        Networks with the same number of layers, layer shapes and activations.
+        Their weights are copied into the stacked arrays; storage dtypes are
+        promoted to a common compute dtype (float16 computes in float32).
+    """
+
+    def __init__(self, models: Iterable[MLP]):
+        models = list(models)
+        if not models:
+            raise ValueError("Se requiere al menos un modelo")
+        reference = models[0].layers
+        signature = [(layer.in_features, layer.out_features, layer.activation_name) for layer in reference]
+        for index, model in enumerate(models[1:], start=1):
+            other = [(layer.in_features, layer.out_features, layer.activation_name) for layer in model.layers]
+            if other != signature:
+                raise ValueError(f"El modelo {index} no tiene las mismas capas que el modelo 0")
+
+        self.dtype = compute_dtype(np.result_type(*(layer.dtype for model in models for layer in model.layers)))
+        self.activation_names: List[str] = [name for _, _, name in signature]
+        self.W: List[np.ndarray] = []
+        self.b: List[np.ndarray] = []
+        for position in range(len(signature)):
+            self.W.append(np.stack([model.layers[position].W for model in models]).astype(self.dtype, copy=False))
+            # (K, 1, out) so the bias broadcasts over the rows of every model.
+            bias = np.stack([model.layers[position].b for model in models])[:, None, :]
+            self.b.append(bias.astype(self.dtype, copy=False))
+
+    @classmethod
+    def from_files(cls, paths: Sequence[Union[str, Path]]) -> "MLPEnsemble":
+        """Stack models exported with :func:`~mlp_compiler.export.export_mlp` or ``export_keras``."""
+
+        from .export import load_mlp
+
+        return cls(load_mlp(path, mmap=False) for path in paths)
+
+    def __len__(self) -> int:
+        return self.W[0].shape[0]
+
+    @property
+    def in_features(self) -> int:
+        return self.W[0].shape[1]
+
+    @property
+    def out_features(self) -> int:
+        return self.W[-1].shape[2]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(W.nbytes + b.nbytes for W, b in zip(self.W, self.b))
+
+    def predict_all(self, X: np.ndarray) -> np.ndarray:
+        """Return the output of every model with shape ``(K, n, out_features)``."""
+
+        _assert_ndarray(X, "X")
+        if X.ndim != 2 or X.shape[1] != self.in_features:
+            raise ValueError(f"Dimensión de entrada esperada {self.in_features}, recibida {X.shape[-1]}")
+        # (n, in) @ (K, in, out) broadcasts the shared input without copying it.
+        out = X.astype(self.dtype, copy=False)
+        for W, b, name in zip(self.W, self.b, self.activation_names):
+            Z = np.matmul(out, W)
+            Z += b
+            out = ACTIVATIONS[name](Z, out=Z)
+        return out
+
+    def predict(self, X: np.ndarray, aggregate: str = "mean") -> np.ndarray:
+        """Predict with the whole ensemble.
+
+        ``aggregate`` selects the result:
+
+        - ``"mean"``: average output, shape ``(n, out_features)``.
+        - ``"vote"``: majority class per row, shape ``(n,)``; ties go to the
+          tied class with the highest average output.
+        - ``"none"``: every model's output, shape ``(K, n, out_features)``.
+        """
+
+        if aggregate not in AGGREGATIONS:
+            raise ValueError(f"Agregación desconocida: {aggregate} (usa {', '.join(AGGREGATIONS)})")
+        outputs = self.predict_all(X)
+        if aggregate == "none":
+            return outputs
+        mean = outputs.mean(axis=0)
+        if aggregate == "mean":
+            return mean
+        labels = outputs.argmax(axis=-1)
+        counts = np.zeros(mean.shape, dtype=np.int64)
+        rows = np.arange(mean.shape[0])
+        for model_labels in labels:
+            counts[rows, model_labels] += 1
+        tied = counts == counts.max(axis=1, keepdims=True)
+        return np.where(tied, mean, -np.inf).argmax(axis=1)
+
+    def members(self) -> List[MLP]:
+        """Rebuild the individual networks as views of the stacked weights."""
+
+        from .numpy_mlp import Layer
+
+        return [
+            MLP(
+                Layer.from_weights(W[k], b[k, 0], name)
+                for W, b, name in zip(self.W, self.b, self.activation_names)
+            )
+            for k in range(len(self))
+        ]
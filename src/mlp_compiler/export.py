@@ -0,0 +1,159 @@
+"""Compact single-file model export with zero-copy (memory-mapped) loading.
+
+File layout (``.mlpc``)::
+
+    8 bytes   magic  b"MLPCOMP1"
+    8 bytes   little-endian uint64 length of the JSON header
+    N bytes   UTF-8 JSON header (architecture string, dtype, layer table)
+    ...       weight blocks, each aligned to 64 bytes
+
+The header stores, for every layer, its shape, activation and the absolute
+file offsets of ``W`` (row-major ``(in, out)``) and ``b``. :func:`load_mlp`
+maps the file read-only and wraps those regions as NumPy views, so no weight
+is copied and every process serving the same file shares one page-cached copy.
+"""
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .compiler import ArchitectureError
+from .numpy_mlp import Layer, MLP
+
+MAGIC = b"MLPCOMP1"
+_ALIGN = 64
+_PREFIX = struct.Struct("<8sQ")
+
+PathLike = Union[str, Path]
+DenseWeights = Tuple[np.ndarray, np.ndarray, str]
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def architecture_from_layers(layers: List[DenseWeights]) -> str:
+    """Describe dense weights with the project's mini-language."""
+
+    tokens = [f"Input({layers[0][0].shape[0]})"]
+    tokens += [f"Dense({W.shape[1]}, {activation})" for W, _, activation in layers]
+    return " -> ".join(tokens)
+
+
+def keras_dense_weights(model: Any) -> List[DenseWeights]:
+    """Extract ``(W, b, activation)`` from a ``Sequential`` built by ``compile_model``.
+
+    ``Dropout`` layers are skipped because they do nothing at inference.
+    """
+
+    dense: List[DenseWeights] = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind == "Dropout":
+            continue
+        if kind != "Dense":
+            raise ArchitectureError(f"Tipo de capa no exportable: {kind}")
+        weights = layer.get_weights()
+        kernel = np.asarray(weights[0])
+        bias = np.asarray(weights[1]) if len(weights) > 1 else np.zeros(kernel.shape[1], kernel.dtype)
+        activation = layer.get_config().get("activation") or "linear"
+        dense.append((kernel, bias, activation))
+    if not dense:
+        raise ArchitectureError("El modelo no contiene capas Dense")
+    return dense
+
+
+def _write(path: PathLike, layers: List[DenseWeights], architecture: Optional[str], dtype: Any) -> Path:
+    dtype = np.dtype(dtype)
+    table: List[Dict[str, Any]] = []
+    offset = 0
+    for W, b, activation in layers:
+        w_offset = _align(offset)
+        b_offset = _align(w_offset + W.size * dtype.itemsize)
+        offset = b_offset + b.size * dtype.itemsize
+        table.append(
+            {"in": int(W.shape[0]), "out": int(W.shape[1]), "activation": activation, "W": w_offset, "b": b_offset}
+        )
+
+    header = {
+        "architecture": architecture or architecture_from_layers(layers),
+        "dtype": dtype.str,
+        "layers": table,
+    }
+    # Offsets are relative to the data section until the header size is known.
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header_bytes) + 256)
+    for entry in table:
+        entry["W"] += data_start
+        entry["b"] += data_start
+    header_bytes = json.dumps(header).encode("utf-8")
+    if _PREFIX.size + len(header_bytes) > data_start:  # pragma: no cover - 256 bytes of slack
+        raise RuntimeError("Cabecera demasiado grande")
+
+    path = Path(path)
+    with path.open("wb") as fh:
+        fh.write(_PREFIX.pack(MAGIC, len(header_bytes)))
+        fh.write(header_bytes)
+        for (W, b, _), entry in zip(layers, table):
+            fh.seek(entry["W"])
+            fh.write(np.ascontiguousarray(W, dtype=dtype).tobytes())
+            fh.seek(entry["b"])
+            fh.write(np.ascontiguousarray(b, dtype=dtype).tobytes())
+    return path
+
+
+def export_mlp(mlp: MLP, path: PathLike, *, architecture: Optional[str] = None, dtype: Any = None) -> Path:
+    """Write a NumPy :class:`~mlp_compiler.numpy_mlp.MLP` to ``path``.
+
+    ``dtype`` defaults to the dtype of the first layer's weights.
+    """
+
+    layers = [(layer.W, layer.b, layer.activation_name) for layer in mlp.layers]
+    return _write(path, layers, architecture, dtype or mlp.layers[0].W.dtype)
+
+
+def export_keras(
+    model: Any, path: PathLike, *, architecture: Optional[str] = None, dtype: Any = "float32"
+) -> Path:
+    """Write a trained Keras ``Sequential`` (from ``compile_model``) to ``path``."""
+
+    return _write(path, keras_dense_weights(model), architecture, dtype)
+
+
+def read_header(path: PathLike) -> Dict[str, Any]:
+    with Path(path).open("rb") as fh:
+        magic, length = _PREFIX.unpack(fh.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} no es un modelo exportado (.mlpc)")
+        return json.loads(fh.read(length).decode("utf-8"))
+
+
+def load_mlp(path: PathLike, *, mmap: bool = True) -> MLP:
+    """Load an exported model.
+
+    With ``mmap=True`` the weights are read-only views of a memory map of the
+    file (no copies); with ``mmap=False`` they are read into private arrays.
+    The returned model exposes the stored architecture string as
+    ``mlp.architecture``.
+    """
+
+    header = read_header(path)
+    dtype = np.dtype(header["dtype"])
+    if mmap:
+        buffer: np.ndarray = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+
+    layers = []
+    for entry in header["layers"]:
+        n_in, n_out = entry["in"], entry["out"]
+        W = np.ndarray((n_in, n_out), dtype=dtype, buffer=buffer, offset=entry["W"])
+        b = np.ndarray((n_out,), dtype=dtype, buffer=buffer, offset=entry["b"])
+        layers.append(Layer.from_weights(W, b, entry["activation"]))
+    mlp = MLP(layers)
+    mlp.architecture = header["architecture"]
+    return mlp
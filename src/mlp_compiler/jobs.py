@@ -0,0 +1,310 @@
+"""Bounded background job queue used to run trainings outside request threads.
+
+With a ``spool_dir`` shared by several server processes, every job's status,
+result and events are mirrored to files so that any process can report on
+(and cancel) a job running in another one.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = frozenset({DONE, FAILED, CANCELLED})
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the queue already holds the maximum number of pending jobs."""
+
+
+class JobCancelled(Exception):
+    """Raised by a job function to signal that it stopped because of a cancel request."""
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    future: Optional[Future] = field(default=None, repr=False)
+    events: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    spool: Optional[Path] = field(default=None, repr=False)
+    _events_changed: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def cancel_requested(self) -> bool:
+        if self.cancel_event.is_set():
+            return True
+        if self.spool is not None and (self.spool / f"{self.id}.cancel").exists():
+            self.cancel_event.set()
+            return True
+        return False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Append a progress event and wake up every waiting reader."""
+
+        with self._events_changed:
+            self.events.append(event)
+            if self.spool is not None:
+                with (self.spool / f"{self.id}.events").open("a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(event) + "\n")
+            self._events_changed.notify_all()
+
+    def wait_events(self, since: int, timeout: float) -> List[Dict[str, Any]]:
+        """Return events after index ``since``, waiting up to ``timeout`` seconds for new ones."""
+
+        with self._events_changed:
+            if len(self.events) <= since and not self.finished:
+                self._events_changed.wait(timeout)
+            return self.events[since:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class RemoteJob(Job):
+    """Read-only view of a job owned by another process, refreshed from its spool files."""
+
+    poll_interval = 0.25
+
+    def refresh(self) -> bool:
+        try:
+            state = json.loads((self.spool / f"{self.id}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        for name in ("status", "submitted_at", "started_at", "finished_at", "error", "result"):
+            setattr(self, name, state.get(name))
+        try:
+            text = (self.spool / f"{self.id}.events").read_text(encoding="utf-8")
+        except OSError:
+            text = ""
+        # Everything after the last newline may still be being written by the owner.
+        lines = text.split("\n")[:-1]
+        self.events.extend(json.loads(line) for line in lines[len(self.events) :])
+        return True
+
+    @property
+    def finished(self) -> bool:
+        # The state file is written before the final status event, so wait for
+        # the event: readers streaming events must not stop before seeing it.
+        return any(event.get("type") == "status" and event.get("status") in FINISHED_STATES for event in self.events)
+
+    @property
+    def cancel_requested(self) -> bool:
+        return (self.spool / f"{self.id}.cancel").exists()
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        raise RuntimeError("Solo el proceso propietario puede publicar eventos del trabajo")
+
+    def wait_events(self, since: int, timeout: float) -> List[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            self.refresh()
+            if len(self.events) > since or self.finished or time.monotonic() >= deadline:
+                return self.events[since:]
+            time.sleep(self.poll_interval)
+
+
+class JobQueue:
+    """Run job functions on a fixed-size thread pool.
+
+    Parameters
+    ----------
+    max_workers:
+        Number of jobs that may run concurrently.
+    max_pending:
+        Maximum number of queued (not yet running) jobs; further submissions
+        raise :class:`QueueFullError`.
+    max_finished:
+        Number of finished jobs kept for status/result queries; the oldest
+        are forgotten first.
+    spool_dir:
+        Directory shared by every process of a multi-worker server. Jobs are
+        mirrored there and jobs of other processes are served as
+        :class:`RemoteJob` views. ``max_pending`` stays per process.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_pending: int = 8,
+        max_finished: int = 100,
+        spool_dir: Optional[Union[str, Path]] = None,
+    ):
+        if max_workers <= 0:
+            raise ValueError("max_workers debe ser positivo")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.spool_dir = Path(spool_dir) if spool_dir is not None else None
+        if self.spool_dir is not None:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Created lazily so that forking servers start the threads in each worker.
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="training-job"
+            )
+        return self._executor
+
+    def submit(self, fn: Callable[[Job], Any]) -> Job:
+        """Queue ``fn(job)`` and return the job immediately."""
+
+        with self._lock:
+            queued = sum(1 for job in self._jobs.values() if job.status == QUEUED)
+            if queued >= self.max_pending:
+                raise QueueFullError("Hay demasiados entrenamientos en cola, inténtalo más tarde")
+            job = Job(id=uuid.uuid4().hex, spool=self.spool_dir)
+            self._jobs[job.id] = job
+            self._forget_finished()
+            self._persist(job)
+            job.future = self._pool().submit(self._run, job, fn)
+        return job
+
+    def add_completed(self, result: Any) -> Job:
+        """Register an already finished job (e.g. a cache hit) without using the pool."""
+
+        now = time.time()
+        job = Job(id=uuid.uuid4().hex, status=DONE, started_at=now, finished_at=now, result=result, spool=self.spool_dir)
+        self._persist(job)
+        job.publish({"type": "status", "status": DONE})
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_finished()
+        return job
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]) -> None:
+        with self._lock:
+            if job.cancel_requested:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+            else:
+                job.status = RUNNING
+                job.started_at = time.time()
+        self._persist(job)
+        job.publish({"type": "status", "status": job.status})
+        if job.finished:
+            return
+        try:
+            result = fn(job)
+        except JobCancelled:
+            status, result, error = CANCELLED, None, None
+        except Exception as exc:  # noqa: BLE001 - reported through the job status
+            status, result, error = FAILED, None, str(exc)
+        else:
+            status, error = (CANCELLED if job.cancel_requested else DONE), None
+        with self._lock:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+        self._persist(job)
+        job.publish({"type": "status", "status": status, "error": error})
+
+    def _persist(self, job: Job) -> None:
+        # Called before the matching status event is published, so a remote
+        # reader that sees the event also sees the state (and result).
+        if self.spool_dir is None:
+            return
+        state = {**job.to_dict(), "result": job.result}
+        path = self.spool_dir / f"{job.id}.json"
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _remote(self, job_id: str) -> Optional[RemoteJob]:
+        if self.spool_dir is None or not _JOB_ID.match(job_id):
+            return None
+        job = RemoteJob(id=job_id, spool=self.spool_dir)
+        return job if job.refresh() else None
+
+    def _forget_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+            if self.spool_dir is not None:
+                for suffix in (".json", ".events", ".cancel"):
+                    (self.spool_dir / f"{job_id}{suffix}").unlink(missing_ok=True)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job if job is not None else self._remote(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation. Returns ``False`` if the job is unknown or finished.
+
+        Queued jobs never start; running jobs see ``job.cancel_requested`` and
+        are expected to stop at the next opportunity.
+        """
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return self._cancel_remote(job_id)
+            if job.status in FINISHED_STATES:
+                return False
+            job.cancel_event.set()
+            cancelled_in_queue = (
+                job.status == QUEUED and job.future is not None and job.future.cancel()
+            )
+            if cancelled_in_queue:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+        if cancelled_in_queue:
+            self._persist(job)
+            job.publish({"type": "status", "status": CANCELLED})
+        return True
+
+    def _cancel_remote(self, job_id: str) -> bool:
+        # The owning process polls the marker through ``job.cancel_requested``.
+        job = self._remote(job_id)
+        if job is None or job.finished:
+            return False
+        (self.spool_dir / f"{job_id}.cancel").touch()
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status not in FINISHED_STATES:
+                    job.cancel_event.set()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,12 +1,46 @@
-"""Pure NumPy implementation of a minimal MLP forward pass."""
+"""Pure NumPy implementation of a minimal MLP (forward and backward passes)."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Tuple
 
 import numpy as np
 
-from .activations import ACTIVATIONS
+from .activations import ACTIVATIONS, activation_backward
+from .sparse import CSRMatrix, as_csr, is_sparse, sparse_dense_matmul
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .profiling import Profiler
+
+# Storage dtypes accepted by the dtype policy. NumPy has no half-precision
+# GEMM, so float16 weights are upcast to float32 for the matmul (once per
+# layer, see ``Layer._compute_weights``).
+SUPPORTED_DTYPES = (np.dtype(np.float64), np.dtype(np.float32), np.dtype(np.float16))
+
+
+def _check_dtype(dtype: Any) -> np.dtype:
+    dtype = np.dtype(dtype)
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"dtype no soportado: {dtype} (usa float64, float32 o float16)")
+    return dtype
+
+
+def compute_dtype(dtype: Any) -> np.dtype:
+    """Dtype used for arithmetic on weights stored as ``dtype``."""
+
+    dtype = np.dtype(dtype)
+    return np.dtype(np.float32) if dtype == np.float16 else dtype
+
+
+# Called by ``Layer.forward(..., hook=...)`` with the input actually
+# multiplied, the weights, Z, the output and (gemm start, bias start,
+# activation start, end) timestamps from ``time.perf_counter``.
+ForwardHook = Callable[[Any, np.ndarray, np.ndarray, np.ndarray, np.ndarray, Tuple[float, float, float, float]], None]
+
+
+def _no_clock() -> float:
+    return 0.0
 
 
 def _assert_ndarray(x: np.ndarray, name: str) -> None:
@@ -39,12 +73,21 @@ def neuron_forward(x: np.ndarray, w: np.ndarray, b: float, activation: str = "re
 
 @dataclass
 class Layer:
-    """Simple fully connected layer using NumPy arrays."""
+    """Simple fully connected layer using NumPy arrays.
+
+    ``dtype`` selects the storage precision of ``W`` and ``b`` (float64,
+    float32 or float16). When omitted, new weights are float64 and given
+    weights keep their own dtype. Inputs are cast to :attr:`compute_dtype`
+    so that a float32 layer never silently computes in float64.
+    """
 
     in_features: int
     out_features: int
     activation_name: str = "relu"
     weight_scale: float = 0.01
+    W: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    b: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    dtype: Any = None
 
     def __post_init__(self) -> None:
         if self.activation_name not in ACTIVATIONS:
@@ -52,23 +95,163 @@ class Layer:
         if self.in_features <= 0 or self.out_features <= 0:
             raise ValueError("in_features y out_features deben ser positivos")
 
-        if self.activation_name == "relu":
-            scale = np.sqrt(2.0 / self.in_features)
+        dtype = _check_dtype(self.dtype) if self.dtype is not None else None
+        if self.W is None:
+            if self.activation_name == "relu":
+                scale = np.sqrt(2.0 / self.in_features)
+            else:
+                scale = np.sqrt(1.0 / self.in_features)
+            scale *= self.weight_scale / 0.01
+            W = np.random.randn(self.in_features, self.out_features) * scale
+            self.W = W.astype(dtype or np.float64, copy=False)
+        elif self.W.shape != (self.in_features, self.out_features):
+            raise ValueError(
+                f"W debe tener forma {(self.in_features, self.out_features)}, recibida {self.W.shape}"
+            )
+        elif dtype is not None:
+            self.W = self.W.astype(dtype, copy=False)
+        if self.b is None:
+            self.b = np.zeros((self.out_features,), dtype=self.W.dtype)
+        elif self.b.shape != (self.out_features,):
+            raise ValueError(f"b debe tener forma {(self.out_features,)}, recibida {self.b.shape}")
         else:
-            scale = np.sqrt(1.0 / self.in_features)
-        scale *= self.weight_scale / 0.01
+            self.b = self.b.astype(self.W.dtype, copy=False)
+        self.dtype = self.W.dtype
+        self.dW: Optional[np.ndarray] = None
+        self.db: Optional[np.ndarray] = None
+        self._cache: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        # (W, b, W in compute dtype, b in compute dtype) for float16 storage.
+        self._compute_copy: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def from_weights(cls, W: np.ndarray, b: np.ndarray, activation_name: str = "relu") -> "Layer":
+        """Build a layer around existing weight arrays (no copy is made)."""
+
+        _assert_ndarray(W, "W")
+        _assert_ndarray(b, "b")
+        return cls(W.shape[0], W.shape[1], activation_name, W=W, b=b)
+
+    @property
+    def compute_dtype(self) -> np.dtype:
+        return compute_dtype(self.dtype)
 
-        self.W = np.random.randn(self.in_features, self.out_features) * scale
-        self.b = np.zeros((self.out_features,), dtype=np.float64)
+    @property
+    def nbytes(self) -> int:
+        return self.W.nbytes + self.b.nbytes
 
-    def forward(self, X: np.ndarray) -> np.ndarray:
-        _assert_ndarray(X, "X")
+    def astype(self, dtype: Any) -> "Layer":
+        """Return a copy of the layer with weights stored as ``dtype``."""
+
+        dtype = _check_dtype(dtype)
+        return Layer.from_weights(self.W.astype(dtype), self.b.astype(dtype), self.activation_name)
+
+    def _compute_weights(self) -> Tuple[np.ndarray, np.ndarray]:
+        """``W`` and ``b`` in the compute dtype.
+
+        float16 layers convert once and keep the float32 copy until ``W`` or
+        ``b`` is reassigned or :meth:`backward` runs (optimizers then update
+        the stored weights in place), so inference does not convert every
+        matrix on every call. The copy costs float32 memory: float16 shrinks
+        exported files and transfers, not the resident size of a live model.
+        """
+
+        target = self.compute_dtype
+        if self.W.dtype == target:
+            return self.W, self.b
+        copy = self._compute_copy
+        if copy is None or copy[0] is not self.W or copy[1] is not self.b:
+            copy = (self.W, self.b, self.W.astype(target), self.b.astype(target))
+            self._compute_copy = copy
+        return copy[2], copy[3]
+
+    def forward(self, X: np.ndarray, *, cache: bool = False, hook: Optional[ForwardHook] = None) -> np.ndarray:
+        """Compute the layer output.
+
+        When ``cache`` is true the input, pre-activation and output are kept so
+        that :meth:`backward` can be called afterwards.
+
+        ``X`` may also be sparse (:class:`~mlp_compiler.sparse.CSRMatrix` or
+        ``scipy.sparse``); see :func:`~mlp_compiler.sparse.sparse_dense_matmul`.
+
+        ``hook`` (used by :class:`~mlp_compiler.profiling.Profiler`) receives
+        the timings of the GEMM, bias and activation phases of this very call.
+        """
+
+        sparse = is_sparse(X)
+        if sparse:
+            X = as_csr(X)
+        else:
+            _assert_ndarray(X, "X")
         if X.shape[1] != self.in_features:
             raise ValueError(
                 f"Dimensión de entrada esperada {self.in_features}, recibida {X.shape[1]}"
             )
-        Z = X @ self.W + self.b
-        return ACTIVATIONS[self.activation_name](Z)
+        if sparse and cache:
+            # backward needs a dense X for dW = X.T @ grad_z.
+            X, sparse = X.toarray(self.compute_dtype), False
+        W, b = self._compute_weights()
+        if not sparse:
+            X = X.astype(self.compute_dtype, copy=False)
+        clock = time.perf_counter if hook is not None else _no_clock
+        t0 = clock()
+        Z = sparse_dense_matmul(X, W) if sparse else X @ W
+        t1 = clock()
+        Z += b
+        t2 = clock()
+        activation = ACTIVATIONS[self.activation_name]
+        if not cache:
+            # Z is not needed afterwards, so the activation overwrites it.
+            self._cache = None
+            A = activation(Z, out=Z)
+        else:
+            A = activation(Z)
+            self._cache = (X, Z, A)
+        if hook is not None:
+            hook(X, W, b, Z, A, (t0, t1, t2, clock()))
+        return A
+
+    def forward_into(self, X: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Compute the layer output into the preallocated ``out`` buffer.
+
+        Matmul, bias and activation all write to ``out`` so no temporaries are
+        created. ``out`` must have shape ``(X.shape[0], out_features)``. A
+        sparse ``X`` goes through :func:`~mlp_compiler.sparse.sparse_dense_matmul`,
+        whose result is copied into ``out``.
+        """
+
+        W, b = self._compute_weights()
+        if is_sparse(X):
+            np.copyto(out, sparse_dense_matmul(X, W))
+        else:
+            np.matmul(X.astype(out.dtype, copy=False), W, out=out)
+        np.add(out, b, out=out)
+        return ACTIVATIONS[self.activation_name](out, out=out)
+
+    def backward(self, grad_output: np.ndarray) -> np.ndarray:
+        """Backpropagate ``dL/dA`` through the activation and the affine map.
+
+        Stores the parameter gradients in :attr:`dW` and :attr:`db` and returns
+        ``dL/dX`` for the previous layer.
+        """
+
+        if self._cache is None:
+            raise RuntimeError("backward requiere una llamada previa a forward(..., cache=True)")
+        _, Z, A = self._cache
+        grad_z = activation_backward(self.activation_name, grad_output, Z, A)
+        return self.backward_preactivation(grad_z)
+
+    def backward_preactivation(self, grad_z: np.ndarray) -> np.ndarray:
+        """Backpropagate a gradient already expressed with respect to ``Z``."""
+
+        if self._cache is None:
+            raise RuntimeError("backward requiere una llamada previa a forward(..., cache=True)")
+        X = self._cache[0]
+        self.dW = X.T @ grad_z
+        self.db = grad_z.sum(axis=0)
+        grad_input = grad_z @ self._compute_weights()[0].T
+        self._cache = None
+        self._compute_copy = None
+        return grad_input
 
 
 class MLP:
@@ -78,9 +261,119 @@ class MLP:
         self.layers: List[Layer] = list(layers)
         if not self.layers:
             raise ValueError("Se requiere al menos una capa")
+        # Opt-in per-layer profiling (see mlp_compiler.profiling).
+        self.profiler: Optional["Profiler"] = None
 
     def predict(self, X: np.ndarray) -> np.ndarray:
+        if self.profiler is not None:
+            return self.profiler.run(self, X)
         out = X
         for layer in self.layers:
             out = layer.forward(out)
         return out
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by every layer's weights and biases."""
+
+        return sum(layer.nbytes for layer in self.layers)
+
+    def astype(self, dtype: Any) -> "MLP":
+        """Return a copy of the network with every layer stored as ``dtype``."""
+
+        return MLP(layer.astype(dtype) for layer in self.layers)
+
+    def plan_inference(self, max_batch_size: int) -> "InferenceWorkspace":
+        """Return an :class:`InferenceWorkspace` sized for ``max_batch_size`` rows."""
+
+        return InferenceWorkspace(self, max_batch_size)
+
+    def forward(self, X: np.ndarray, *, cache: bool = False) -> np.ndarray:
+        """Forward pass that optionally caches intermediates for :meth:`backward`."""
+
+        out = X
+        for layer in self.layers:
+            out = layer.forward(out, cache=cache)
+        return out
+
+    def backward(self, grad_output: np.ndarray, *, preactivation: bool = False) -> np.ndarray:
+        """Backpropagate ``dL/dY`` through every layer, last to first.
+
+        With ``preactivation=True`` the gradient is taken with respect to the
+        last layer's ``Z`` (used by fused softmax + cross-entropy).
+        """
+
+        *hidden, last = self.layers
+        if preactivation:
+            grad = last.backward_preactivation(grad_output)
+        else:
+            grad = last.backward(grad_output)
+        for layer in reversed(hidden):
+            grad = layer.backward(grad)
+        return grad
+
+    def parameters(self) -> List[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Return ``(param, grad)`` pairs in a stable order for the optimizers."""
+
+        pairs: List[Tuple[np.ndarray, Optional[np.ndarray]]] = []
+        for layer in self.layers:
+            pairs.append((layer.W, layer.dW))
+            pairs.append((layer.b, layer.db))
+        return pairs
+
+
+class InferenceWorkspace:
+    """Per-layer output buffers planned once for allocation-free inference.
+
+    The buffers are allocated for ``max_batch_size`` rows when the workspace is
+    created and reused by every :meth:`predict` call. Larger inputs are
+    processed in chunks of ``max_batch_size`` rows.
+
+    The array returned by :meth:`predict` is a view of an internal buffer that
+    is overwritten by the next call; copy it or pass ``out`` to keep results.
+    """
+
+    def __init__(self, mlp: MLP, max_batch_size: int):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size debe ser positivo")
+        self.mlp = mlp
+        self.max_batch_size = max_batch_size
+        self.buffers: List[np.ndarray] = [
+            np.empty((max_batch_size, layer.out_features), dtype=layer.compute_dtype)
+            for layer in mlp.layers
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buf.nbytes for buf in self.buffers)
+
+    def _run(self, X: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+        n = X.shape[0]
+        current = X
+        last = len(self.mlp.layers) - 1
+        for i, layer in enumerate(self.mlp.layers):
+            target = out if (i == last and out is not None) else self.buffers[i][:n]
+            current = layer.forward_into(current, target)
+        return current
+
+    def predict(self, X: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if is_sparse(X):
+            X = as_csr(X)
+        else:
+            _assert_ndarray(X, "X")
+        first = self.mlp.layers[0]
+        if X.ndim != 2 or X.shape[1] != first.in_features:
+            raise ValueError(
+                f"Dimensión de entrada esperada {first.in_features}, recibida {X.shape[-1]}"
+            )
+        n = X.shape[0]
+        if n <= self.max_batch_size:
+            return self._run(X, out)
+
+        if out is None:
+            out = np.empty((n, self.buffers[-1].shape[1]), dtype=self.buffers[-1].dtype)
+        for start in range(0, n, self.max_batch_size):
+            stop = min(start + self.max_batch_size, n)
+            rows = X.rows(start, stop) if isinstance(X, CSRMatrix) else X[start:stop]
+            self._run(rows, out[start:stop])
+        return out
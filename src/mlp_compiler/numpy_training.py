@@ -0,0 +1,327 @@
+"""Mini-batch training for :class:`~mlp_compiler.numpy_mlp.MLP` without TensorFlow."""
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .numpy_mlp import MLP
+
+ParamGrad = Tuple[np.ndarray, Optional[np.ndarray]]
+LossFn = Callable[[np.ndarray, np.ndarray], Tuple[float, np.ndarray]]
+
+
+def _as_one_hot(y: np.ndarray, num_classes: int) -> np.ndarray:
+    if y.ndim == 2:
+        return y
+    one_hot = np.zeros((y.shape[0], num_classes), dtype=np.float64)
+    one_hot[np.arange(y.shape[0]), y.astype(np.int64)] = 1.0
+    return one_hot
+
+
+def softmax_cross_entropy(logits: np.ndarray, y: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Mean categorical cross-entropy computed from raw logits.
+
+    ``y`` can be one-hot encoded or a vector of integer class ids. Returns the
+    loss and its gradient with respect to ``logits``.
+    """
+
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    sum_exp = exp.sum(axis=1, keepdims=True)
+    log_probs = shifted - np.log(sum_exp)
+    targets = _as_one_hot(y, logits.shape[1])
+    n = logits.shape[0]
+    loss = float(-(targets * log_probs).sum() / n)
+    grad = (exp / sum_exp - targets) / n
+    return loss, grad
+
+
+def softmax_cross_entropy_from_probs(probs: np.ndarray, y: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Cross-entropy for a model whose last layer already applies softmax.
+
+    Returns the loss and the fused gradient with respect to the softmax
+    *pre-activation*, ``(probs - y) / n``.
+    """
+
+    targets = _as_one_hot(y, probs.shape[1])
+    n = probs.shape[0]
+    loss = float(-(targets * np.log(np.maximum(probs, 1e-12))).sum() / n)
+    return loss, (probs - targets) / n
+
+
+def log_softmax_cross_entropy(log_probs: np.ndarray, y: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Cross-entropy for a model whose last layer applies log-softmax.
+
+    No logarithm has to be taken, so the loss stays exact for confident
+    predictions. The gradient is fused with respect to the pre-activation,
+    ``(exp(log_probs) - y) / n``.
+    """
+
+    targets = _as_one_hot(y, log_probs.shape[1])
+    n = log_probs.shape[0]
+    loss = float(-(targets * log_probs).sum() / n)
+    return loss, (np.exp(log_probs) - targets) / n
+
+
+def mse(pred: np.ndarray, y: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Mean squared error and its gradient with respect to ``pred``."""
+
+    targets = _as_one_hot(y, pred.shape[1]) if y.ndim == 1 and pred.shape[1] > 1 else y
+    targets = targets.reshape(pred.shape)
+    diff = pred - targets
+    loss = float(np.mean(diff * diff))
+    grad = 2.0 * diff / diff.size
+    return loss, grad
+
+
+LOSSES: Dict[str, LossFn] = {
+    "softmax_cross_entropy": softmax_cross_entropy,
+    "mse": mse,
+}
+
+
+class SGD:
+    """Stochastic gradient descent with optional (classical) momentum."""
+
+    def __init__(self, learning_rate: float = 0.01, momentum: float = 0.0):
+        if learning_rate <= 0:
+            raise ValueError("learning_rate debe ser positivo")
+        if not 0 <= momentum < 1:
+            raise ValueError("momentum debe estar entre 0 y 1")
+        self.learning_rate = learning_rate
+        self.momentum = momentum
+        self._velocity: List[np.ndarray] = []
+
+    def step(self, params: Sequence[ParamGrad]) -> None:
+        if self.momentum and not self._velocity:
+            self._velocity = [np.zeros_like(p) for p, _ in params]
+        for i, (param, grad) in enumerate(params):
+            if grad is None:
+                continue
+            if self.momentum:
+                v = self._velocity[i]
+                v *= self.momentum
+                v -= self.learning_rate * grad
+                param += v
+            else:
+                param -= self.learning_rate * grad
+
+
+class Adam:
+    """Adam optimizer using the same defaults as ``tf.keras.optimizers.Adam``."""
+
+    def __init__(
+        self,
+        learning_rate: float = 0.001,
+        beta_1: float = 0.9,
+        beta_2: float = 0.999,
+        epsilon: float = 1e-7,
+    ):
+        if learning_rate <= 0:
+            raise ValueError("learning_rate debe ser positivo")
+        self.learning_rate = learning_rate
+        self.beta_1 = beta_1
+        self.beta_2 = beta_2
+        self.epsilon = epsilon
+        self._m: List[np.ndarray] = []
+        self._v: List[np.ndarray] = []
+        self._t = 0
+
+    def step(self, params: Sequence[ParamGrad]) -> None:
+        if not self._m:
+            self._m = [np.zeros_like(p) for p, _ in params]
+            self._v = [np.zeros_like(p) for p, _ in params]
+        self._t += 1
+        lr_t = self.learning_rate * np.sqrt(1.0 - self.beta_2**self._t) / (1.0 - self.beta_1**self._t)
+        for i, (param, grad) in enumerate(params):
+            if grad is None:
+                continue
+            m, v = self._m[i], self._v[i]
+            m *= self.beta_1
+            m += (1.0 - self.beta_1) * grad
+            v *= self.beta_2
+            v += (1.0 - self.beta_2) * grad * grad
+            param -= lr_t * m / (np.sqrt(v) + self.epsilon)
+
+
+Optimizer = Union[SGD, Adam]
+
+
+def get_optimizer(optimizer: Union[str, Optimizer]) -> Optimizer:
+    """Return an optimizer instance from a name (``sgd``, ``momentum``, ``adam``)."""
+
+    if not isinstance(optimizer, str):
+        return optimizer
+    key = optimizer.lower()
+    if key == "sgd":
+        return SGD()
+    if key == "momentum":
+        return SGD(momentum=0.9)
+    if key == "adam":
+        return Adam()
+    raise ValueError(f"Optimizador desconocido: {optimizer}")
+
+
+def _get_loss(name: str) -> LossFn:
+    try:
+        return LOSSES[name.lower()]
+    except KeyError as exc:
+        raise ValueError(f"Función de pérdida desconocida: {name}") from exc
+
+
+def _resolve_loss(mlp: MLP, loss: str) -> Tuple[LossFn, bool]:
+    """Return the loss to apply on the model output and whether it is fused.
+
+    ``softmax_cross_entropy`` on a model ending in ``softmax`` (or
+    ``log_softmax``) is computed from its output and backpropagated directly to
+    the last pre-activation.
+    """
+
+    loss_fn = _get_loss(loss)
+    if loss_fn is softmax_cross_entropy:
+        last = mlp.layers[-1].activation_name
+        if last == "softmax":
+            return softmax_cross_entropy_from_probs, True
+        if last == "log_softmax":
+            return log_softmax_cross_entropy, True
+    return loss_fn, False
+
+
+def _accuracy(pred: np.ndarray, y: np.ndarray) -> Optional[float]:
+    if pred.shape[1] < 2:
+        return None
+    labels = y.argmax(axis=1) if y.ndim == 2 else y
+    return float(np.mean(pred.argmax(axis=1) == labels))
+
+
+def evaluate_mlp(
+    mlp: MLP,
+    x: np.ndarray,
+    y: np.ndarray,
+    *,
+    loss: str = "softmax_cross_entropy",
+    batch_size: int = 1024,
+) -> Tuple[float, Optional[float]]:
+    """Return ``(loss, accuracy)`` of ``mlp`` on ``(x, y)``.
+
+    Accuracy is ``None`` when the model has a single output column. An empty
+    ``x`` raises :class:`ValueError`.
+    """
+
+    n = x.shape[0]
+    if n == 0:
+        raise ValueError("No hay ejemplos que evaluar")
+    loss_fn, _ = _resolve_loss(mlp, loss)
+    total_loss = 0.0
+    correct = 0.0
+    has_accuracy = True
+    for start in range(0, n, batch_size):
+        xb = np.asarray(x[start : start + batch_size])
+        yb = np.asarray(y[start : start + batch_size])
+        pred = mlp.predict(xb)
+        batch_loss, _ = loss_fn(pred, yb)
+        total_loss += batch_loss * xb.shape[0]
+        acc = _accuracy(pred, yb)
+        if acc is None:
+            has_accuracy = False
+        else:
+            correct += acc * xb.shape[0]
+    return total_loss / n, (correct / n if has_accuracy else None)
+
+
+def train_mlp(
+    mlp: MLP,
+    x: np.ndarray,
+    y: np.ndarray,
+    *,
+    epochs: int = 5,
+    batch_size: int = 128,
+    optimizer: Union[str, Optimizer] = "adam",
+    loss: str = "softmax_cross_entropy",
+    validation_split: float = 0.0,
+    validation_data: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    shuffle: bool = True,
+    seed: Optional[int] = None,
+    verbose: int = 0,
+) -> Dict[str, list]:
+    """Train ``mlp`` in place with vectorized mini-batch gradient descent.
+
+    Parameters
+    ----------
+    mlp:
+        Model to train. Its layers are updated in place.
+    x, y:
+        Training inputs and targets. ``y`` may be one-hot encoded or a vector
+        of integer class ids.
+    loss:
+        ``"softmax_cross_entropy"`` or ``"mse"``. Cross-entropy works on
+        logits (``linear`` last layer) or, fused, on a ``softmax`` last layer.
+    validation_split:
+        Fraction of the *last* samples used for validation, mirroring
+        ``keras.Model.fit``. Ignored when ``validation_data`` is given.
+
+    Returns
+    -------
+    History dictionary with the same keys as ``TrainingResult.history``
+    (``loss``, ``accuracy`` and their ``val_`` counterparts when available).
+    """
+
+    if epochs < 1 or batch_size < 1:
+        raise ValueError("epochs y batch_size deben ser positivos")
+    if not 0 <= validation_split < 1:
+        raise ValueError("validation_split debe estar entre 0 y 1")
+
+    loss_fn, fused = _resolve_loss(mlp, loss)
+    opt = get_optimizer(optimizer)
+    rng = np.random.default_rng(seed)
+
+    if validation_data is None and validation_split > 0:
+        n_val = int(x.shape[0] * validation_split)
+        if n_val > 0:
+            validation_data = (x[-n_val:], y[-n_val:])
+            x, y = x[:-n_val], y[:-n_val]
+    n = x.shape[0]
+    if n == 0:
+        raise ValueError("No hay ejemplos de entrenamiento")
+
+    has_accuracy = mlp.layers[-1].out_features > 1
+    history: Dict[str, list] = {"loss": []}
+    if has_accuracy:
+        history["accuracy"] = []
+    if validation_data is not None:
+        history["val_loss"] = []
+        if has_accuracy:
+            history["val_accuracy"] = []
+
+    for epoch in range(epochs):
+        order = rng.permutation(n) if shuffle else np.arange(n)
+        epoch_loss = 0.0
+        epoch_correct = 0.0
+        for start in range(0, n, batch_size):
+            idx = order[start : start + batch_size]
+            xb = np.asarray(x[idx])
+            yb = np.asarray(y[idx])
+            pred = mlp.forward(xb, cache=True)
+            batch_loss, grad = loss_fn(pred, yb)
+            mlp.backward(grad, preactivation=fused)
+            opt.step(mlp.parameters())
+            epoch_loss += batch_loss * xb.shape[0]
+            acc = _accuracy(pred, yb)
+            if acc is not None:
+                epoch_correct += acc * xb.shape[0]
+
+        history["loss"].append(epoch_loss / n)
+        if has_accuracy:
+            history["accuracy"].append(epoch_correct / n)
+        if validation_data is not None:
+            val_loss, val_acc = evaluate_mlp(mlp, validation_data[0], validation_data[1], loss=loss)
+            history["val_loss"].append(val_loss)
+            if has_accuracy:
+                history["val_accuracy"].append(val_acc)
+
+        if verbose:
+            metrics = " - ".join(f"{k}: {v[-1]:.4f}" for k, v in history.items())
+            print(f"Época {epoch + 1}/{epochs} - {metrics}")
+
+    return history
@@ -0,0 +1,242 @@
+"""Inference-time optimization of compiled architectures.
+
+:func:`compile_model` maps every token to one layer. For inference this pass
+rewrites the layer list into an :class:`InferencePlan` of fused
+``act(X @ W + b)`` steps:
+
+- ``Dropout`` is the identity at inference and is removed.
+- A ``Dense(..., linear)`` layer followed by another ``Dense`` layer is folded
+  into a single matrix (``W = W1 @ W2``, ``b = b1 @ W2 + b2``) whenever the
+  folded matmul needs fewer FLOPs than the two separate ones. Chains of
+  linear layers fold step by step.
+- Bias and activation are applied as one epilogue on the matmul output: the
+  NumPy runtime (:meth:`InferencePlan.to_mlp`) adds the bias and runs the
+  activation in place on the GEMM buffer, and the Keras runtime
+  (:meth:`InferencePlan.to_keras`) emits ``Dense`` layers with the
+  activation inside, which TensorFlow's graph optimizer fuses into one
+  MatMul+BiasAdd+activation kernel.
+
+FLOPs follow :mod:`mlp_compiler.cost`. Folding is exact in real arithmetic;
+in floating point the folded model agrees with the original up to rounding.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .compiler import ArchitectureError, ParsedLayer, normalize_architecture, resolve_layers
+from .cost import dense_flops
+from .numpy_mlp import Layer, MLP
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from tensorflow import keras
+
+
+@dataclass
+class PlanStep:
+    """One fused ``act(X @ W + b)`` step replacing the original layers ``sources``."""
+
+    in_features: int
+    out_features: int
+    activation_name: str
+    sources: Tuple[int, ...]
+    W: Optional[np.ndarray] = field(default=None, repr=False)
+    b: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @property
+    def flops(self) -> int:
+        return dense_flops(self.in_features, self.out_features)
+
+
+@dataclass
+class OptimizationReport:
+    architecture: str
+    optimized_architecture: str
+    removed: List[int]
+    folded: List[Tuple[int, ...]]
+    flops_before: int
+    flops_after: int
+
+    @property
+    def flops_saved(self) -> int:
+        return self.flops_before - self.flops_after
+
+    @property
+    def saved_ratio(self) -> float:
+        return self.flops_saved / self.flops_before if self.flops_before else 0.0
+
+    def summary(self) -> str:
+        lines = [
+            f"Original:   {self.architecture}",
+            f"Optimizada: {self.optimized_architecture}",
+        ]
+        if self.removed:
+            lines.append("Capas eliminadas (no-op en inferencia): " + ", ".join(map(str, self.removed)))
+        for group in self.folded:
+            lines.append("Capas lineales plegadas en una: " + " + ".join(map(str, group)))
+        lines.append(
+            f"FLOPs por muestra: {self.flops_before:,} -> {self.flops_after:,} "
+            f"({self.flops_saved:,} menos, {self.saved_ratio:.1%})"
+        )
+        return "\n".join(lines)
+
+
+@dataclass
+class InferencePlan:
+    """Optimized sequence of fused steps plus the report of what changed.
+
+    Plans built from an architecture string alone carry no weights and can
+    only be inspected; plans from :func:`optimize_model` can be executed.
+    """
+
+    input_dim: int
+    steps: List[PlanStep]
+    report: OptimizationReport
+    _mlp: Optional[MLP] = field(default=None, init=False, repr=False)
+
+    @property
+    def has_weights(self) -> bool:
+        return all(step.W is not None for step in self.steps)
+
+    def _require_weights(self) -> None:
+        if not self.has_weights:
+            raise ArchitectureError("El plan no tiene pesos: usa optimize_model con un modelo entrenado")
+
+    def to_mlp(self) -> MLP:
+        """NumPy runtime: one :class:`Layer` per step (views of the plan's weights)."""
+
+        self._require_weights()
+        return MLP(Layer.from_weights(step.W, step.b, step.activation_name) for step in self.steps)
+
+    def to_keras(self) -> "keras.Sequential":
+        """Keras runtime: one ``Dense`` per step, with the plan's weights."""
+
+        from tensorflow import keras
+        from tensorflow.keras import layers
+
+        self._require_weights()
+        model = keras.Sequential(
+            [keras.Input(shape=(self.input_dim,))]
+            + [layers.Dense(step.out_features, activation=step.activation_name) for step in self.steps],
+            name="optimized_for_inference",
+        )
+        for layer, step in zip(model.layers, self.steps):
+            layer.set_weights([step.W, step.b])
+        return model
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self._mlp is None:
+            self._mlp = self.to_mlp()
+        return self._mlp.predict(X)
+
+
+def _describe(input_dim: int, resolved: Sequence[ParsedLayer]) -> str:
+    tokens = [f"Input({input_dim})"]
+    for layer in resolved:
+        if layer.name == "dense":
+            tokens.append(f"Dense({layer.args[0]}, {layer.args[1] or 'linear'})")
+        else:
+            tokens.append(f"Dropout({layer.args[0]})")
+    return normalize_architecture(" -> ".join(tokens))
+
+
+def _fold(first: PlanStep, second: PlanStep) -> PlanStep:
+    W = b = None
+    if first.W is not None and second.W is not None:
+        dtype = np.result_type(first.W, second.W)
+        # Folded in float64 so that float32/float16 weights lose no extra precision.
+        W2 = second.W.astype(np.float64)
+        W = (first.W.astype(np.float64) @ W2).astype(dtype)
+        b = (first.b.astype(np.float64) @ W2 + second.b).astype(dtype)
+    return PlanStep(
+        first.in_features, second.out_features, second.activation_name, first.sources + second.sources, W, b
+    )
+
+
+def _optimize(
+    input_dim: int, resolved: Sequence[ParsedLayer], weights: Optional[Sequence[Tuple[np.ndarray, np.ndarray]]]
+) -> InferencePlan:
+    steps: List[PlanStep] = []
+    removed: List[int] = []
+    flops_before = 0
+    dense_index = 0
+    width = input_dim
+    for index, layer in enumerate(resolved):
+        if layer.name != "dense":
+            removed.append(index)
+            continue
+        units, activation = layer.args
+        W, b = weights[dense_index] if weights is not None else (None, None)
+        dense_index += 1
+        step = PlanStep(width, units, activation or "linear", (index,), W, b)
+        flops_before += step.flops
+        width = units
+
+        previous = steps[-1] if steps else None
+        if (
+            previous is not None
+            and previous.activation_name == "linear"
+            and dense_flops(previous.in_features, units) < previous.flops + step.flops
+        ):
+            steps[-1] = _fold(previous, step)
+            continue
+        steps.append(step)
+    if not steps:
+        raise ArchitectureError("La arquitectura no contiene capas Dense")
+
+    optimized = [ParsedLayer("dense", [step.out_features, step.activation_name]) for step in steps]
+    report = OptimizationReport(
+        architecture=_describe(input_dim, resolved),
+        optimized_architecture=_describe(input_dim, optimized),
+        removed=removed,
+        folded=[step.sources for step in steps if len(step.sources) > 1],
+        flops_before=flops_before,
+        flops_after=sum(step.flops for step in steps),
+    )
+    return InferencePlan(input_dim, steps, report)
+
+
+def optimize_architecture(architecture_string: str, input_dim: Optional[int] = None) -> InferencePlan:
+    """Plan the optimization of an architecture string (no weights, report only).
+
+    Layer indices in the report count the computational layers of the
+    string, ``Input`` nodes excluded.
+    """
+
+    first_input, resolved = resolve_layers(architecture_string, input_dim)
+    if first_input is None:
+        raise ArchitectureError("La optimización requiere 'input_dim' o un nodo Input(dim).")
+    return _optimize(first_input, resolved, None)
+
+
+def optimize_model(model: Any) -> InferencePlan:
+    """Optimize a trained NumPy :class:`MLP` or a Keras ``Sequential`` from ``compile_model``.
+
+    The source model is left untouched; folded steps get new weight arrays
+    and unchanged steps share the original ones.
+    """
+
+    resolved: List[ParsedLayer] = []
+    weights: List[Tuple[np.ndarray, np.ndarray]] = []
+    if isinstance(model, MLP):
+        for layer in model.layers:
+            resolved.append(ParsedLayer("dense", [layer.out_features, layer.activation_name]))
+            weights.append((layer.W, layer.b))
+    else:
+        for layer in model.layers:
+            kind = type(layer).__name__
+            if kind == "Dropout":
+                resolved.append(ParsedLayer("dropout", [float(layer.rate)]))
+                continue
+            if kind != "Dense":
+                raise ArchitectureError(f"Tipo de capa no optimizable: {kind}")
+            params = layer.get_weights()
+            kernel = np.asarray(params[0])
+            bias = np.asarray(params[1]) if len(params) > 1 else np.zeros(kernel.shape[1], kernel.dtype)
+            resolved.append(ParsedLayer("dense", [kernel.shape[1], layer.get_config().get("activation") or "linear"]))
+            weights.append((kernel, bias))
+    if not weights:
+        raise ArchitectureError("El modelo no contiene capas Dense")
+    return _optimize(weights[0][0].shape[0], resolved, weights)
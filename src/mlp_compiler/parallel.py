@@ -0,0 +1,233 @@
+"""Multi-core sharded inference for :class:`~mlp_compiler.numpy_mlp.MLP`.
+
+Large batches are split into fixed-size row shards that are evaluated
+concurrently. Every shard goes through exactly the same code path as
+``MLP.predict`` and shard boundaries do not depend on the worker count, so the
+output is bit-identical for any number of workers (including ``workers=1``).
+Compared with one unsharded ``MLP.predict`` call the results agree up to
+floating-point rounding, because BLAS may order sums differently for different
+batch sizes.
+
+* ``mode="thread"`` uses a thread pool; NumPy releases the GIL inside matmul
+  and ufuncs, so shards run truly in parallel.
+* ``mode="process"`` uses a process pool. The weights are copied once into a
+  shared memory block that every worker maps, and each call passes inputs and
+  outputs through shared memory instead of pickling them.
+
+Sparse inputs (:class:`~mlp_compiler.sparse.CSRMatrix` or ``scipy.sparse``)
+are sharded by rows in thread mode; process mode only accepts dense arrays.
+
+When combining this with a multithreaded BLAS, limit the BLAS threads (e.g.
+``OMP_NUM_THREADS=1``) to avoid oversubscribing the cores.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .numpy_mlp import Layer, MLP, _assert_ndarray
+from .sparse import CSRMatrix, as_csr, is_sparse
+
+_MODES = {"thread", "process"}
+
+# (activation, in_features, out_features, dtype, W offset, b offset)
+LayerSpec = Tuple[str, int, int, str, int, int]
+
+_WORKER_STATE: Dict[str, object] = {}
+
+
+def _pack_weights(mlp: MLP) -> Tuple[shared_memory.SharedMemory, List[LayerSpec]]:
+    specs: List[LayerSpec] = []
+    offset = 0
+    for layer in mlp.layers:
+        w_offset = offset
+        offset += layer.W.nbytes
+        b_offset = offset
+        offset += layer.b.nbytes
+        specs.append(
+            (layer.activation_name, layer.in_features, layer.out_features, layer.W.dtype.str, w_offset, b_offset)
+        )
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for layer, (_, n_in, n_out, dtype, w_offset, b_offset) in zip(mlp.layers, specs):
+        np.ndarray((n_in, n_out), dtype=dtype, buffer=shm.buf, offset=w_offset)[...] = layer.W
+        np.ndarray((n_out,), dtype=dtype, buffer=shm.buf, offset=b_offset)[...] = layer.b
+    return shm, specs
+
+
+def _unpack_weights(shm: shared_memory.SharedMemory, specs: List[LayerSpec]) -> MLP:
+    layers = []
+    for activation, n_in, n_out, dtype, w_offset, b_offset in specs:
+        W = np.ndarray((n_in, n_out), dtype=dtype, buffer=shm.buf, offset=w_offset)
+        b = np.ndarray((n_out,), dtype=dtype, buffer=shm.buf, offset=b_offset)
+        layers.append(Layer.from_weights(W, b, activation))
+    return MLP(layers)
+
+
+# Workers attach to blocks owned by the parent. The pool workers share the
+# parent's resource tracker, so only the parent unlinks them (in ``close`` and
+# after every call).
+def _init_process_worker(weights_name: str, specs: List[LayerSpec]) -> None:
+    shm = shared_memory.SharedMemory(name=weights_name)
+    _WORKER_STATE["weights"] = shm
+    _WORKER_STATE["mlp"] = _unpack_weights(shm, specs)
+
+
+def _process_shard(
+    x_name: str,
+    x_shape: Tuple[int, ...],
+    x_dtype: str,
+    out_name: str,
+    out_shape: Tuple[int, ...],
+    out_dtype: str,
+    start: int,
+    stop: int,
+) -> None:
+    mlp: MLP = _WORKER_STATE["mlp"]  # type: ignore[assignment]
+    x_shm = shared_memory.SharedMemory(name=x_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        X = np.ndarray(x_shape, dtype=x_dtype, buffer=x_shm.buf)
+        out = np.ndarray(out_shape, dtype=out_dtype, buffer=out_shm.buf)
+        out[start:stop] = mlp.predict(X[start:stop])
+        del X, out
+    finally:
+        x_shm.close()
+        out_shm.close()
+
+
+def _rows(X, start: int, stop: int):
+    return X.rows(start, stop) if isinstance(X, CSRMatrix) else X[start:stop]
+
+
+class ParallelPredictor:
+    """Shard ``MLP.predict`` across a pool of threads or processes.
+
+    Parameters
+    ----------
+    mlp:
+        Model to evaluate.
+    workers:
+        Number of workers; defaults to ``os.cpu_count()``.
+    mode:
+        ``"thread"`` (default) or ``"process"``.
+    shard_rows:
+        Rows per shard. Batches of at most ``shard_rows`` rows run serially,
+        because dispatch overhead dominates for tiny shards.
+    """
+
+    def __init__(
+        self,
+        mlp: MLP,
+        *,
+        workers: Optional[int] = None,
+        mode: str = "thread",
+        shard_rows: int = 1024,
+    ):
+        if mode not in _MODES:
+            raise ValueError(f"Modo desconocido: {mode}. Usa 'thread' o 'process'")
+        workers = workers if workers is not None else (os.cpu_count() or 1)
+        if workers <= 0:
+            raise ValueError("workers debe ser positivo")
+        if shard_rows <= 0:
+            raise ValueError("shard_rows debe ser positivo")
+
+        self.mlp = mlp
+        self.workers = workers
+        self.mode = mode
+        self.shard_rows = shard_rows
+        self._weights: Optional[shared_memory.SharedMemory] = None
+        self._executor: Executor
+        if mode == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mlp-shard")
+        else:
+            self._weights, specs = _pack_weights(mlp)
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_process_worker,
+                initargs=(self._weights.name, specs),
+            )
+
+    def _bounds(self, n: int) -> List[Tuple[int, int]]:
+        return [(start, min(start + self.shard_rows, n)) for start in range(0, n, self.shard_rows)]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if is_sparse(X):
+            if self.mode == "process":
+                raise TypeError("El modo 'process' no admite entradas dispersas; usa mode='thread'")
+            X = as_csr(X)
+        else:
+            _assert_ndarray(X, "X")
+        bounds = self._bounds(X.shape[0])
+        if len(bounds) <= 1:
+            return self.mlp.predict(X)
+        if self.mode == "thread":
+            return self._predict_threads(X, bounds)
+        return self._predict_processes(X, bounds)
+
+    def _output_template(self, X: np.ndarray) -> np.ndarray:
+        return self.mlp.predict(_rows(X, 0, 1))
+
+    def _predict_threads(self, X: np.ndarray, bounds: List[Tuple[int, int]]) -> np.ndarray:
+        template = self._output_template(X)
+        out = np.empty((X.shape[0],) + template.shape[1:], dtype=template.dtype)
+
+        def run(start: int, stop: int) -> None:
+            out[start:stop] = self.mlp.predict(_rows(X, start, stop))
+
+        futures = [self._executor.submit(run, start, stop) for start, stop in bounds]
+        for future in futures:
+            future.result()
+        return out
+
+    def _predict_processes(self, X: np.ndarray, bounds: List[Tuple[int, int]]) -> np.ndarray:
+        X = np.ascontiguousarray(X)
+        template = self._output_template(X)
+        out_shape = (X.shape[0],) + template.shape[1:]
+        out_dtype = template.dtype
+
+        x_shm = shared_memory.SharedMemory(create=True, size=max(X.nbytes, 1))
+        out_shm = shared_memory.SharedMemory(
+            create=True, size=max(int(np.prod(out_shape)) * out_dtype.itemsize, 1)
+        )
+        try:
+            np.ndarray(X.shape, dtype=X.dtype, buffer=x_shm.buf)[...] = X
+            futures = [
+                self._executor.submit(
+                    _process_shard,
+                    x_shm.name,
+                    X.shape,
+                    X.dtype.str,
+                    out_shm.name,
+                    out_shape,
+                    out_dtype.str,
+                    start,
+                    stop,
+                )
+                for start, stop in bounds
+            ]
+            for future in futures:
+                future.result()
+            return np.ndarray(out_shape, dtype=out_dtype, buffer=out_shm.buf).copy()
+        finally:
+            x_shm.close()
+            x_shm.unlink()
+            out_shm.close()
+            out_shm.unlink()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._weights is not None:
+            self._weights.close()
+            self._weights.unlink()
+            self._weights = None
+
+    def __enter__(self) -> "ParallelPredictor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
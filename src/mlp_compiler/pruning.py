@@ -0,0 +1,190 @@
+"""Magnitude pruning and sparse weight storage for NumPy MLPs.
+
+:func:`prune_mlp` zeroes the smallest-magnitude weights, either with one
+threshold across the whole network (``scope="global"``, which prunes the
+largest, most redundant layers hardest) or layer by layer
+(``scope="layer"``). Biases are never pruned.
+
+Each pruned layer stores ``W.T`` as a :class:`~mlp_compiler.sparse.CSRMatrix`
+when that takes fewer bytes than the dense matrix (below about 2/3 density
+for float64, 1/2 for float32), and keeps it dense otherwise. The sparse
+forward computes ``(W.T @ X.T).T`` with
+:func:`~mlp_compiler.sparse.sparse_dense_matmul`, which picks its kernel from
+the measured density. It only beats the BLAS matmul at high sparsity (roughly
+95 % and above); below that the gain is memory.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .activations import ACTIVATIONS
+from .numpy_mlp import Layer, MLP, compute_dtype
+from .quantization import quantization_report
+from .sparse import CSRMatrix, sparse_dense_matmul
+
+SCOPES = ("global", "layer")
+
+
+@dataclass
+class PrunedLayer:
+    """Dense layer whose weights are kept sparse (``Wt``) or dense (``W``) after pruning."""
+
+    in_features: int
+    out_features: int
+    b: np.ndarray = field(repr=False)
+    activation_name: str = "relu"
+    W: Optional[np.ndarray] = field(default=None, repr=False)
+    Wt: Optional[CSRMatrix] = field(default=None, repr=False)
+
+    @classmethod
+    def from_weights(cls, W: np.ndarray, b: np.ndarray, activation_name: str = "relu") -> "PrunedLayer":
+        """Pick the smaller of CSR (of ``W.T``) and dense storage for ``W``."""
+
+        nnz = int(np.count_nonzero(W))
+        # Every stored value also needs an int32 column index.
+        if nnz * (W.dtype.itemsize + 4) + (W.shape[1] + 1) * 8 < W.nbytes:
+            return cls(W.shape[0], W.shape[1], b, activation_name, Wt=CSRMatrix.from_dense(W.T))
+        return cls(W.shape[0], W.shape[1], b, activation_name, W=W)
+
+    @property
+    def is_sparse(self) -> bool:
+        return self.Wt is not None
+
+    @property
+    def nnz(self) -> int:
+        return self.Wt.nnz if self.Wt is not None else int(np.count_nonzero(self.W))
+
+    @property
+    def sparsity(self) -> float:
+        return 1.0 - self.nnz / (self.in_features * self.out_features)
+
+    @property
+    def nbytes(self) -> int:
+        weights = self.Wt.nbytes if self.Wt is not None else self.W.nbytes
+        return weights + self.b.nbytes
+
+    def dense(self) -> Layer:
+        W = self.Wt.toarray().T.copy() if self.Wt is not None else self.W.copy()
+        return Layer.from_weights(W, self.b.copy(), self.activation_name)
+
+    def forward(self, X: np.ndarray) -> np.ndarray:
+        dtype = compute_dtype(self.b.dtype)
+        X = X.astype(dtype, copy=False)
+        if self.Wt is None:
+            Z = X @ self.W.astype(dtype, copy=False)
+        else:
+            # (out, in) sparse @ (in, n) dense, transposed back to rows.
+            Z = np.ascontiguousarray(sparse_dense_matmul(self.Wt, X.T).T)
+        Z += self.b
+        return ACTIVATIONS[self.activation_name](Z, out=Z)
+
+
+class PrunedMLP:
+    """Inference-only MLP made of :class:`PrunedLayer` objects."""
+
+    def __init__(self, layers: Sequence[PrunedLayer]):
+        self.layers: List[PrunedLayer] = list(layers)
+        if not self.layers:
+            raise ValueError("Se requiere al menos una capa")
+
+    @property
+    def nbytes(self) -> int:
+        return sum(layer.nbytes for layer in self.layers)
+
+    @property
+    def sparsity(self) -> float:
+        total = sum(layer.in_features * layer.out_features for layer in self.layers)
+        return 1.0 - sum(layer.nnz for layer in self.layers) / total
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        out = X
+        for layer in self.layers:
+            out = layer.forward(out)
+        return out
+
+    def to_mlp(self) -> MLP:
+        """Dense :class:`MLP` with the pruned (zero) weights, e.g. to fine-tune it."""
+
+        return MLP(layer.dense() for layer in self.layers)
+
+
+def magnitude_masks(mlp: MLP, sparsity: float, *, scope: str = "global") -> List[np.ndarray]:
+    """Boolean masks of the weights kept when pruning ``mlp`` to ``sparsity``."""
+
+    if not 0 <= sparsity < 1:
+        raise ValueError("sparsity debe estar entre 0 y 1")
+    if scope not in SCOPES:
+        raise ValueError(f"Alcance desconocido: {scope} (usa {', '.join(SCOPES)})")
+    magnitudes = [np.abs(layer.W) for layer in mlp.layers]
+    if scope == "global":
+        everything = np.concatenate([m.ravel() for m in magnitudes])
+        k = int(sparsity * everything.size)
+        threshold = np.partition(everything, k - 1)[k - 1] if k else -np.inf
+        return [m > threshold for m in magnitudes]
+    masks = []
+    for m in magnitudes:
+        k = int(sparsity * m.size)
+        threshold = np.partition(m.ravel(), k - 1)[k - 1] if k else -np.inf
+        masks.append(m > threshold)
+    return masks
+
+
+def prune_mlp(mlp: MLP, sparsity: float, *, scope: str = "global") -> PrunedMLP:
+    """Zero the ``sparsity`` fraction of smallest-magnitude weights of ``mlp``.
+
+    ``mlp`` is left untouched. Ties at the threshold are pruned too, so the
+    achieved sparsity can be slightly higher than requested.
+    """
+
+    masks = magnitude_masks(mlp, sparsity, scope=scope)
+    return PrunedMLP(
+        PrunedLayer.from_weights(np.where(mask, layer.W, 0).astype(layer.W.dtype), layer.b.copy(), layer.activation_name)
+        for layer, mask in zip(mlp.layers, masks)
+    )
+
+
+def _latency(model: Any, x: np.ndarray, calls: int) -> float:
+    model.predict(x)
+    start = time.perf_counter()
+    for _ in range(calls):
+        model.predict(x)
+    return (time.perf_counter() - start) / calls
+
+
+def pruning_report(
+    reference: MLP,
+    sparsities: Sequence[float],
+    x: np.ndarray,
+    y: Optional[np.ndarray] = None,
+    *,
+    scope: str = "global",
+    batch_size: int = 256,
+    calls: int = 20,
+) -> List[Dict[str, Any]]:
+    """Prune ``reference`` to every level in ``sparsities`` and compare on ``x``.
+
+    Rows are those of :func:`~mlp_compiler.quantization.quantization_report`
+    (size, agreement with the reference, accuracy when ``y`` is given), one
+    per entry of ``sparsities`` in order, with ``model`` set to
+    ``"reference"`` or ``"pruned"``, plus the requested ``target`` sparsity
+    (``None`` for the reference), the achieved ``sparsity``, the number of
+    layers stored sparse and the mean ``latency`` in seconds of one
+    ``predict`` over ``batch_size`` rows.
+    """
+
+    targets = [float(sparsity) for sparsity in sparsities]
+    pruned = [prune_mlp(reference, sparsity, scope=scope) for sparsity in targets]
+    # Positional names: formatted sparsities can collide (0.955 and 0.96 are both "96%").
+    rows = quantization_report(reference, {str(i): model for i, model in enumerate(pruned)}, x, y)
+    batch = x[:batch_size]
+    for row, model, target in zip(rows, [reference, *pruned], [None, *targets]):
+        row["model"] = "reference" if model is reference else "pruned"
+        row["target"] = target
+        row["sparsity"] = model.sparsity if isinstance(model, PrunedMLP) else 0.0
+        row["sparse_layers"] = sum(layer.is_sparse for layer in model.layers) if isinstance(model, PrunedMLP) else 0
+        row["latency"] = _latency(model, batch, calls)
+    return rows
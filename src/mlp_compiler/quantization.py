@@ -0,0 +1,190 @@
+"""Post-training int8 weight quantization for NumPy MLPs.
+
+Weights are stored as int8 with one float32 scale per output channel
+(column of ``W``); biases stay in float32. NumPy has no int8 GEMM, so the
+first ``forward`` of a layer dequantizes ``Wq * scale`` to float32 once and
+keeps that copy for every later call: latency is that of a float32 model,
+and a live layer holds the float32 matrix on top of the int8 one. The gain
+is the 8x smaller (vs float64) model on disk and before its first use, not
+integer arithmetic or a smaller working set.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .activations import ACTIVATIONS
+from .numpy_mlp import Layer, MLP
+
+_QMAX = 127
+DEFAULT_CLIP_RATIOS = (1.0, 0.99, 0.98, 0.95, 0.9, 0.85, 0.8, 0.7)
+
+
+def _quantize_columns(W: np.ndarray, ratios: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    max_abs = np.abs(W).max(axis=0) * ratios
+    scale = np.where(max_abs > 0, max_abs / _QMAX, 1.0).astype(np.float32)
+    Wq = np.clip(np.rint(W / scale), -_QMAX, _QMAX).astype(np.int8)
+    return Wq, scale
+
+
+@dataclass
+class QuantizedLayer:
+    """Dense layer with int8 weights and per-output-channel float32 scales."""
+
+    Wq: np.ndarray = field(repr=False)
+    scale: np.ndarray = field(repr=False)
+    b: np.ndarray = field(repr=False)
+    activation_name: str = "relu"
+
+    def __post_init__(self) -> None:
+        # (Wq, scale, dequantized float32 W), rebuilt if Wq or scale is reassigned.
+        self._dequantized: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    @property
+    def in_features(self) -> int:
+        return self.Wq.shape[0]
+
+    @property
+    def out_features(self) -> int:
+        return self.Wq.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Stored size, without the float32 copy made by :meth:`forward`."""
+
+        return self.Wq.nbytes + self.scale.nbytes + self.b.nbytes
+
+    @classmethod
+    def from_layer(
+        cls,
+        layer: Layer,
+        calibration: Optional[np.ndarray] = None,
+        *,
+        clip_ratios: Sequence[float] = DEFAULT_CLIP_RATIOS,
+    ) -> "QuantizedLayer":
+        """Quantize ``layer``.
+
+        Without ``calibration`` each column is scaled by its maximum absolute
+        value. With a calibration batch (this layer's inputs), every column
+        picks the clipping ratio from ``clip_ratios`` that minimises the
+        squared error of its pre-activation on that batch; clipping a few
+        outlier weights usually buys resolution for all the others.
+        """
+
+        W = np.asarray(layer.W, dtype=np.float32)
+        b = np.asarray(layer.b, dtype=np.float32)
+        if calibration is None:
+            Wq, scale = _quantize_columns(W, np.ones(W.shape[1], dtype=np.float32))
+            return cls(Wq, scale, b, layer.activation_name)
+
+        X = np.asarray(calibration, dtype=np.float32)
+        best_err = np.full(W.shape[1], np.inf)
+        best_ratio = np.ones(W.shape[1], dtype=np.float32)
+        for ratio in clip_ratios:
+            ratios = np.full(W.shape[1], ratio, dtype=np.float32)
+            Wq, scale = _quantize_columns(W, ratios)
+            err = np.square(X @ (W - Wq * scale)).sum(axis=0)
+            better = err < best_err
+            best_err[better] = err[better]
+            best_ratio[better] = ratio
+        Wq, scale = _quantize_columns(W, best_ratio)
+        return cls(Wq, scale, b, layer.activation_name)
+
+    def dequantize(self) -> Layer:
+        return Layer.from_weights(self.Wq * self.scale, self.b.copy(), self.activation_name)
+
+    def _weights(self) -> np.ndarray:
+        cached = self._dequantized
+        if cached is None or cached[0] is not self.Wq or cached[1] is not self.scale:
+            cached = (self.Wq, self.scale, self.Wq * self.scale)
+            self._dequantized = cached
+        return cached[2]
+
+    def forward(self, X: np.ndarray) -> np.ndarray:
+        Z = X.astype(np.float32, copy=False) @ self._weights()
+        Z += self.b
+        return ACTIVATIONS[self.activation_name](Z, out=Z)
+
+
+class QuantizedMLP:
+    """Inference-only MLP made of :class:`QuantizedLayer` objects."""
+
+    def __init__(self, layers: Sequence[QuantizedLayer]):
+        self.layers: List[QuantizedLayer] = list(layers)
+        if not self.layers:
+            raise ValueError("Se requiere al menos una capa")
+
+    @property
+    def nbytes(self) -> int:
+        return sum(layer.nbytes for layer in self.layers)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        out = X
+        for layer in self.layers:
+            out = layer.forward(out)
+        return out
+
+    def dequantize(self) -> MLP:
+        return MLP(layer.dequantize() for layer in self.layers)
+
+
+def quantize_mlp(
+    mlp: MLP,
+    calibration: Optional[np.ndarray] = None,
+    *,
+    clip_ratios: Sequence[float] = DEFAULT_CLIP_RATIOS,
+) -> QuantizedMLP:
+    """Quantize every layer of ``mlp`` to int8.
+
+    ``calibration`` is a representative input batch (a few hundred rows is
+    enough). It is propagated through the float network so that each layer is
+    calibrated on its own real inputs.
+    """
+
+    layers: List[QuantizedLayer] = []
+    current = calibration
+    for layer in mlp.layers:
+        layers.append(QuantizedLayer.from_layer(layer, current, clip_ratios=clip_ratios))
+        if current is not None:
+            current = layer.forward(current)
+    return QuantizedMLP(layers)
+
+
+def quantization_report(
+    reference: Any,
+    candidates: Dict[str, Any],
+    x: np.ndarray,
+    y: Optional[np.ndarray] = None,
+) -> List[Dict[str, Any]]:
+    """Compare reduced-precision models against a float reference on ``x``.
+
+    Each row holds the model size and its ratio to the reference, the
+    fraction of samples whose predicted class matches the reference, the
+    largest absolute output difference and, when labels ``y`` (integers or
+    one-hot) are given, the accuracy. The reference is the first row.
+    """
+
+    labels = None
+    if y is not None:
+        y = np.asarray(y)
+        labels = y.argmax(axis=1) if y.ndim == 2 else y.astype(np.int64)
+
+    ref_out = reference.predict(x)
+    ref_cls = ref_out.argmax(axis=1)
+    rows: List[Dict[str, Any]] = []
+    for name, model in [("reference", reference), *candidates.items()]:
+        out = ref_out if model is reference else model.predict(x)
+        cls = out.argmax(axis=1)
+        rows.append(
+            {
+                "model": name,
+                "nbytes": int(model.nbytes),
+                "size_ratio": reference.nbytes / model.nbytes,
+                "agreement": float(np.mean(cls == ref_cls)),
+                "max_abs_diff": float(np.max(np.abs(out.astype(np.float64) - ref_out))),
+                "accuracy": float(np.mean(cls == labels)) if labels is not None else None,
+            }
+        )
+    return rows
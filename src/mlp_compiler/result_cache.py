@@ -0,0 +1,159 @@
+"""Content-addressed on-disk cache of training results with LRU eviction."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .compiler import normalize_architecture
+
+_META_FILE = "result.json"
+
+
+@dataclass
+class CachedResult:
+    metrics: Dict[str, Any]
+    history: Dict[str, list]
+    artifacts: Dict[str, bytes] = field(default_factory=dict)
+
+
+def default_result_cache_dir() -> Path:
+    """``$MLP_RESULT_CACHE_DIR`` or ``results/`` inside the dataset cache directory."""
+
+    env = os.environ.get("MLP_RESULT_CACHE_DIR")
+    if env:
+        return Path(env)
+    from .training import default_cache_dir
+
+    return default_cache_dir() / "results"
+
+
+def result_key(architecture: str, *, input_dim: Optional[int] = None, **params: Any) -> str:
+    """Hash of the normalized architecture plus every hyperparameter (and seed).
+
+    Equivalent spellings of the same architecture produce the same key. Only
+    seeded runs are reproducible, so callers must not cache runs with
+    ``seed=None`` (see :func:`is_cacheable`).
+    """
+
+    payload = {
+        "architecture": normalize_architecture(architecture, input_dim),
+        "input_dim": input_dim,
+        **params,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def is_cacheable(seed: Optional[int]) -> bool:
+    """True when a run with ``seed`` is deterministic enough to be served from the cache."""
+
+    return seed is not None
+
+
+class ResultCache:
+    """Store metrics, history and optional binary artifacts per result key.
+
+    The CLI stores its rendered history plot as an artifact; web entries
+    store the exported ``.mlpc`` model (the browser draws the curves from
+    the history), so cache hits can be served by ``/predict``.
+
+    Each entry is a directory named after its key. Reads refresh the entry's
+    modification time and writes evict the least recently used entries until
+    the cache fits in ``max_bytes``. Entries are written to a temporary
+    directory and renamed into place, so concurrent processes never observe
+    partial results; when two processes store the same key, the first entry
+    wins. Entries vanishing under a concurrent eviction are skipped.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = Path(directory) if directory is not None else default_result_cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / key
+
+    def get(self, key: str, *, load_artifacts: bool = True) -> Optional[CachedResult]:
+        """Return the entry for ``key``; without ``load_artifacts`` its ``artifacts`` stay empty."""
+
+        entry = self._entry(key)
+        meta_path = entry / _META_FILE
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            names = meta.get("artifacts", []) if load_artifacts else []
+            artifacts = {name: (entry / name).read_bytes() for name in names}
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None
+        return CachedResult(metrics=meta["metrics"], history=meta["history"], artifacts=artifacts)
+
+    def artifact_path(self, key: str, name: str) -> Optional[Path]:
+        """Path of artifact ``name`` of the entry for ``key``, if stored.
+
+        The file can disappear when the entry is evicted, so open it right away.
+        """
+
+        path = self._entry(key) / name
+        return path if (self._entry(key) / _META_FILE).is_file() and path.is_file() else None
+
+    def put(
+        self,
+        key: str,
+        metrics: Dict[str, Any],
+        history: Dict[str, list],
+        artifacts: Optional[Dict[str, bytes]] = None,
+    ) -> None:
+        artifacts = artifacts or {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.directory))
+        try:
+            for name, data in artifacts.items():
+                (tmp / name).write_bytes(data)
+            meta = {
+                "metrics": metrics,
+                "history": {k: [float(v) for v in values] for k, values in history.items()},
+                "artifacts": sorted(artifacts),
+            }
+            (tmp / _META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+            with self._lock:
+                entry = self._entry(key)
+                # Entries are immutable: one already in place (possibly written
+                # by another process a moment ago) holds the same result, so it
+                # is kept and this copy discarded.
+                if not entry.exists():
+                    try:
+                        os.replace(tmp, entry)
+                    except OSError:
+                        if not entry.exists():
+                            raise
+                self._evict()
+        finally:
+            if tmp.exists():
+                shutil.rmtree(tmp, ignore_errors=True)
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in self.directory.iterdir():
+            if entry.name.startswith("."):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+                mtime = (entry / _META_FILE).stat().st_mtime
+            except FileNotFoundError:
+                # Being evicted by another process, or never completed.
+                continue
+            entries.append((mtime, size, entry))
+            total += size
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
@@ -0,0 +1,176 @@
+"""Online inference helpers: dynamic micro-batching and a small model registry."""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from .numpy_mlp import MLP
+
+PredictFn = Callable[[np.ndarray], np.ndarray]
+
+_STOP = object()
+
+
+class BatcherClosedError(RuntimeError):
+    """Raised for requests submitted to (or still pending in) a closed :class:`MicroBatcher`."""
+
+
+def predict_fn_for(model: Any) -> PredictFn:
+    """Return a batched ``predict`` callable for a NumPy ``MLP`` or a Keras model.
+
+    Keras models use ``predict_on_batch``, which skips the per-call dataset
+    machinery of ``Model.predict``.
+    """
+
+    if isinstance(model, MLP):
+        return model.predict
+    if hasattr(model, "predict_on_batch"):
+        return lambda batch: np.asarray(model.predict_on_batch(batch))
+    if hasattr(model, "predict"):
+        return model.predict
+    raise TypeError(f"El modelo no tiene método predict: {type(model)}")
+
+
+class MicroBatcher:
+    """Group single-sample requests into batches for one ``predict`` call.
+
+    A background thread waits for the first pending request, then keeps
+    collecting until ``max_batch_size`` samples are queued or ``max_wait_ms``
+    have elapsed since that first request, runs the batch and resolves every
+    caller's future with its own row. ``max_wait_ms`` therefore bounds the
+    extra latency added to any request.
+    """
+
+    def __init__(self, predict_fn: PredictFn, *, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size debe ser positivo")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms no puede ser negativo")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._closed = False
+        # Orders submit() against close(): nothing is queued after _STOP.
+        self._lock = threading.Lock()
+        self._thread.start()
+
+    def submit(self, sample: np.ndarray) -> "Future[np.ndarray]":
+        """Queue one sample (a 1-D feature vector) and return a future for its output row.
+
+        Raises :class:`BatcherClosedError` once :meth:`close` has been called.
+        """
+
+        future: "Future[np.ndarray]" = Future()
+        with self._lock:
+            if self._closed:
+                raise BatcherClosedError("El micro-batcher está cerrado")
+            self._queue.put((np.asarray(sample), future))
+        return future
+
+    def predict(self, sample: np.ndarray, timeout: Optional[float] = None) -> np.ndarray:
+        return self.submit(sample).result(timeout)
+
+    def _collect(self, first: Tuple[np.ndarray, Future]) -> Tuple[List[Tuple[np.ndarray, Future]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _loop(self) -> None:
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stop = self._collect(first)
+            live = [(sample, future) for sample, future in batch if future.set_running_or_notify_cancel()]
+            if not live:
+                continue
+            futures = [future for _, future in live]
+            try:
+                outputs = self.predict_fn(np.stack([sample for sample, _ in live]))
+            except Exception as exc:  # noqa: BLE001 - forwarded to every caller
+                for future in futures:
+                    future.set_exception(exc)
+                continue
+            for future, row in zip(futures, outputs):
+                future.set_result(row)
+
+    def close(self) -> None:
+        """Stop accepting requests, answer the ones already queued and stop the thread.
+
+        Anything left in the queue once the thread has exited (e.g. because it
+        died) is failed with :class:`BatcherClosedError` instead of hanging.
+        """
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(BatcherClosedError("El micro-batcher está cerrado"))
+
+
+class ModelRegistry:
+    """Keep up to ``max_models`` named models, each behind its own :class:`MicroBatcher`.
+
+    The least recently used model is closed and dropped when the limit is
+    exceeded.
+    """
+
+    def __init__(self, max_models: int = 4, *, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.max_models = max_models
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._batchers: "OrderedDict[str, MicroBatcher]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, model: Any) -> MicroBatcher:
+        batcher = MicroBatcher(
+            predict_fn_for(model), max_batch_size=self.max_batch_size, max_wait_ms=self.max_wait_ms
+        )
+        evicted: List[MicroBatcher] = []
+        with self._lock:
+            previous = self._batchers.pop(name, None)
+            if previous is not None:
+                evicted.append(previous)
+            self._batchers[name] = batcher
+            while len(self._batchers) > self.max_models:
+                evicted.append(self._batchers.popitem(last=False)[1])
+        for old in evicted:
+            old.close()
+        return batcher
+
+    def get(self, name: str) -> Optional[MicroBatcher]:
+        with self._lock:
+            batcher = self._batchers.get(name)
+            if batcher is not None:
+                self._batchers.move_to_end(name)
+            return batcher
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._batchers)
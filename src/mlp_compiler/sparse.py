@@ -0,0 +1,230 @@
+"""Sparse (CSR) inputs for :meth:`MLP.predict`.
+
+MNIST-like inputs are mostly zeros. :class:`CSRMatrix` stores only the
+nonzero values of each row (``data``/``indices``/``indptr`` with the same
+meaning as ``scipy.sparse.csr_matrix``, which is accepted directly), so a
+batch takes roughly a third of the memory of its dense float64 array.
+
+Only the first layer sees the sparse input. :func:`sparse_dense_matmul` picks
+one of three kernels from the measured sparsity of the batch:
+
+- **dense**: the batch is densified and multiplied by ``W`` with BLAS.
+- **compact dense**: the columns that are zero in every row of the batch are
+  dropped, and BLAS multiplies the remaining ``(n, k)`` block by the matching
+  ``k`` rows of ``W`` (gathered on every call).
+- **sparse**: each nonzero scales one row of ``W`` (``nnz * out``
+  multiply-adds). It runs through ``scipy.sparse`` when installed, or a
+  per-row NumPy loop otherwise.
+
+:func:`choose_kernel` estimates the cost of each one in multiply-adds. BLAS is
+memory-bound for small batches, one nonzero in the sparse kernels costs
+several BLAS multiply-adds (``SPARSE_COST_FACTOR``) and every kernel pays a
+fixed setup cost per call (``KERNEL_OVERHEAD``). So the sparse kernel wins for
+single rows and very sparse batches, the compact product when many columns
+are empty in the whole batch, and the plain GEMM otherwise.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+# Relative cost of one nonzero in the sparse kernels versus one multiply-add
+# in a BLAS matmul, measured on MNIST-shaped batches: scipy.sparse for larger
+# batches, the row-by-row NumPy loop (which also pays per row) for small ones.
+SPARSE_COST_FACTOR = 8.0
+_LOOP_COST_FACTOR = 12.0
+_LOOP_ROW_OVERHEAD = 60_000
+# The row-by-row fallback kernel is only used for batches up to this size.
+_MAX_LOOP_ROWS = 32
+# A GEMM streams all of W at least once, which costs about as much as this
+# many rows of multiply-adds when the batch is small.
+_GEMM_MIN_ROWS = 6
+# Fixed cost of one call of each kernel (index bookkeeping, temporaries,
+# scipy wrappers), in BLAS multiply-adds.
+KERNEL_OVERHEAD = {"dense": 0, "compact": 400_000, "sparse": 100_000}
+
+class CSRMatrix:
+    """Minimal compressed sparse row matrix.
+
+    Row ``i`` holds ``data[indptr[i]:indptr[i + 1]]`` at columns
+    ``indices[indptr[i]:indptr[i + 1]]``. Column indices must be unique
+    within a row.
+    """
+
+    def __init__(self, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, shape: Tuple[int, int]):
+        self.data = np.asarray(data)
+        self.indices = np.asarray(indices)
+        self.indptr = np.asarray(indptr)
+        self.shape = (int(shape[0]), int(shape[1]))
+        if self.indptr.shape != (self.shape[0] + 1,):
+            raise ValueError(f"indptr debe tener {self.shape[0] + 1} elementos, tiene {self.indptr.size}")
+        if self.data.shape != self.indices.shape or self.data.ndim != 1:
+            raise ValueError("data e indices deben ser vectores de la misma longitud")
+        if self.indptr[-1] != self.data.size:
+            raise ValueError("indptr[-1] debe ser igual al número de valores almacenados")
+
+    @classmethod
+    def from_dense(cls, X: np.ndarray) -> "CSRMatrix":
+        X = np.asarray(X)
+        if X.ndim != 2:
+            raise ValueError("Se esperaba una matriz 2D")
+        rows, cols = np.nonzero(X)
+        indptr = np.zeros(X.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=X.shape[0]), out=indptr[1:])
+        return cls(X[rows, cols], cols.astype(np.int32), indptr, X.shape)
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.data.dtype
+
+    @property
+    def nnz(self) -> int:
+        return int(self.data.size)
+
+    @property
+    def density(self) -> float:
+        size = self.shape[0] * self.shape[1]
+        return self.nnz / size if size else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.indices.nbytes + self.indptr.nbytes
+
+    def row_ids(self) -> np.ndarray:
+        """Row index of every stored value."""
+
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def toarray(self, dtype: Any = None) -> np.ndarray:
+        out = np.zeros(self.shape, dtype=dtype or self.dtype)
+        out[self.row_ids(), self.indices] = self.data
+        return out
+
+    def rows(self, start: int, stop: int) -> "CSRMatrix":
+        """Rows ``start:stop`` as views of this matrix's arrays."""
+
+        start, stop, _ = slice(start, stop).indices(self.shape[0])
+        stop = max(start, stop)
+        lo, hi = self.indptr[start], self.indptr[stop]
+        indptr = self.indptr[start : stop + 1] - lo
+        return CSRMatrix(self.data[lo:hi], self.indices[lo:hi], indptr, (stop - start, self.shape[1]))
+
+    def __matmul__(self, W: np.ndarray) -> np.ndarray:
+        return sparse_dense_matmul(self, W)
+
+    def __repr__(self) -> str:
+        return f"CSRMatrix(shape={self.shape}, nnz={self.nnz}, dtype={self.dtype})"
+
+
+def is_sparse(X: Any) -> bool:
+    """True for :class:`CSRMatrix` and ``scipy.sparse`` matrices/arrays."""
+
+    return isinstance(X, CSRMatrix) or (hasattr(X, "tocsr") and hasattr(X, "nnz"))
+
+
+def as_csr(X: Any) -> CSRMatrix:
+    """Convert a ``scipy.sparse`` matrix or a dense array to :class:`CSRMatrix`.
+
+    SciPy CSR matrices are wrapped without copying their arrays, unless they
+    contain duplicate entries that must be summed first.
+    """
+
+    if isinstance(X, CSRMatrix):
+        return X
+    if hasattr(X, "tocsr"):
+        csr = X.tocsr()
+        if not csr.has_canonical_format:
+            csr = csr.copy()
+            csr.sum_duplicates()
+        return CSRMatrix(csr.data, csr.indices, csr.indptr, csr.shape)
+    return CSRMatrix.from_dense(X)
+
+
+def _sparse_kernel(X: CSRMatrix, W: np.ndarray) -> np.ndarray:
+    n, out_features = X.shape[0], W.shape[1]
+    data = X.data.astype(W.dtype, copy=False)
+    if n > _MAX_LOOP_ROWS:
+        try:
+            import scipy.sparse
+        except ImportError:
+            scipy = None  # type: ignore[assignment]
+        if scipy is not None:
+            matrix = scipy.sparse.csr_matrix((data, X.indices, X.indptr), shape=X.shape)
+            return np.asarray(matrix @ W)
+    out = np.empty((n, out_features), dtype=W.dtype)
+    indptr, indices = X.indptr, X.indices
+    for i in range(n):
+        lo, hi = indptr[i], indptr[i + 1]
+        # (nnz_i,) @ (nnz_i, out): only the rows of W for this row's nonzeros.
+        np.matmul(data[lo:hi], W[indices[lo:hi]], out=out[i])
+    return out
+
+
+def _compact_kernel(X: CSRMatrix, W: np.ndarray, active: np.ndarray) -> np.ndarray:
+    columns = np.flatnonzero(active)
+    if columns.size == X.shape[1]:
+        return X.toarray(W.dtype) @ W
+    position = np.cumsum(active) - 1
+    compact = np.zeros((X.shape[0], columns.size), dtype=W.dtype)
+    compact[X.row_ids(), position[X.indices]] = X.data
+    return compact @ W[columns]
+
+
+def choose_kernel(
+    X: CSRMatrix, out_features: int, *, cost_factor: float = SPARSE_COST_FACTOR
+) -> Tuple[str, np.ndarray]:
+    """Return ``("dense" | "compact" | "sparse", active_columns_mask)`` for ``X @ W``.
+
+    Costs are in BLAS multiply-adds for a ``W`` with ``out_features``
+    columns. A GEMM over ``c`` input columns costs
+    ``(n + _GEMM_MIN_ROWS) * c * out``: ``c`` is every column for the dense
+    kernel, and only the ``k`` columns used by at least one row for the
+    compact one, which also gathers ``k`` rows of ``W``. The sparse kernel
+    does ``nnz * out``, each ``cost_factor`` times as expensive through
+    ``scipy.sparse`` (the small-batch loop costs more per nonzero and per
+    row). Every kernel adds its ``KERNEL_OVERHEAD``.
+    """
+
+    active = np.bincount(X.indices, minlength=X.shape[1]) > 0
+    n, k = X.shape[0], int(active.sum())
+    if n <= _MAX_LOOP_ROWS:
+        sparse = X.nnz * out_features * _LOOP_COST_FACTOR + n * _LOOP_ROW_OVERHEAD
+    else:
+        sparse = X.nnz * out_features * cost_factor
+    costs = {
+        "dense": (n + _GEMM_MIN_ROWS) * X.shape[1] * out_features,
+        # Gathering the k rows of W costs about as much as streaming them.
+        "compact": (n + 2 * _GEMM_MIN_ROWS) * k * out_features,
+        "sparse": sparse,
+    }
+    for kernel, overhead in KERNEL_OVERHEAD.items():
+        costs[kernel] += overhead
+    return min(costs, key=costs.__getitem__), active
+
+
+def sparse_dense_matmul(
+    X: Any, W: np.ndarray, *, kernel: Optional[str] = None, cost_factor: float = SPARSE_COST_FACTOR
+) -> np.ndarray:
+    """Dense ``X @ W`` for a sparse ``X``, in ``W``'s dtype.
+
+    ``kernel`` forces ``"dense"``, ``"compact"`` or ``"sparse"``; by default it
+    is chosen per call by :func:`choose_kernel`.
+    """
+
+    X = as_csr(X)
+    if X.shape[1] != W.shape[0]:
+        raise ValueError(f"Dimensión de entrada esperada {W.shape[0]}, recibida {X.shape[1]}")
+    chosen, active = choose_kernel(X, W.shape[1], cost_factor=cost_factor)
+    kernel = kernel or chosen
+    if kernel == "dense":
+        return X.toarray(W.dtype) @ W
+    if kernel == "sparse":
+        return _sparse_kernel(X, W)
+    if kernel == "compact":
+        return _compact_kernel(X, W, active)
+    raise ValueError(f"Kernel desconocido: {kernel} (usa 'dense', 'compact' o 'sparse')")
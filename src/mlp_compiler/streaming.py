@@ -0,0 +1,156 @@
+"""Chunked (out-of-core) batch prediction over arrays, ``.npy`` files or iterables.
+
+Sparse sources (:class:`~mlp_compiler.sparse.CSRMatrix`, ``scipy.sparse`` or
+iterables of them) are sliced by rows and predicted without densifying.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from .numpy_mlp import MLP
+from .sparse import CSRMatrix, as_csr, is_sparse
+
+Source = Union[str, Path, np.ndarray, CSRMatrix, Iterable[np.ndarray]]
+
+
+def open_source(source: Source) -> Union[np.ndarray, Iterable[np.ndarray]]:
+    """Open ``.npy`` paths as read-only memory maps; return anything else untouched."""
+
+    if isinstance(source, (str, Path)):
+        return np.load(source, mmap_mode="r")
+    if is_sparse(source):
+        return as_csr(source)
+    return source
+
+
+def _source_length(source: Union[np.ndarray, CSRMatrix, Iterable[np.ndarray]]) -> Optional[int]:
+    if isinstance(source, (np.ndarray, CSRMatrix)):
+        return source.shape[0]
+    return None
+
+
+def _split(chunk, chunk_size: int) -> Iterator:
+    for start in range(0, chunk.shape[0], chunk_size):
+        if isinstance(chunk, CSRMatrix):
+            yield chunk.rows(start, start + chunk_size)
+        else:
+            yield chunk[start : start + chunk_size]
+
+
+def iter_chunks(source: Source, chunk_size: int = 4096) -> Iterator[np.ndarray]:
+    """Yield consecutive row blocks of at most ``chunk_size`` rows.
+
+    Arrays and memory maps are sliced without copying, so only the rows being
+    processed are paged in. Chunks coming from an iterable larger than
+    ``chunk_size`` are split.
+    """
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size debe ser positivo")
+    data = open_source(source)
+    if isinstance(data, (np.ndarray, CSRMatrix)):
+        yield from _split(data, chunk_size)
+        return
+    for chunk in data:
+        if is_sparse(chunk):
+            chunk = as_csr(chunk)
+        else:
+            chunk = np.asarray(chunk)
+            if chunk.ndim == 1:
+                chunk = chunk.reshape(1, -1)
+        yield from _split(chunk, chunk_size)
+
+
+def predict_batches(model, source: Source, *, chunk_size: int = 4096) -> Iterator[np.ndarray]:
+    """Yield ``model.predict`` for every chunk of ``source``.
+
+    ``model`` can be a :class:`~mlp_compiler.numpy_mlp.MLP` or any object with
+    a ``predict`` method (e.g. a Keras model). Peak memory is bounded by
+    ``chunk_size`` regardless of the dataset size.
+    """
+
+    for chunk in iter_chunks(source, chunk_size):
+        yield model.predict(chunk if isinstance(chunk, CSRMatrix) else np.asarray(chunk))
+
+
+def predict_stream(
+    model,
+    source: Source,
+    *,
+    chunk_size: int = 4096,
+    output: Optional[Union[str, Path]] = None,
+    n_rows: Optional[int] = None,
+) -> np.ndarray:
+    """Predict ``source`` chunk by chunk into one preallocated array.
+
+    Parameters
+    ----------
+    model:
+        :class:`~mlp_compiler.numpy_mlp.MLP` or any object with ``predict``.
+    source:
+        Array, ``np.memmap``, sparse matrix, path to a ``.npy`` file or
+        iterable of chunks.
+    output:
+        Optional ``.npy`` path. Results are written into a memory-mapped file
+        as they are produced and that memory map is returned. Without it they
+        are written into an array in RAM.
+    n_rows:
+        Total number of rows of an iterable ``source``. Required with
+        ``output``; without it the in-memory result grows by doubling, which
+        can briefly hold twice the output while it is resized.
+
+    Each chunk (with an :class:`~mlp_compiler.numpy_mlp.MLP`, straight from
+    the inference workspace) lands in its slice of the result, so the peak
+    memory is the result plus one chunk.
+    """
+
+    data = open_source(source)
+    total = _source_length(data) if n_rows is None else n_rows
+    if total is None and output is not None:
+        raise ValueError("Se requiere 'n_rows' para escribir a disco desde un iterable")
+
+    workspace = model.plan_inference(chunk_size) if isinstance(model, MLP) else None
+    result: Optional[np.ndarray] = None
+    start = 0
+    for chunk in iter_chunks(data, chunk_size):
+        if not isinstance(chunk, CSRMatrix):
+            chunk = np.asarray(chunk)
+        stop = start + chunk.shape[0]
+        if total is not None and stop > total:
+            raise ValueError(f"La fuente tiene más de {total} filas")
+        if result is None:
+            first = workspace.predict(chunk) if workspace is not None else model.predict(chunk)
+            shape = (total if total is not None else max(stop, chunk_size),) + first.shape[1:]
+            if output is not None:
+                result = np.lib.format.open_memmap(output, mode="w+", dtype=first.dtype, shape=shape)
+            else:
+                result = np.empty(shape, dtype=first.dtype)
+            result[start:stop] = first
+        else:
+            if stop > result.shape[0]:
+                result = _grow(result, stop)
+            if workspace is not None:
+                workspace.predict(chunk, out=result[start:stop])
+            else:
+                result[start:stop] = model.predict(chunk)
+        start = stop
+
+    if result is None:
+        raise ValueError("La fuente no contiene datos")
+    if total is None:
+        # A mostly unused buffer is not worth keeping alive behind a view.
+        return result[:start].copy() if start < result.shape[0] // 2 else result[:start]
+    if start != total:
+        raise ValueError(f"Se esperaban {total} filas, recibidas {start}")
+    if output is not None:
+        result.flush()
+    return result
+
+
+def _grow(result: np.ndarray, rows: int) -> np.ndarray:
+    grown = np.empty((max(rows, 2 * result.shape[0]),) + result.shape[1:], dtype=result.dtype)
+    grown[: result.shape[0]] = result
+    return grown
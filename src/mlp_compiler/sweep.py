@@ -0,0 +1,287 @@
+"""Parallel architecture/hyperparameter sweeps over a shared in-memory MNIST.
+
+The parent process loads the dataset once and copies it into a single
+shared memory block. Every worker of a spawn-based process pool maps that
+block (no copies, no reloading), caps TensorFlow's thread pools so that
+``workers * threads`` does not exceed the cores, and trains one trial at a
+time with :func:`~mlp_compiler.training.build_and_train`.
+
+Results are appended to a leaderboard (CSV or JSON, by file suffix) that is
+rewritten atomically after every finished trial. Trials whose key is already
+in the leaderboard with status ``ok`` are skipped, so an interrupted sweep
+resumes where it stopped.
+"""
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .result_cache import result_key
+
+LEADERBOARD_FIELDS = (
+    "key",
+    "status",
+    "architecture",
+    "epochs",
+    "batch_size",
+    "validation_split",
+    "train_size",
+    "seed",
+    "test_accuracy",
+    "test_loss",
+    "val_accuracy",
+    "seconds",
+    "error",
+)
+
+# (name, shape, dtype, offset)
+ArraySpec = Tuple[str, Tuple[int, ...], str, int]
+
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+@dataclass
+class Trial:
+    architecture: str
+    epochs: int = 5
+    batch_size: int = 128
+    validation_split: float = 0.1
+    train_size: Optional[int] = None
+    seed: Optional[int] = None
+
+    def key(self, input_dim: int, test_size: Optional[int]) -> str:
+        params = {k: v for k, v in asdict(self).items() if k != "architecture"}
+        return result_key(self.architecture, input_dim=input_dim, test_size=test_size, **params)
+
+
+def expand_grid(architectures: Sequence[str], **grid: Sequence[Any]) -> List[Trial]:
+    """Cartesian product of ``architectures`` and every hyperparameter list in ``grid``."""
+
+    names = list(grid)
+    trials = []
+    for architecture in architectures:
+        for values in itertools.product(*(grid[name] for name in names)):
+            trials.append(Trial(architecture, **dict(zip(names, values))))
+    return trials
+
+
+def load_trials(path: Path, **defaults: Any) -> List[Trial]:
+    """Read trials from ``path``.
+
+    * ``.json``: either a list of trial objects or an object with an
+      ``architectures`` list plus hyperparameter lists (a grid).
+    * anything else: one architecture per line (``#`` starts a comment),
+      each combined with ``defaults``.
+
+    Values in ``defaults`` may be lists, in which case they are expanded as a
+    grid as well.
+    """
+
+    grid = {name: value if isinstance(value, (list, tuple)) else [value] for name, value in defaults.items()}
+    if path.suffix == ".json":
+        spec = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(spec, list):
+            return [Trial(**{**{k: v[0] for k, v in grid.items()}, **item}) for item in spec]
+        architectures = spec.pop("architectures")
+        for name, value in spec.items():
+            grid[name] = value if isinstance(value, list) else [value]
+        return expand_grid(architectures, **grid)
+
+    architectures = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            architectures.append(line)
+    return expand_grid(architectures, **grid)
+
+
+class Leaderboard:
+    """Sweep results sorted by test accuracy, persisted as CSV or JSON."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        # Kept sorted, best first.
+        self.rows: List[Dict[str, Any]] = self._load()
+        self.rows = self._sorted()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        if self.path.suffix == ".json":
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        with self.path.open(newline="", encoding="utf-8") as fh:
+            return list(csv.DictReader(fh))
+
+    def completed_keys(self) -> set:
+        return {row["key"] for row in self.rows if row.get("status") == "ok"}
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.rows = [existing for existing in self.rows if existing["key"] != row["key"]]
+        self.rows.append(row)
+        self.rows = self._sorted()
+        self.save()
+
+    def best(self) -> Optional[Dict[str, Any]]:
+        """The successful row with the highest test accuracy, if any."""
+
+        return next((row for row in self.rows if row.get("status") == "ok"), None)
+
+    def _sorted(self) -> List[Dict[str, Any]]:
+        def accuracy(row: Dict[str, Any]) -> float:
+            try:
+                return float(row.get("test_accuracy") or "-inf")
+            except ValueError:
+                return float("-inf")
+
+        return sorted(self.rows, key=accuracy, reverse=True)
+
+    def save(self) -> None:
+        rows = self.rows
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        if self.path.suffix == ".json":
+            tmp.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+        else:
+            with tmp.open("w", newline="", encoding="utf-8") as fh:
+                writer = csv.DictWriter(fh, fieldnames=LEADERBOARD_FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(rows)
+        os.replace(tmp, self.path)
+
+
+class SharedDataset:
+    """Copy dataset splits into one shared memory block owned by this process."""
+
+    def __init__(self, data: Tuple[Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]):
+        (x_train, y_train), (x_test, y_test) = data
+        arrays = {"x_train": x_train, "y_train": y_train, "x_test": x_test, "y_test": y_test}
+        self.specs: List[ArraySpec] = []
+        offset = 0
+        for name, array in arrays.items():
+            offset = (offset + 63) // 64 * 64
+            self.specs.append((name, tuple(array.shape), np.asarray(array).dtype.str, offset))
+            offset += np.asarray(array).nbytes
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (name, shape, dtype, start), array in zip(self.specs, arrays.values()):
+            np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=start)[...] = array
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+def attach_dataset(name: str, specs: List[ArraySpec]) -> Tuple[shared_memory.SharedMemory, Any]:
+    shm = shared_memory.SharedMemory(name=name)
+    arrays = {
+        array_name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        for array_name, shape, dtype, offset in specs
+    }
+    data = ((arrays["x_train"], arrays["y_train"]), (arrays["x_test"], arrays["y_test"]))
+    return shm, data
+
+
+def _init_worker(name: str, specs: List[ArraySpec], threads: int) -> None:
+    from .training import limit_tf_threads
+
+    limit_tf_threads(threads, 1)
+    _WORKER_STATE["shm"], _WORKER_STATE["data"] = attach_dataset(name, specs)
+
+
+def _run_trial(trial: Trial, key: str, input_dim: int, test_size: Optional[int]) -> Dict[str, Any]:
+    from .training import build_and_train
+
+    row: Dict[str, Any] = {"key": key, **asdict(trial)}
+    start = time.perf_counter()
+    try:
+        result = build_and_train(
+            trial.architecture,
+            input_dim=input_dim,
+            epochs=trial.epochs,
+            batch_size=trial.batch_size,
+            validation_split=trial.validation_split,
+            limit_train=trial.train_size,
+            limit_test=test_size,
+            verbose=0,
+            seed=trial.seed,
+            data=_WORKER_STATE["data"],
+        )
+    except Exception as exc:  # noqa: BLE001 - recorded in the leaderboard
+        row.update(status="failed", error=str(exc))
+    else:
+        val_accuracy = result.history.get("val_accuracy") or [None]
+        row.update(
+            status="ok",
+            test_accuracy=result.test_accuracy,
+            test_loss=result.test_loss,
+            val_accuracy=val_accuracy[-1],
+            error="",
+        )
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+
+def run_sweep(
+    trials: Iterable[Trial],
+    data: Tuple[Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]],
+    leaderboard: Leaderboard,
+    *,
+    input_dim: int = 784,
+    test_size: Optional[int] = None,
+    workers: int = 1,
+    threads_per_worker: Optional[int] = None,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Train every pending trial and record it in ``leaderboard``.
+
+    ``threads_per_worker`` defaults to ``cpu_count // workers`` (at least 1).
+    Returns the rows produced by this run (skipped trials are not included).
+    """
+
+    if workers <= 0:
+        raise ValueError("workers debe ser positivo")
+    threads = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    done = leaderboard.completed_keys()
+    pending = []
+    for trial in trials:
+        key = trial.key(input_dim, test_size)
+        if key not in done:
+            done.add(key)
+            pending.append((trial, key))
+    if not pending:
+        return []
+
+    shared = SharedDataset(data)
+    rows: List[Dict[str, Any]] = []
+    try:
+        # TensorFlow is not fork-safe, so workers are always spawned.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(shared.name, shared.specs, threads),
+        ) as pool:
+            futures = [pool.submit(_run_trial, trial, key, input_dim, test_size) for trial, key in pending]
+            for future in as_completed(futures):
+                row = future.result()
+                leaderboard.add(row)
+                rows.append(row)
+                if on_result is not None:
+                    on_result(row)
+    finally:
+        shared.close()
+    return rows
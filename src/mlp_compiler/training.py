@@ -1,29 +1,154 @@
 """Helper utilities for training models built from the textual compiler."""
 from __future__ import annotations
 
+import json
+import os
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence, Tuple, Union
 
 import numpy as np
-from tensorflow import keras
-from tensorflow.keras import utils
-from tensorflow.keras.datasets import mnist
 
 from .compiler import compile_model
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import tensorflow as tf
+    from tensorflow import keras
+
+# TensorFlow is only imported inside the functions that need it, so importing
+# this module (e.g. for ``TrainingResult``) does not pay its startup cost.
+
 
 @dataclass
 class TrainingResult:
-    model: keras.Model
+    """Outcome of :func:`build_and_train`.
+
+    ``history`` covers every completed epoch, including those restored from a
+    checkpoint. ``best_epoch`` (1-based) is only set when early stopping is
+    enabled; ``checkpoint_path`` is the last checkpoint written, if any.
+    """
+
+    model: "keras.Model"
     history: Dict[str, list]
     test_loss: float
     test_accuracy: float
+    epochs_completed: int = 0
+    initial_epoch: int = 0
+    stopped_early: bool = False
+    best_epoch: Optional[int] = None
+    checkpoint_path: Optional[str] = None
 
 
 DatasetSplit = Tuple[np.ndarray, np.ndarray]
 Dataset = Tuple[DatasetSplit, DatasetSplit]
 
 
+@dataclass
+class PipelineConfig:
+    """Options for the ``tf.data`` input pipeline used by :func:`build_and_train`.
+
+    ``cache`` may be ``False`` (default: batches are read from the source
+    arrays every epoch), ``True`` (the gathered float32 rows are kept in
+    memory) or a file path prefix (kept on disk). Caching only pays off when
+    reading the arrays is expensive, e.g. a memory map on slow storage.
+    ``shuffle_buffer=0`` disables shuffling. ``None`` for
+    ``prefetch``/``num_parallel_calls`` means ``tf.data.AUTOTUNE``.
+    """
+
+    cache: Union[bool, str] = False
+    shuffle_buffer: int = 10_000
+    prefetch: Optional[int] = None
+    num_parallel_calls: Optional[int] = None
+    seed: Optional[int] = None
+
+
+@dataclass
+class CheckpointConfig:
+    """Periodic ``tf.train.Checkpoint`` of the weights, optimizer state and epoch.
+
+    A checkpoint is written every ``every_epochs`` epochs and when training
+    ends. With ``resume=True`` the latest checkpoint in ``directory`` is
+    restored and training continues with the following epoch. With early
+    stopping, its patience counter, best value and (with
+    ``restore_best_weights``) best weights are checkpointed and restored too.
+    """
+
+    directory: Union[str, Path]
+    every_epochs: int = 1
+    max_to_keep: int = 3
+    resume: bool = True
+
+
+@dataclass
+class EarlyStoppingConfig:
+    """Stop once ``monitor`` has not improved by ``min_delta`` for ``patience`` epochs.
+
+    With ``restore_best_weights`` the returned model carries the weights of
+    the best epoch instead of the last one.
+    """
+
+    monitor: str = "val_loss"
+    patience: int = 3
+    min_delta: float = 0.0
+    restore_best_weights: bool = False
+
+
+def default_cache_dir() -> Path:
+    """Directory for the preprocessed dataset cache (``$MLP_COMPILER_CACHE_DIR``)."""
+
+    env = os.environ.get("MLP_COMPILER_CACHE_DIR")
+    return Path(env) if env else Path.home() / ".cache" / "mlp_compiler"
+
+
+def _preprocess(x: np.ndarray, *, normalize: bool, flatten: bool) -> np.ndarray:
+    if normalize:
+        x = x.astype("float32") / 255.0
+    if flatten:
+        x = x.reshape((x.shape[0], -1))
+    return x
+
+
+def _one_hot(y: np.ndarray, num_classes: int) -> np.ndarray:
+    # Same result as ``keras.utils.to_categorical`` without importing TensorFlow.
+    return np.eye(num_classes, dtype="float32")[y]
+
+
+def _save_atomic(path: Path, array: np.ndarray) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as fh:
+        np.save(fh, array)
+    os.replace(tmp, path)
+
+
+def _cached_mnist(cache_dir: Path, *, normalize: bool, flatten: bool) -> Dataset:
+    """Return the full preprocessed splits as read-only memory maps.
+
+    Inputs are cached per ``normalize``/``flatten`` combination; labels are
+    stored once as integer class ids. Missing files are built from the raw
+    dataset on first use.
+    """
+
+    key = f"{'norm' if normalize else 'raw'}_{'flat' if flatten else 'img'}"
+    paths = {
+        "x_train": cache_dir / f"mnist_x_train_{key}.npy",
+        "x_test": cache_dir / f"mnist_x_test_{key}.npy",
+        "y_train": cache_dir / "mnist_y_train.npy",
+        "y_test": cache_dir / "mnist_y_test.npy",
+    }
+    if not all(path.exists() for path in paths.values()):
+        from tensorflow.keras.datasets import mnist
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (x_train, y_train), (x_test, y_test) = mnist.load_data()
+        _save_atomic(paths["x_train"], _preprocess(x_train, normalize=normalize, flatten=flatten))
+        _save_atomic(paths["x_test"], _preprocess(x_test, normalize=normalize, flatten=flatten))
+        _save_atomic(paths["y_train"], y_train)
+        _save_atomic(paths["y_test"], y_test)
+
+    arrays = {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+    return (arrays["x_train"], arrays["y_train"]), (arrays["x_test"], arrays["y_test"])
+
+
 def load_mnist(
     *,
     normalize: bool = True,
@@ -31,8 +156,27 @@ def load_mnist(
     one_hot: bool = True,
     limit_train: Optional[int] = None,
     limit_test: Optional[int] = None,
+    cache: bool = True,
+    cache_dir: Optional[Path] = None,
 ) -> Dataset:
-    (x_train, y_train), (x_test, y_test) = mnist.load_data()
+    """Load MNIST, optionally normalized, flattened and one-hot encoded.
+
+    With ``cache=True`` (default) the preprocessed splits are stored as
+    ``.npy`` files under ``cache_dir`` (see :func:`default_cache_dir`) and
+    opened with ``mmap_mode="r"``: repeated loads take milliseconds, limits are
+    zero-copy slices and the pages are shared between processes. The returned
+    arrays are then read-only. Labels stay as integer class ids unless
+    ``one_hot`` is requested.
+    """
+
+    if cache:
+        (x_train, y_train), (x_test, y_test) = _cached_mnist(
+            cache_dir or default_cache_dir(), normalize=normalize, flatten=flatten
+        )
+    else:
+        from tensorflow.keras.datasets import mnist
+
+        (x_train, y_train), (x_test, y_test) = mnist.load_data()
 
     if limit_train is not None:
         x_train = x_train[:limit_train]
@@ -41,19 +185,310 @@ def load_mnist(
         x_test = x_test[:limit_test]
         y_test = y_test[:limit_test]
 
-    if normalize:
-        x_train = x_train.astype("float32") / 255.0
-        x_test = x_test.astype("float32") / 255.0
-    if flatten:
-        x_train = x_train.reshape((x_train.shape[0], -1))
-        x_test = x_test.reshape((x_test.shape[0], -1))
+    if not cache:
+        x_train = _preprocess(x_train, normalize=normalize, flatten=flatten)
+        x_test = _preprocess(x_test, normalize=normalize, flatten=flatten)
     if one_hot:
         num_classes = int(y_train.max() + 1)
-        y_train = utils.to_categorical(y_train, num_classes)
-        y_test = utils.to_categorical(y_test, num_classes)
+        y_train = _one_hot(y_train, num_classes)
+        y_test = _one_hot(y_test, num_classes)
     return (x_train, y_train), (x_test, y_test)
 
 
+def split_validation(x: np.ndarray, y: np.ndarray, validation_split: float) -> Dataset:
+    """Split off the *last* ``validation_split`` fraction, like ``keras.Model.fit``.
+
+    Slicing is zero-copy, so memory-mapped inputs stay on disk.
+    """
+
+    if not 0 <= validation_split < 1:
+        raise ValueError("validation_split debe estar entre 0 y 1")
+    n_val = int(x.shape[0] * validation_split)
+    if n_val == 0:
+        return (x, y), (x[:0], y[:0])
+    return (x[:-n_val], y[:-n_val]), (x[-n_val:], y[-n_val:])
+
+
+def make_dataset(
+    x: np.ndarray,
+    y: np.ndarray,
+    *,
+    batch_size: int,
+    config: PipelineConfig,
+    training: bool,
+) -> "tf.data.Dataset":
+    """Build a batched ``tf.data.Dataset`` that overlaps input work with compute.
+
+    The dataset iterates over row indices and a parallel ``map`` gathers each
+    batch from ``x``/``y`` (cast to float32/int32), so memory-mapped arrays
+    are read batch by batch instead of being embedded in the graph as a
+    second full copy. Shuffling permutes the indices every epoch (training
+    only). With ``config.cache`` the order is ``gather -> cache -> shuffle ->
+    batch``: the rows are read once and later epochs replay the cache.
+    """
+
+    import tensorflow as tf
+
+    autotune = tf.data.AUTOTUNE
+    parallel = config.num_parallel_calls or autotune
+    shuffle = training and config.shuffle_buffer > 0
+
+    def read(indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return np.asarray(x[indices], dtype=np.float32), np.asarray(y[indices], dtype=np.int32)
+
+    def gather(indices):
+        xb, yb = tf.numpy_function(read, [indices], (tf.float32, tf.int32), stateful=False)
+        xb.set_shape((None, *x.shape[1:]))
+        yb.set_shape((None, *y.shape[1:]))
+        return xb, yb
+
+    dataset = tf.data.Dataset.range(x.shape[0])
+    if config.cache:
+        dataset = dataset.batch(batch_size).map(gather, num_parallel_calls=parallel).unbatch()
+        dataset = dataset.cache(config.cache if isinstance(config.cache, str) else "")
+        if shuffle:
+            dataset = dataset.shuffle(config.shuffle_buffer, seed=config.seed, reshuffle_each_iteration=True)
+        dataset = dataset.batch(batch_size)
+    else:
+        if shuffle:
+            dataset = dataset.shuffle(config.shuffle_buffer, seed=config.seed, reshuffle_each_iteration=True)
+        dataset = dataset.batch(batch_size).map(gather, num_parallel_calls=parallel)
+    return dataset.prefetch(config.prefetch or autotune)
+
+
+def stop_training_callback(should_stop: Callable[[], bool]) -> "keras.callbacks.Callback":
+    """Keras callback that ends ``fit`` after the current batch once ``should_stop()`` is true."""
+
+    from tensorflow import keras
+
+    class _StopTraining(keras.callbacks.Callback):
+        def on_train_batch_end(self, batch, logs=None):
+            if should_stop():
+                self.model.stop_training = True
+
+    return _StopTraining()
+
+
+def progress_callback(
+    publish: Callable[[Dict[str, object]], None],
+    *,
+    min_batch_interval: float = 0.25,
+) -> "keras.callbacks.Callback":
+    """Keras callback that reports training progress as small JSON-able dicts.
+
+    Emits ``{"type": "batch", ...}`` events at most every
+    ``min_batch_interval`` seconds and one ``{"type": "epoch", ...}`` event at
+    the end of every epoch, each carrying the current Keras metrics.
+    """
+
+    import time
+
+    from tensorflow import keras
+
+    def _metrics(logs) -> Dict[str, float]:
+        return {name: float(value) for name, value in (logs or {}).items()}
+
+    class _Progress(keras.callbacks.Callback):
+        def on_train_begin(self, logs=None):
+            self._epoch = 0
+            self._last_batch = 0.0
+            publish({"type": "begin", "epochs": self.params.get("epochs"), "steps": self.params.get("steps")})
+
+        def on_epoch_begin(self, epoch, logs=None):
+            self._epoch = epoch
+
+        def on_train_batch_end(self, batch, logs=None):
+            now = time.monotonic()
+            if now - self._last_batch >= min_batch_interval:
+                self._last_batch = now
+                publish({"type": "batch", "epoch": self._epoch, "batch": batch, **_metrics(logs)})
+
+        def on_epoch_end(self, epoch, logs=None):
+            publish({"type": "epoch", "epoch": epoch, **_metrics(logs)})
+
+    return _Progress()
+
+
+class _Checkpointer:
+    """Owns the checkpoint manager and the merged history of a resumable run."""
+
+    def __init__(self, model: "keras.Model", config: CheckpointConfig):
+        import tensorflow as tf
+
+        if config.every_epochs <= 0:
+            raise ValueError("every_epochs debe ser positivo")
+        self.config = config
+        self.directory = Path(config.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._history_path = self.directory / "history.json"
+        self._stopper_path = self.directory / "early_stopping.json"
+        self._best_weights_path = self.directory / "best_weights.npz"
+        self.stopper: Optional["keras.callbacks.EarlyStopping"] = None
+        self._stopper_state: Optional[Dict[str, Any]] = None
+        self._epoch = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self._checkpoint = tf.train.Checkpoint(model=model, optimizer=model.optimizer, epoch=self._epoch)
+        self._manager = tf.train.CheckpointManager(
+            self._checkpoint, str(self.directory), max_to_keep=config.max_to_keep
+        )
+        self.history: Dict[str, list] = {}
+        self.initial_epoch = 0
+        if config.resume and self._manager.latest_checkpoint:
+            self._checkpoint.restore(self._manager.latest_checkpoint)
+            self.initial_epoch = int(self._epoch.numpy())
+            if self._history_path.exists():
+                saved = json.loads(self._history_path.read_text(encoding="utf-8"))
+                self.history = {name: values[: self.initial_epoch] for name, values in saved.items()}
+            if self._stopper_path.exists():
+                self._stopper_state = json.loads(self._stopper_path.read_text(encoding="utf-8"))
+        self.completed = self.saved = self.initial_epoch
+
+    @property
+    def latest(self) -> Optional[str]:
+        return self._manager.latest_checkpoint
+
+    def _write_json(self, path: Path, value: Any) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(value), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def save(self) -> None:
+        self._epoch.assign(self.completed)
+        self._manager.save(checkpoint_number=self.completed)
+        self._write_json(self._history_path, self.history)
+        self.saved = self.completed
+
+    def _save_stopper(self) -> None:
+        stopper = self.stopper
+        best_weights = getattr(stopper, "best_weights", None)
+        if best_weights is not None:
+            tmp = self._best_weights_path.with_name(f"{self._best_weights_path.name}.{os.getpid()}.tmp.npz")
+            np.savez(tmp, *best_weights)
+            os.replace(tmp, self._best_weights_path)
+        self._write_json(
+            self._stopper_path,
+            {
+                "epoch": self.saved,
+                "wait": int(stopper.wait),
+                "best": None if stopper.best is None else float(stopper.best),
+                "best_epoch": int(getattr(stopper, "best_epoch", 0)),
+                "best_weights": best_weights is not None,
+            },
+        )
+
+    def _restore_stopper(self) -> None:
+        state = self._stopper_state
+        # Only valid for the checkpoint it was written with.
+        if state is None or state.get("epoch") != self.initial_epoch:
+            return
+        stopper = self.stopper
+        stopper.wait = state["wait"]
+        if state["best"] is not None:
+            stopper.best = state["best"]
+        stopper.best_epoch = state["best_epoch"]
+        if state["best_weights"] and self._best_weights_path.exists():
+            with np.load(self._best_weights_path) as saved:
+                stopper.best_weights = [saved[f"arr_{i}"] for i in range(len(saved.files))]
+
+    def callback(self) -> "keras.callbacks.Callback":
+        from tensorflow import keras
+
+        owner = self
+
+        class _Checkpoint(keras.callbacks.Callback):
+            def on_epoch_end(self, epoch, logs=None):
+                for name, value in (logs or {}).items():
+                    owner.history.setdefault(name, []).append(float(value))
+                owner.completed = epoch + 1
+                if owner.completed % owner.config.every_epochs == 0:
+                    owner.save()
+
+            def on_train_end(self, logs=None):
+                if owner.completed > owner.saved:
+                    owner.save()
+                    if owner.stopper is not None:
+                        owner._save_stopper()
+
+        return _Checkpoint()
+
+    def stopper_callback(self, stopper: "keras.callbacks.EarlyStopping") -> "keras.callbacks.Callback":
+        """Persist and restore ``stopper``'s ``wait``/``best`` along with the checkpoint.
+
+        Goes after ``stopper`` in the callback list: its ``on_train_begin``
+        runs after the one that resets the stopper, and its ``on_epoch_end``
+        sees the state the stopper has just updated.
+        """
+
+        from tensorflow import keras
+
+        owner = self
+        self.stopper = stopper
+
+        class _StopperState(keras.callbacks.Callback):
+            def on_train_begin(self, logs=None):
+                owner._restore_stopper()
+
+            def on_epoch_end(self, epoch, logs=None):
+                if owner.saved == epoch + 1:
+                    owner._save_stopper()
+
+        return _StopperState()
+
+
+def _early_stopping(config: EarlyStoppingConfig) -> "keras.callbacks.EarlyStopping":
+    """``EarlyStopping`` that records in ``triggered`` whether it ended the run.
+
+    ``stopped_epoch`` cannot tell: it is also 0 when the stop happens at
+    epoch index 0, and other callbacks (cancellation) stop training too.
+    """
+
+    from tensorflow import keras
+
+    class _EarlyStopping(keras.callbacks.EarlyStopping):
+        def on_train_begin(self, logs=None):
+            super().on_train_begin(logs)
+            self.triggered = False
+
+        def on_epoch_end(self, epoch, logs=None):
+            already_stopping = bool(self.model.stop_training)
+            super().on_epoch_end(epoch, logs)
+            if self.model.stop_training and not already_stopping:
+                self.triggered = True
+
+    stopper = _EarlyStopping(
+        monitor=config.monitor,
+        patience=config.patience,
+        min_delta=config.min_delta,
+        restore_best_weights=config.restore_best_weights,
+    )
+    stopper.triggered = False
+    return stopper
+
+
+def _best_epoch(history: Dict[str, list], monitor: str) -> Optional[int]:
+    values = history.get(monitor)
+    if not values:
+        return None
+    # Same rule as Keras' "auto" mode: accuracy-like metrics are maximised.
+    pick = np.argmax if "acc" in monitor or monitor.startswith("fmeasure") else np.argmin
+    return int(pick(values)) + 1
+
+
+def limit_tf_threads(intra_op: int, inter_op: int = 1) -> None:
+    """Cap TensorFlow's thread pools; must run before TensorFlow executes any op.
+
+    The ``OMP_NUM_THREADS``/``TF_NUM_*`` variables are set as well so that the
+    limit also holds if TensorFlow has not been imported yet.
+    """
+
+    os.environ["OMP_NUM_THREADS"] = str(intra_op)
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(intra_op)
+    os.environ["TF_NUM_INTEROP_THREADS"] = str(inter_op)
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+
+
 def build_and_train(
     architecture: str,
     *,
@@ -64,27 +499,99 @@ def build_and_train(
     verbose: int = 1,
     limit_train: Optional[int] = None,
     limit_test: Optional[int] = None,
+    pipeline: Optional[PipelineConfig] = None,
+    callbacks: Optional[Sequence["keras.callbacks.Callback"]] = None,
+    seed: Optional[int] = None,
+    data: Optional[Dataset] = None,
+    checkpoint: Optional[CheckpointConfig] = None,
+    early_stopping: Optional[EarlyStoppingConfig] = None,
 ) -> TrainingResult:
-    (x_train, y_train), (x_test, y_test) = load_mnist(
-        limit_train=limit_train, limit_test=limit_test
-    )
+    """Compile ``architecture``, train it on MNIST and evaluate it on the test set.
+
+    When ``pipeline`` is given the data is fed through ``tf.data`` datasets
+    (see :func:`make_dataset`) with an explicit train/validation split instead
+    of passing NumPy arrays and ``validation_split`` to ``model.fit``.
+    ``seed`` seeds Python, NumPy and TensorFlow for reproducible runs.
+    ``data`` replaces :func:`load_mnist` with already loaded
+    ``((x_train, y_train), (x_test, y_test))`` splits (integer labels); the
+    limits are still applied to it.
+
+    ``checkpoint`` saves (and, by default, resumes from) weights and
+    optimizer state; ``early_stopping`` ends training when the monitored
+    validation metric stops improving.
+    """
+
+    if seed is not None:
+        from tensorflow import keras
+
+        keras.utils.set_random_seed(seed)
+
+    if data is None:
+        (x_train, y_train), (x_test, y_test) = load_mnist(
+            one_hot=False, limit_train=limit_train, limit_test=limit_test
+        )
+    else:
+        (x_train, y_train), (x_test, y_test) = data
+        x_train, y_train = x_train[:limit_train], y_train[:limit_train]
+        x_test, y_test = x_test[:limit_test], y_test[:limit_test]
 
     model = compile_model(architecture, input_dim=input_dim)
-    model.compile(optimizer="adam", loss="categorical_crossentropy", metrics=["accuracy"])
-
-    history = model.fit(
-        x_train,
-        y_train,
-        validation_split=validation_split,
-        epochs=epochs,
-        batch_size=batch_size,
-        verbose=verbose,
-    )
+    model.compile(optimizer="adam", loss="sparse_categorical_crossentropy", metrics=["accuracy"])
+
+    fit_callbacks = list(callbacks or [])
+    checkpointer = _Checkpointer(model, checkpoint) if checkpoint is not None else None
+    if checkpointer is not None:
+        # Before early stopping, so a restore of the best weights at the end of
+        # training does not overwrite the state a resumed run continues from.
+        fit_callbacks.append(checkpointer.callback())
+    stopper = None
+    if early_stopping is not None:
+        stopper = _early_stopping(early_stopping)
+        fit_callbacks.append(stopper)
+        if checkpointer is not None:
+            fit_callbacks.append(checkpointer.stopper_callback(stopper))
+    initial_epoch = checkpointer.initial_epoch if checkpointer is not None else 0
+
+    if pipeline is None:
+        history = model.fit(
+            x_train,
+            y_train,
+            validation_split=validation_split,
+            epochs=epochs,
+            batch_size=batch_size,
+            verbose=verbose,
+            callbacks=fit_callbacks,
+            initial_epoch=initial_epoch,
+        )
+        test_loss, test_accuracy = model.evaluate(x_test, y_test, verbose=0)
+    else:
+        (x_fit, y_fit), (x_val, y_val) = split_validation(x_train, y_train, validation_split)
+        train_ds = make_dataset(x_fit, y_fit, batch_size=batch_size, config=pipeline, training=True)
+        val_ds = None
+        if x_val.shape[0]:
+            val_ds = make_dataset(x_val, y_val, batch_size=batch_size, config=pipeline, training=False)
+        history = model.fit(
+            train_ds,
+            validation_data=val_ds,
+            epochs=epochs,
+            verbose=verbose,
+            callbacks=fit_callbacks,
+            initial_epoch=initial_epoch,
+        )
+        test_ds = make_dataset(
+            x_test, y_test, batch_size=batch_size, config=PipelineConfig(cache=False), training=False
+        )
+        test_loss, test_accuracy = model.evaluate(test_ds, verbose=0)
 
-    test_loss, test_accuracy = model.evaluate(x_test, y_test, verbose=0)
+    full_history = checkpointer.history if checkpointer is not None else history.history
     return TrainingResult(
         model=model,
-        history=history.history,
+        history=full_history,
         test_loss=float(test_loss),
         test_accuracy=float(test_accuracy),
+        epochs_completed=len(full_history.get("loss", [])),
+        initial_epoch=initial_epoch,
+        stopped_early=bool(stopper is not None and stopper.triggered),
+        best_epoch=_best_epoch(full_history, early_stopping.monitor) if early_stopping is not None else None,
+        checkpoint_path=checkpointer.latest if checkpointer is not None else None,
     )
@@ -0,0 +1,32 @@
+"""Shared fixtures; like the scripts, the tests import the package from ``src/``."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from mlp_compiler.numpy_mlp import Layer, MLP  # noqa: E402
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(0)
+
+
+def make_mlp(rng: np.random.Generator, sizes, activations, dtype=np.float64) -> MLP:
+    """MLP with random weights (nonzero biases) of the given layer widths."""
+
+    return MLP(
+        Layer.from_weights(
+            rng.normal(size=(n_in, n_out)).astype(dtype),
+            rng.normal(scale=0.1, size=n_out).astype(dtype),
+            activation,
+        )
+        for n_in, n_out, activation in zip(sizes[:-1], sizes[1:], activations)
+    )
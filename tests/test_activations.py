@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from mlp_compiler.activations import ACTIVATIONS, activation_backward
+from mlp_compiler.numpy_mlp import neuron_forward
+
+
+def test_neuron_forward_accepts_integer_input():
+    out = neuron_forward(np.array([1, 2]), np.array([1, 1]), 0, "sigmoid")
+    assert out == pytest.approx(1 / (1 + np.exp(-3.0)))
+
+
+@pytest.mark.parametrize("name", sorted(ACTIVATIONS))
+def test_integer_input_matches_float_input(name):
+    z = np.array([[1, -2, 3], [0, 4, -1]])
+    expected = ACTIVATIONS[name](z.astype(np.float64))
+    np.testing.assert_allclose(ACTIVATIONS[name](z), expected)
+
+
+@pytest.mark.parametrize("name", sorted(ACTIVATIONS))
+def test_in_place_matches_out_of_place(name):
+    z = np.random.default_rng(0).normal(scale=5, size=(4, 6))
+    expected = ACTIVATIONS[name](z.copy())
+    buffer = z.copy()
+    assert ACTIVATIONS[name](buffer, out=buffer) is buffer
+    np.testing.assert_allclose(buffer, expected)
+
+
+@pytest.mark.parametrize("name", ["sigmoid", "elu", "softplus", "swish", "softmax", "log_softmax"])
+def test_extreme_inputs_stay_finite(name):
+    z = np.array([[-1000.0, 0.0, 1000.0]])
+    assert np.all(np.isfinite(ACTIVATIONS[name](z)))
+
+
+@pytest.mark.parametrize("name", ["sigmoid", "tanh", "elu", "softplus", "swish", "softmax", "log_softmax"])
+def test_backward_matches_finite_differences(name):
+    rng = np.random.default_rng(1)
+    z = rng.normal(size=(3, 5))
+    grad_output = rng.normal(size=(3, 5))
+    analytic = activation_backward(name, grad_output, z, ACTIVATIONS[name](z.copy()))
+
+    eps = 1e-6
+    numerical = np.zeros_like(z)
+    for index in np.ndindex(z.shape):
+        plus, minus = z.copy(), z.copy()
+        plus[index] += eps
+        minus[index] -= eps
+        numerical[index] = (grad_output * (ACTIVATIONS[name](plus) - ACTIVATIONS[name](minus))).sum() / (2 * eps)
+    np.testing.assert_allclose(analytic, numerical, rtol=1e-5, atol=1e-8)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from mlp_compiler.ensemble import MLPEnsemble
+from mlp_compiler.export import export_mlp
+
+from .conftest import make_mlp
+
+SIZES = [6, 12, 4]
+ACTIVATIONS = ["relu", "softmax"]
+
+
+@pytest.fixture
+def models(rng):
+    return [make_mlp(rng, SIZES, ACTIVATIONS) for _ in range(3)]
+
+
+def test_mean_is_average_of_members(rng, models):
+    x = rng.normal(size=(30, 6))
+    ensemble = MLPEnsemble(models)
+    expected = np.mean([model.predict(x) for model in models], axis=0)
+    np.testing.assert_allclose(ensemble.predict(x), expected)
+    assert ensemble.predict_all(x).shape == (3, 30, 4)
+    assert len(ensemble) == 3
+
+
+def test_vote_takes_majority_class(rng, models):
+    x = rng.normal(size=(30, 6))
+    ensemble = MLPEnsemble(models)
+    labels = np.stack([model.predict(x).argmax(axis=1) for model in models])
+    votes = ensemble.predict(x, aggregate="vote")
+    mean = ensemble.predict(x)
+    for row in range(x.shape[0]):
+        counts = np.bincount(labels[:, row], minlength=4)
+        winners = np.flatnonzero(counts == counts.max())
+        assert votes[row] == winners[mean[row, winners].argmax()]
+
+
+def test_members_and_files_round_trip(tmp_path, rng, models):
+    x = rng.normal(size=(10, 6))
+    paths = [tmp_path / f"m{i}.mlpc" for i in range(len(models))]
+    for model, path in zip(models, paths):
+        export_mlp(model, path)
+    ensemble = MLPEnsemble.from_files(paths)
+    for model, member in zip(models, ensemble.members()):
+        np.testing.assert_allclose(member.predict(x), model.predict(x))
+
+
+def test_rejects_mismatched_models(rng, models):
+    with pytest.raises(ValueError):
+        MLPEnsemble([])
+    with pytest.raises(ValueError):
+        MLPEnsemble([models[0], make_mlp(rng, [6, 10, 4], ACTIVATIONS)])
+    with pytest.raises(ValueError):
+        MLPEnsemble(models).predict(np.zeros((2, 6)), aggregate="median")
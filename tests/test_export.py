@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from mlp_compiler.export import export_mlp, load_mlp, read_header
+
+from .conftest import make_mlp
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip_keeps_weights_and_predictions(tmp_path, rng, mmap):
+    mlp = make_mlp(rng, (6, 5, 4, 3), ("relu", "tanh", "softmax"))
+    path = export_mlp(mlp, tmp_path / "model.mlpc")
+
+    loaded = load_mlp(path, mmap=mmap)
+    assert [layer.activation_name for layer in loaded.layers] == ["relu", "tanh", "softmax"]
+    for original, restored in zip(mlp.layers, loaded.layers):
+        np.testing.assert_array_equal(original.W, restored.W)
+        np.testing.assert_array_equal(original.b, restored.b)
+    x = rng.normal(size=(10, 6))
+    np.testing.assert_array_equal(mlp.predict(x), loaded.predict(x))
+    assert loaded.architecture == read_header(path)["architecture"]
+
+
+def test_mmap_weights_are_read_only_views(tmp_path, rng):
+    path = export_mlp(make_mlp(rng, (4, 3), ("linear",)), tmp_path / "model.mlpc")
+    loaded = load_mlp(path)
+    assert not loaded.layers[0].W.flags.writeable
+
+
+def test_export_with_dtype(tmp_path, rng):
+    mlp = make_mlp(rng, (4, 3), ("sigmoid",))
+    loaded = load_mlp(export_mlp(mlp, tmp_path / "model.mlpc", dtype=np.float32))
+    assert loaded.layers[0].W.dtype == np.float32
+    x = rng.normal(size=(5, 4))
+    np.testing.assert_allclose(loaded.predict(x), mlp.predict(x), rtol=1e-5)
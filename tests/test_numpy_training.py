@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from mlp_compiler.numpy_training import evaluate_mlp, mse, softmax_cross_entropy, train_mlp
+
+from .conftest import make_mlp
+
+
+def _numerical_gradient(f, param: np.ndarray, eps: float = 1e-6) -> np.ndarray:
+    grad = np.zeros_like(param)
+    for index in np.ndindex(param.shape):
+        saved = param[index]
+        param[index] = saved + eps
+        plus = f()
+        param[index] = saved - eps
+        minus = f()
+        param[index] = saved
+        grad[index] = (plus - minus) / (2 * eps)
+    return grad
+
+
+@pytest.mark.parametrize(
+    "activations, loss_fn",
+    [
+        (("tanh", "sigmoid"), mse),
+        (("relu", "linear"), softmax_cross_entropy),
+        (("sigmoid", "tanh"), mse),
+    ],
+)
+def test_backward_matches_numerical_gradient(rng, activations, loss_fn):
+    mlp = make_mlp(rng, (5, 7, 3), activations)
+    x = rng.normal(size=(8, 5))
+    y = rng.integers(0, 3, size=8)
+
+    loss, grad = loss_fn(mlp.forward(x, cache=True), y)
+    mlp.backward(grad)
+    analytic = [(layer.dW.copy(), layer.db.copy()) for layer in mlp.layers]
+
+    def current_loss() -> float:
+        return loss_fn(mlp.predict(x), y)[0]
+
+    for layer, (dW, db) in zip(mlp.layers, analytic):
+        np.testing.assert_allclose(dW, _numerical_gradient(current_loss, layer.W), rtol=1e-4, atol=1e-7)
+        np.testing.assert_allclose(db, _numerical_gradient(current_loss, layer.b), rtol=1e-4, atol=1e-7)
+
+
+def test_fused_softmax_gradient_matches_numerical_gradient(rng):
+    mlp = make_mlp(rng, (4, 6, 3), ("tanh", "softmax"))
+    x = rng.normal(size=(6, 4))
+    y = rng.integers(0, 3, size=6)
+
+    probs = mlp.forward(x, cache=True)
+    targets = np.eye(3)[y]
+    mlp.backward((probs - targets) / x.shape[0], preactivation=True)
+    dW = mlp.layers[0].dW.copy()
+
+    def current_loss() -> float:
+        return float(-np.log(mlp.predict(x)[np.arange(6), y]).mean())
+
+    np.testing.assert_allclose(dW, _numerical_gradient(current_loss, mlp.layers[0].W), rtol=1e-4, atol=1e-7)
+
+
+def test_training_reduces_loss(rng):
+    mlp = make_mlp(rng, (2, 16, 2), ("tanh", "softmax"))
+    x = rng.normal(size=(200, 2))
+    y = (x[:, 0] * x[:, 1] > 0).astype(np.int64)
+
+    before, _ = evaluate_mlp(mlp, x, y)
+    train_mlp(mlp, x, y, epochs=30, batch_size=20, optimizer="adam", seed=0)
+    after, accuracy = evaluate_mlp(mlp, x, y)
+    assert after < before
+    assert accuracy > 0.8
+
+
+def test_evaluate_rejects_empty_input(rng):
+    mlp = make_mlp(rng, (3, 2), ("softmax",))
+    with pytest.raises(ValueError):
+        evaluate_mlp(mlp, np.empty((0, 3)), np.empty((0,), dtype=np.int64))
+
+
+def test_train_rejects_empty_input(rng):
+    mlp = make_mlp(rng, (3, 2), ("softmax",))
+    with pytest.raises(ValueError):
+        train_mlp(mlp, np.empty((0, 3)), np.empty((0,), dtype=np.int64))
+
+
+def test_train_rejects_empty_input_with_validation_data(rng):
+    mlp = make_mlp(rng, (3, 2), ("softmax",))
+    x = rng.normal(size=(4, 3))
+    y = np.array([0, 1, 0, 1])
+    with pytest.raises(ValueError):
+        train_mlp(mlp, x[:0], y[:0], validation_data=(x, y))
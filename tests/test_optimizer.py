@@ -0,0 +1,38 @@
+import numpy as np
+
+from mlp_compiler.optimizer import optimize_architecture, optimize_model
+
+from .conftest import make_mlp
+
+
+def test_folded_linear_layers_predict_the_same(rng):
+    # The linear 10 -> 64 -> 5 pair costs more than one 10 -> 5 layer.
+    mlp = make_mlp(rng, (10, 64, 5, 3), ("linear", "relu", "softmax"))
+    plan = optimize_model(mlp)
+
+    assert plan.report.folded == [(0, 1)]
+    assert len(plan.steps) == 2
+    assert plan.report.flops_after < plan.report.flops_before
+    x = rng.normal(size=(32, 10))
+    np.testing.assert_allclose(plan.predict(x), mlp.predict(x), rtol=1e-10, atol=1e-12)
+
+
+def test_bottleneck_is_not_folded(rng):
+    mlp = make_mlp(rng, (20, 4, 10), ("linear", "relu"))
+    plan = optimize_model(mlp)
+    assert plan.report.folded == []
+    assert len(plan.steps) == 2
+
+
+def test_fold_keeps_float32_weights(rng):
+    mlp = make_mlp(rng, (10, 64, 5), ("linear", "tanh"), dtype=np.float32)
+    plan = optimize_model(mlp)
+    assert plan.steps[0].W.dtype == np.float32
+    x = rng.normal(size=(16, 10)).astype(np.float32)
+    np.testing.assert_allclose(plan.predict(x), mlp.predict(x), rtol=1e-4, atol=1e-5)
+
+
+def test_architecture_plan_drops_dropout():
+    plan = optimize_architecture("Input(8) -> Dense(16, relu) -> Dropout(0.5) -> Dense(2, softmax)")
+    assert plan.report.removed == [1]
+    assert not plan.has_weights
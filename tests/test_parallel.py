@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from mlp_compiler.parallel import ParallelPredictor
+from mlp_compiler.sparse import CSRMatrix
+
+from .conftest import make_mlp
+
+
+@pytest.fixture
+def model(rng):
+    return make_mlp(rng, [8, 16, 4], ["tanh", "softmax"])
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_matches_serial_predict(rng, model, mode):
+    x = rng.normal(size=(101, 8))
+    with ParallelPredictor(model, workers=2, mode=mode, shard_rows=16) as predictor:
+        np.testing.assert_allclose(predictor.predict(x), model.predict(x))
+        # Batches of at most one shard run serially.
+        np.testing.assert_allclose(predictor.predict(x[:10]), model.predict(x[:10]))
+
+
+def test_thread_mode_accepts_sparse_input(rng, model):
+    x = rng.normal(size=(50, 8)) * (rng.random((50, 8)) < 0.3)
+    with ParallelPredictor(model, workers=2, shard_rows=16) as predictor:
+        np.testing.assert_allclose(predictor.predict(CSRMatrix.from_dense(x)), model.predict(x))
+
+
+def test_process_mode_rejects_sparse_input(rng, model):
+    x = CSRMatrix.from_dense(np.eye(40, 8))
+    with ParallelPredictor(model, workers=1, mode="process", shard_rows=16) as predictor:
+        with pytest.raises(TypeError):
+            predictor.predict(x)
+
+
+@pytest.mark.parametrize("kwargs", [{"mode": "fork"}, {"workers": 0}, {"shard_rows": 0}])
+def test_rejects_bad_arguments(model, kwargs):
+    with pytest.raises(ValueError):
+        ParallelPredictor(model, **kwargs)
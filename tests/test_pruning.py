@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from mlp_compiler.pruning import magnitude_masks, prune_mlp, pruning_report
+
+from .conftest import make_mlp
+
+
+@pytest.mark.parametrize("scope", ["global", "layer"])
+def test_masks_keep_the_largest_weights(rng, scope):
+    mlp = make_mlp(rng, (20, 30, 10), ("relu", "softmax"))
+    masks = magnitude_masks(mlp, 0.75, scope=scope)
+
+    for layer, mask in zip(mlp.layers, masks):
+        assert mask.shape == layer.W.shape
+        kept, dropped = np.abs(layer.W[mask]), np.abs(layer.W[~mask])
+        if scope == "layer":
+            assert kept.min() > dropped.max()
+            assert mask.mean() == pytest.approx(0.25, abs=1 / mask.size)
+    if scope == "global":
+        everything = np.concatenate([np.abs(layer.W[mask]) for layer, mask in zip(mlp.layers, masks)])
+        pruned = np.concatenate([np.abs(layer.W[~mask]) for layer, mask in zip(mlp.layers, masks)])
+        assert everything.min() > pruned.max()
+        total = sum(mask.size for mask in masks)
+        assert sum(mask.sum() for mask in masks) == total - int(0.75 * total)
+
+
+def test_zero_sparsity_keeps_everything(rng):
+    mlp = make_mlp(rng, (5, 4), ("linear",))
+    assert magnitude_masks(mlp, 0.0)[0].all()
+
+
+def test_invalid_arguments(rng):
+    mlp = make_mlp(rng, (5, 4), ("linear",))
+    with pytest.raises(ValueError):
+        magnitude_masks(mlp, 1.0)
+    with pytest.raises(ValueError):
+        magnitude_masks(mlp, 0.5, scope="neuron")
+
+
+def test_pruned_model_predicts_like_masked_dense_model(rng):
+    mlp = make_mlp(rng, (30, 20, 5), ("relu", "softmax"))
+    pruned = prune_mlp(mlp, 0.9)
+
+    assert pruned.sparsity >= 0.9
+    assert all(layer.is_sparse for layer in pruned.layers)
+    assert pruned.nbytes < mlp.nbytes
+    masked = pruned.to_mlp()
+    for layer, mask in zip(masked.layers, magnitude_masks(mlp, 0.9)):
+        np.testing.assert_array_equal(layer.W != 0, mask)
+    x = rng.normal(size=(12, 30))
+    np.testing.assert_allclose(pruned.predict(x), masked.predict(x), atol=1e-12)
+
+
+def test_prune_leaves_source_untouched(rng):
+    mlp = make_mlp(rng, (8, 6), ("tanh",))
+    before = mlp.layers[0].W.copy()
+    prune_mlp(mlp, 0.5, scope="layer")
+    np.testing.assert_array_equal(mlp.layers[0].W, before)
+
+
+def test_report_keeps_one_row_per_nearby_sparsity(rng):
+    mlp = make_mlp(rng, (30, 20, 5), ("relu", "softmax"))
+    rows = pruning_report(mlp, [0.955, 0.96], rng.normal(size=(16, 30)), calls=1)
+
+    assert [row["model"] for row in rows] == ["reference", "pruned", "pruned"]
+    assert [row["target"] for row in rows] == [None, 0.955, 0.96]
+    assert rows[1]["sparsity"] < rows[2]["sparsity"]
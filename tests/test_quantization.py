@@ -0,0 +1,63 @@
+import time
+import tracemalloc
+
+import numpy as np
+
+from mlp_compiler.numpy_mlp import Layer
+from mlp_compiler.quantization import QuantizedLayer, quantization_report, quantize_mlp
+
+from .conftest import make_mlp
+
+
+def test_weight_error_is_within_half_a_step(rng):
+    layer = Layer.from_weights(rng.normal(size=(64, 32)), rng.normal(size=32), "linear")
+    quantized = QuantizedLayer.from_layer(layer)
+
+    error = np.abs(quantized.Wq * quantized.scale - layer.W)
+    assert np.all(error <= quantized.scale / 2 + 1e-6)
+    # Per output column, |x @ error| <= sum(|x|) * scale / 2.
+    x = rng.normal(size=(10, 64))
+    bound = np.abs(x).sum(axis=1, keepdims=True) * quantized.scale / 2 + 1e-4
+    assert np.all(np.abs(quantized.forward(x) - layer.forward(x)) <= bound)
+
+
+def test_quantized_mlp_agrees_with_reference(rng):
+    mlp = make_mlp(rng, (20, 32, 5), ("relu", "softmax"))
+    x = rng.normal(size=(200, 20))
+    rows = quantization_report(mlp, {"int8": quantize_mlp(mlp, x[:50])}, x)
+
+    assert rows[1]["agreement"] > 0.95
+    assert rows[1]["max_abs_diff"] < 0.1
+    assert rows[1]["size_ratio"] > 6
+
+
+def test_forward_does_not_dequantize_on_every_call(rng):
+    layer = QuantizedLayer.from_layer(Layer.from_weights(rng.normal(size=(512, 512)), np.zeros(512), "relu"))
+    x = rng.normal(size=(4, 512)).astype(np.float32)
+    layer.forward(x)
+
+    tracemalloc.start()
+    try:
+        layer.forward(x)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < layer.Wq.nbytes
+
+
+def test_latency_matches_float32(rng):
+    W = rng.normal(size=(512, 512)).astype(np.float32)
+    reference = Layer.from_weights(W, np.zeros(512, dtype=np.float32), "relu")
+    quantized = QuantizedLayer.from_layer(reference)
+    x = rng.normal(size=(8, 512)).astype(np.float32)
+
+    def best_of(fn, repeats: int = 50) -> float:
+        fn(x)
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn(x)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    assert best_of(quantized.forward) < 1.5 * best_of(reference.forward) + 50e-6
@@ -0,0 +1,63 @@
+import os
+
+from mlp_compiler.result_cache import ResultCache, is_cacheable, result_key
+
+
+def test_key_normalizes_architecture_and_includes_parameters():
+    key = result_key("Input(4) -> Dense(3, relu)", epochs=1, seed=0)
+    assert key == result_key("Input(4)->Dense(3,relu)", epochs=1, seed=0)
+    assert key != result_key("Input(4) -> Dense(3, relu)", epochs=2, seed=0)
+    assert not is_cacheable(None) and is_cacheable(0)
+
+
+def test_put_then_get_round_trips(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put("k", {"test_accuracy": 0.9}, {"loss": [1.0, 0.5]}, {"plot.png": b"png"})
+
+    hit = cache.get("k")
+    assert hit.metrics == {"test_accuracy": 0.9}
+    assert hit.history == {"loss": [1.0, 0.5]}
+    assert hit.artifacts == {"plot.png": b"png"}
+    assert cache.get("missing") is None
+    assert [p.name for p in tmp_path.iterdir()] == ["k"]
+
+
+def test_existing_entry_wins(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put("k", {"run": 1}, {})
+    cache.put("k", {"run": 2}, {})
+    assert cache.get("k").metrics == {"run": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["k"]
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=2500)
+    blob = b"x" * 1000
+    for index, key in enumerate(["a", "b"]):
+        cache.put(key, {}, {}, {"blob": blob})
+        os.utime(tmp_path / key / "result.json", (index, index))
+    cache.get("a")  # refreshes "a", so "b" is now the oldest
+    cache.put("c", {}, {}, {"blob": blob})
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_eviction_skips_entries_removed_concurrently(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=0)
+    cache.put("a", {}, {})
+    # An entry directory without result.json, as seen mid-deletion by another process.
+    (tmp_path / "half-deleted").mkdir()
+    cache.put("b", {}, {})
+    assert not (tmp_path / "a").exists()
+
+
+def test_artifact_path_and_lazy_get(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put("k", {}, {}, {"model.mlpc": b"weights"})
+
+    assert cache.artifact_path("k", "model.mlpc").read_bytes() == b"weights"
+    assert cache.artifact_path("k", "other") is None
+    assert cache.artifact_path("missing", "model.mlpc") is None
+    assert cache.get("k", load_artifacts=False).artifacts == {}
@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pytest
+
+from mlp_compiler.serving import BatcherClosedError, MicroBatcher, ModelRegistry, predict_fn_for
+
+from .conftest import make_mlp
+
+
+@pytest.fixture
+def model(rng):
+    return make_mlp(rng, [5, 8, 3], ["relu", "softmax"])
+
+
+def test_results_match_model(rng, model):
+    x = rng.normal(size=(40, 5))
+    batcher = MicroBatcher(predict_fn_for(model), max_batch_size=8, max_wait_ms=20)
+    try:
+        futures = [batcher.submit(row) for row in x]
+        rows = np.stack([future.result(timeout=5) for future in futures])
+        np.testing.assert_allclose(rows, model.predict(x))
+        np.testing.assert_allclose(batcher.predict(x[0], timeout=5), model.predict(x[:1])[0])
+    finally:
+        batcher.close()
+
+
+def test_batches_are_bounded():
+    sizes = []
+    release = threading.Event()
+
+    def predict(batch):
+        release.wait(5)
+        sizes.append(batch.shape[0])
+        return batch
+
+    batcher = MicroBatcher(predict, max_batch_size=4, max_wait_ms=50)
+    futures = [batcher.submit(np.full(2, i)) for i in range(10)]
+    release.set()
+    for i, future in enumerate(futures):
+        np.testing.assert_array_equal(future.result(timeout=5), [i, i])
+    batcher.close()
+    assert sum(sizes) == 10
+    assert max(sizes) <= 4
+
+
+def test_close_answers_queued_requests_then_rejects(model):
+    batcher = MicroBatcher(predict_fn_for(model), max_wait_ms=50)
+    future = batcher.submit(np.zeros(5))
+    batcher.close()
+    assert future.result(timeout=0).shape == (3,)
+    with pytest.raises(BatcherClosedError):
+        batcher.submit(np.zeros(5))
+    batcher.close()  # idempotent
+
+
+def test_prediction_errors_reach_every_caller():
+    def predict(batch):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(predict, max_wait_ms=20)
+    futures = [batcher.submit(np.zeros(2)) for _ in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="boom"):
+            future.result(timeout=5)
+    batcher.close()
+
+
+def test_registry_evicts_least_recently_used(model):
+    registry = ModelRegistry(max_models=2, max_wait_ms=1)
+    first = registry.register("a", model)
+    registry.register("b", model)
+    assert registry.get("a") is first  # "b" becomes the oldest
+    registry.register("c", model)
+    assert registry.names() == ["a", "c"]
+    assert registry.get("b") is None
+
+    replaced = registry.register("a", model)
+    assert replaced is not first
+    with pytest.raises(BatcherClosedError):
+        first.submit(np.zeros(5))
+    assert replaced.predict(np.zeros(5), timeout=5).shape == (3,)
+    for name in registry.names():
+        registry.get(name).close()
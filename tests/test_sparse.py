@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from mlp_compiler.sparse import CSRMatrix, as_csr, choose_kernel, sparse_dense_matmul
+from mlp_compiler.streaming import predict_stream
+
+from .conftest import make_mlp
+
+
+def _sparse_batch(rng, rows: int, cols: int, density: float) -> np.ndarray:
+    X = rng.normal(size=(rows, cols))
+    X[rng.random((rows, cols)) >= density] = 0.0
+    return X
+
+
+def test_from_dense_round_trip(rng):
+    X = _sparse_batch(rng, 7, 11, 0.3)
+    X[2] = 0.0
+    csr = CSRMatrix.from_dense(X)
+    assert csr.nnz == np.count_nonzero(X)
+    np.testing.assert_array_equal(csr.toarray(), X)
+    np.testing.assert_array_equal(csr.rows(1, 4).toarray(), X[1:4])
+
+
+@pytest.mark.parametrize("kernel", ["dense", "compact", "sparse"])
+@pytest.mark.parametrize("rows", [1, 5, 64])
+def test_every_kernel_matches_dense_matmul(rng, kernel, rows):
+    X = _sparse_batch(rng, rows, 30, 0.1)
+    W = rng.normal(size=(30, 8))
+    np.testing.assert_allclose(sparse_dense_matmul(CSRMatrix.from_dense(X), W, kernel=kernel), X @ W, atol=1e-12)
+
+
+def test_choose_kernel_prefers_gemm_for_dense_batches(rng):
+    X = CSRMatrix.from_dense(rng.normal(size=(256, 100)))
+    assert choose_kernel(X, 64)[0] == "dense"
+
+
+def test_sparse_predict_equals_dense_predict(rng):
+    mlp = make_mlp(rng, (40, 16, 4), ("relu", "softmax"))
+    X = _sparse_batch(rng, 50, 40, 0.05)
+    expected = mlp.predict(X)
+
+    np.testing.assert_allclose(mlp.predict(CSRMatrix.from_dense(X)), expected, atol=1e-12)
+    workspace = mlp.plan_inference(16)
+    np.testing.assert_allclose(workspace.predict(CSRMatrix.from_dense(X)), expected, atol=1e-12)
+    np.testing.assert_allclose(predict_stream(mlp, CSRMatrix.from_dense(X), chunk_size=16), expected, atol=1e-12)
+
+
+def test_scipy_input_is_accepted(rng):
+    scipy_sparse = pytest.importorskip("scipy.sparse")
+    X = _sparse_batch(rng, 9, 12, 0.2)
+    csr = as_csr(scipy_sparse.csr_matrix(X))
+    np.testing.assert_array_equal(csr.toarray(), X)
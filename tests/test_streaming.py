@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from mlp_compiler.streaming import iter_chunks, predict_batches, predict_stream
+
+from .conftest import make_mlp
+
+
+@pytest.fixture
+def model(rng):
+    return make_mlp(rng, [6, 10, 3], ["relu", "softmax"])
+
+
+def test_predict_stream_matches_predict(rng, model):
+    x = rng.normal(size=(103, 6))
+    np.testing.assert_allclose(predict_stream(model, x, chunk_size=16), model.predict(x))
+
+
+def test_predict_batches_matches_predict(rng, model):
+    x = rng.normal(size=(50, 6))
+    chunks = list(predict_batches(model, x, chunk_size=16))
+    assert [chunk.shape[0] for chunk in chunks] == [16, 16, 16, 2]
+    np.testing.assert_allclose(np.concatenate(chunks), model.predict(x))
+
+
+@pytest.mark.parametrize("n_rows", [None, 70])
+def test_predict_stream_from_iterable(rng, model, n_rows):
+    x = rng.normal(size=(70, 6))
+    # Uneven chunks: larger than chunk_size, a single row and a 1-D sample.
+    pieces = [x[:25], x[25:26], x[26], x[27:]]
+    out = predict_stream(model, iter(pieces), chunk_size=8, n_rows=n_rows)
+    np.testing.assert_allclose(out, model.predict(x))
+
+
+def test_predict_stream_to_npy(tmp_path, rng, model):
+    x = rng.normal(size=(40, 6))
+    source = tmp_path / "x.npy"
+    np.save(source, x)
+    output = tmp_path / "y.npy"
+    predict_stream(model, source, chunk_size=16, output=output)
+    np.testing.assert_allclose(np.load(output), model.predict(x))
+
+
+def test_predict_stream_errors(rng, model):
+    x = rng.normal(size=(20, 6))
+    with pytest.raises(ValueError):
+        predict_stream(model, iter([]))
+    with pytest.raises(ValueError):
+        predict_stream(model, iter([x]), n_rows=10)
+    with pytest.raises(ValueError):
+        predict_stream(model, iter([x]), n_rows=30)
+    with pytest.raises(ValueError):
+        predict_stream(model, iter([x]), output="unused.npy")
+    with pytest.raises(ValueError):
+        list(iter_chunks(x, chunk_size=0))
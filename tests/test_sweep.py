@@ -0,0 +1,25 @@
+import pytest
+
+from mlp_compiler.sweep import Leaderboard
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".json"])
+def test_best_ignores_insertion_order(tmp_path, suffix):
+    path = tmp_path / f"leaderboard{suffix}"
+    board = Leaderboard(path)
+    board.add({"key": "a", "status": "ok", "architecture": "A", "test_accuracy": 0.5})
+    board.add({"key": "b", "status": "ok", "architecture": "B", "test_accuracy": 0.9})
+    board.add({"key": "c", "status": "error", "architecture": "C", "test_accuracy": None})
+
+    assert board.best()["architecture"] == "B"
+    assert [row["architecture"] for row in board.rows] == ["B", "A", "C"]
+    reloaded = Leaderboard(path)
+    assert reloaded.best()["architecture"] == "B"
+    assert reloaded.completed_keys() == {"a", "b"}
+
+
+def test_best_is_none_without_successful_rows(tmp_path):
+    board = Leaderboard(tmp_path / "leaderboard.csv")
+    assert board.best() is None
+    board.add({"key": "a", "status": "error", "architecture": "A"})
+    assert board.best() is None
@@ -1,28 +1,121 @@
 """Flask application to experiment with the MLP compiler through a web UI."""
 from __future__ import annotations
 
-import base64
-import io
+import json
+import os
+import re
+import shutil
 import sys
-from dataclasses import dataclass
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Set
 
-from flask import Flask, render_template, request
-import matplotlib
-
-matplotlib.use("Agg")
-
-import matplotlib.pyplot as plt
+import numpy as np
+from flask import Flask, Response, jsonify, render_template, request, stream_with_context
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_DIR = PROJECT_ROOT / "src"
 if SRC_DIR.exists():  # pragma: no branch - guard against missing path
     sys.path.insert(0, str(SRC_DIR))
 
-from mlp_compiler.training import TrainingResult, build_and_train
+from mlp_compiler.compiler import ArchitectureError, validate_architecture
+from mlp_compiler.cost import BUDGET_MODES, CostBudget, analyze_architecture, enforce_budget
+from mlp_compiler.export import export_keras, load_mlp
+from mlp_compiler.jobs import DONE, Job, JobCancelled, JobQueue, QueueFullError
+from mlp_compiler.result_cache import CachedResult, ResultCache, is_cacheable, result_key
+from mlp_compiler.serving import BatcherClosedError, ModelRegistry
+from mlp_compiler.training import (
+    CheckpointConfig,
+    Dataset,
+    EarlyStoppingConfig,
+    build_and_train,
+    default_cache_dir,
+    load_mnist,
+    progress_callback,
+    stop_training_callback,
+)
 
 app = Flask(__name__)
 
+# Trainings never run in the request thread: they are queued on a bounded pool.
+# MLP_WEB_MAX_JOBS controls how many run concurrently, MLP_WEB_MAX_PENDING how
+# many may wait in the queue. With several server processes MLP_WEB_JOBS_DIR must
+# point to a directory shared by all of them, so any process can answer for any job.
+jobs = JobQueue(
+    max_workers=int(os.environ.get("MLP_WEB_MAX_JOBS", "1")),
+    max_pending=int(os.environ.get("MLP_WEB_MAX_PENDING", "8")),
+    spool_dir=os.environ.get("MLP_WEB_JOBS_DIR") or None,
+)
+# Identical seeded submissions (same normalized architecture, hyperparameters
+# and seed) are answered from this cache without training again.
+results = ResultCache(max_bytes=int(os.environ.get("MLP_RESULT_CACHE_MAX_MB", "256")) * 1024 * 1024)
+# Trained models stay available for online inference through /predict, each
+# behind a micro-batcher that merges concurrent single-sample requests.
+models = ModelRegistry(
+    max_models=int(os.environ.get("MLP_WEB_MAX_MODELS", "4")),
+    max_batch_size=int(os.environ.get("MLP_PREDICT_MAX_BATCH", "64")),
+    max_wait_ms=float(os.environ.get("MLP_PREDICT_MAX_WAIT_MS", "5")),
+)
+# When MLP_WEB_MODELS_DIR is set, trained models are also exported there as
+# .mlpc files and /predict loads unknown names from it (memory-mapped), so every
+# server process can serve models trained by any other one.
+MODELS_DIR = Path(os.environ["MLP_WEB_MODELS_DIR"]) if os.environ.get("MLP_WEB_MODELS_DIR") else None
+_MODEL_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+# Cached results keep their model as this artifact; a cache-hit job names its
+# model after the result key and /predict loads it from the cache entry.
+_MODEL_ARTIFACT = "model.mlpc"
+_RESULT_KEY = re.compile(r"^[0-9a-f]{64}$")
+# Resumable trainings checkpoint every epoch under <dir>/<result key>; a
+# cancelled or interrupted job continues from there when resubmitted, and the
+# checkpoints are removed once the job finishes. Only one job per key may use
+# that directory at a time: a duplicate is rejected on submission when this
+# process runs the original, and fails on start when another process holds
+# the key's lock file.
+CHECKPOINT_DIR = Path(os.environ.get("MLP_WEB_CHECKPOINT_DIR") or default_cache_dir() / "checkpoints")
+_resumable_keys: Set[str] = set()
+_resumable_lock = threading.Lock()
+
+INPUT_DIM = 784
+TEST_SIZE = 1000
+
+# Architectures are costed statically before anything is queued. Submissions
+# over budget are rejected, or only logged with MLP_WEB_BUDGET_MODE=warn.
+# MLP_WEB_BUDGET_MAX_PARAMS / _MAX_FLOPS / _MAX_MEMORY_MB override the limits
+# (0 disables one).
+budget = CostBudget.from_env("MLP_WEB_BUDGET_", max_params=20_000_000, max_memory_mb=2048)
+BUDGET_MODE = os.environ.get("MLP_WEB_BUDGET_MODE", "reject")
+if BUDGET_MODE not in BUDGET_MODES:
+    raise RuntimeError(f"MLP_WEB_BUDGET_MODE debe ser uno de: {', '.join(BUDGET_MODES)}")
+
+# Full MNIST splits (memory-mapped, integer labels) reused by every training in
+# this process. preload() fills it in a preforking server's master, so workers
+# inherit the mappings and share the pages instead of loading their own copy.
+_dataset: Optional[Dataset] = None
+
+
+def preload() -> None:
+    """Import TensorFlow and load MNIST once, before the server forks its workers.
+
+    No TensorFlow op runs here: TensorFlow's runtime is not fork-safe, and the
+    thread pools are configured per worker after forking.
+    """
+
+    global _dataset
+    import tensorflow  # noqa: F401
+
+    _dataset = load_mnist(one_hot=False)
+
+
+def _training_data() -> Dataset:
+    global _dataset
+    if _dataset is None:
+        _dataset = load_mnist(one_hot=False)
+    return _dataset
+
+
 DEFAULT_ARCHITECTURE = "Dense(300, relu) -> Dropout(0.2) -> Dense(100, relu) -> Dense(10, softmax)"
 
 
@@ -33,17 +126,18 @@ class FormData:
     batch_size: int
     validation_split: float
     train_size: int | None
+    seed: int | None = 0
+    patience: int = 0
+    restore_best_weights: bool = False
+    resumable: bool = False
 
-
-@dataclass
-class TrainingView:
-    accuracy_plot: str
-    loss_plot: str
-    test_accuracy: float
-    test_loss: float
+    def early_stopping(self) -> EarlyStoppingConfig | None:
+        if self.patience <= 0:
+            return None
+        return EarlyStoppingConfig(patience=self.patience, restore_best_weights=self.restore_best_weights)
 
 
-def _get_form_data() -> FormData:
+def _get_form_data(form: Mapping[str, Any]) -> FormData:
     def _int(value: str, default: int) -> int:
         try:
             return int(value)
@@ -56,14 +150,19 @@ def _get_form_data() -> FormData:
         except (TypeError, ValueError):
             return default
 
-    architecture = request.form.get("architecture", DEFAULT_ARCHITECTURE)
-    epochs = _int(request.form.get("epochs"), 3)
-    batch_size = _int(request.form.get("batch_size"), 128)
-    validation_split = _float(request.form.get("validation_split"), 0.1)
-    train_size_raw = request.form.get("train_size")
+    def _bool(value: Any) -> bool:
+        return str(value).lower() in ("1", "true", "on", "yes")
+
+    architecture = form.get("architecture", DEFAULT_ARCHITECTURE)
+    epochs = _int(form.get("epochs"), 3)
+    batch_size = _int(form.get("batch_size"), 128)
+    validation_split = _float(form.get("validation_split"), 0.1)
+    train_size_raw = form.get("train_size")
     train_size = _int(train_size_raw, 5000) if train_size_raw else 5000
     if train_size <= 0:
         train_size = None
+    seed_raw = form.get("seed")
+    seed = _int(seed_raw, 0) if seed_raw not in (None, "") else None
 
     return FormData(
         architecture=architecture,
@@ -71,68 +170,358 @@ def _get_form_data() -> FormData:
         batch_size=max(1, batch_size),
         validation_split=min(max(validation_split, 0.05), 0.4),
         train_size=train_size,
+        seed=seed,
+        patience=max(0, _int(form.get("patience"), 0)),
+        restore_best_weights=_bool(form.get("restore_best_weights")),
+        resumable=_bool(form.get("resumable")),
     )
 
 
-def _plot_history(history: TrainingResult) -> tuple[str, str]:
-    def _plot(metric: str, val_metric: str, title: str, ylabel: str) -> str:
-        fig, ax = plt.subplots(figsize=(5, 3))
-        ax.plot(history.history.get(metric, []), label="train")
-        if val_metric in history.history:
-            ax.plot(history.history.get(val_metric, []), label="val")
-        ax.set_title(title)
-        ax.set_xlabel("Época")
-        ax.set_ylabel(ylabel)
-        ax.legend()
-        ax.grid(True)
-        fig.tight_layout()
-        buffer = io.BytesIO()
-        fig.savefig(buffer, format="png")
-        plt.close(fig)
-        buffer.seek(0)
-        return base64.b64encode(buffer.read()).decode("ascii")
-
-    acc_plot = _plot("accuracy", "val_accuracy", "Evolución de Accuracy", "Accuracy")
-    loss_plot = _plot("loss", "val_loss", "Evolución de la Pérdida", "Loss")
-    return acc_plot, loss_plot
+def _job_result(cached: CachedResult) -> Dict[str, Any]:
+    # Curves are drawn client-side from the history, so no images are rendered.
+    return {**cached.metrics, "history": cached.history}
 
 
-@app.route("/", methods=["GET", "POST"])
-def index():
-    error: str | None = None
-    view: TrainingView | None = None
-    form_data = FormData(
+def _cache_key(form_data: FormData) -> str:
+    extra: Dict[str, Any] = {}
+    stopping = form_data.early_stopping()
+    if stopping is not None:
+        extra["early_stopping"] = asdict(stopping)
+    return result_key(
+        form_data.architecture,
+        input_dim=INPUT_DIM,
+        epochs=form_data.epochs,
+        batch_size=form_data.batch_size,
+        validation_split=form_data.validation_split,
+        train_size=form_data.train_size,
+        test_size=TEST_SIZE,
+        seed=form_data.seed,
+        **extra,
+    )
+
+
+class DuplicateJobError(RuntimeError):
+    """A resumable training with the same checkpoint key is already queued or running."""
+
+
+_DUPLICATE_JOB = "Ya hay un entrenamiento reanudable con la misma configuración en curso"
+
+
+if os.name == "nt":  # pragma: no cover - exercised on Windows only
+    import msvcrt
+
+    def _lock_file(handle) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock_file(handle) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(handle) -> None:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_file(handle) -> None:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _checkpoint_lock(key: str) -> Iterator[None]:
+    """Hold an exclusive lock on ``CHECKPOINT_DIR/<key>.lock`` across processes.
+
+    The operating system releases it if the process dies, so a crashed worker
+    never leaves a stale lock behind.
+    """
+
+    CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CHECKPOINT_DIR / f"{key}.lock", "a+") as handle:
+        try:
+            _lock_file(handle)
+        except OSError:
+            raise DuplicateJobError(_DUPLICATE_JOB) from None
+        try:
+            yield
+        finally:
+            _unlock_file(handle)
+
+
+def _train_job(form_data: FormData, key: str) -> Callable[[Job], Dict[str, Any]]:
+    def run(job: Job) -> Dict[str, Any]:
+        if not form_data.resumable:
+            return _train(job, form_data, key, None)
+        with _checkpoint_lock(key):
+            return _train(job, form_data, key, CheckpointConfig(CHECKPOINT_DIR / key))
+
+    return run
+
+
+def _train(job: Job, form_data: FormData, key: str, checkpoint: Optional[CheckpointConfig]) -> Dict[str, Any]:
+    result = build_and_train(
+        form_data.architecture,
+        input_dim=INPUT_DIM,
+        epochs=form_data.epochs,
+        batch_size=form_data.batch_size,
+        validation_split=form_data.validation_split,
+        limit_train=form_data.train_size,
+        limit_test=TEST_SIZE,
+        verbose=0,
+        callbacks=[
+            stop_training_callback(lambda: job.cancel_requested),
+            progress_callback(job.publish),
+        ],
+        seed=form_data.seed,
+        checkpoint=checkpoint,
+        early_stopping=form_data.early_stopping(),
+        data=_training_data(),
+    )
+    if job.cancel_requested:
+        raise JobCancelled()
+    if checkpoint is not None:
+        shutil.rmtree(checkpoint.directory, ignore_errors=True)
+    cached = CachedResult(
+        metrics={
+            "test_accuracy": result.test_accuracy,
+            "test_loss": result.test_loss,
+            "epochs_completed": result.epochs_completed,
+            "resumed_from_epoch": result.initial_epoch,
+            "stopped_early": result.stopped_early,
+            "best_epoch": result.best_epoch,
+        },
+        history=result.history,
+    )
+    models.register(job.id, result.model)
+    cacheable = is_cacheable(form_data.seed)
+    if cacheable or MODELS_DIR is not None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            exported = Path(tmp_dir) / _MODEL_ARTIFACT
+            export_keras(result.model, exported)
+            if cacheable:
+                results.put(key, cached.metrics, cached.history, {_MODEL_ARTIFACT: exported.read_bytes()})
+            if MODELS_DIR is not None:
+                MODELS_DIR.mkdir(parents=True, exist_ok=True)
+                tmp = MODELS_DIR / f".{job.id}.mlpc"
+                shutil.copyfile(exported, tmp)
+                os.replace(tmp, MODELS_DIR / f"{job.id}.mlpc")
+    return {**_job_result(cached), "model": job.id}
+
+
+def _check_cost(form_data: FormData) -> None:
+    enforce_budget(
+        analyze_architecture(form_data.architecture, INPUT_DIM),
+        budget,
+        batch_size=form_data.batch_size,
+        mode=BUDGET_MODE,
+        warn=app.logger.warning,
+    )
+
+
+def _release_resumable(key: str) -> None:
+    with _resumable_lock:
+        _resumable_keys.discard(key)
+
+
+def _submit(form_data: FormData) -> Job:
+    """Serve cache hits as already finished jobs; queue a training otherwise.
+
+    Raises :class:`ArchitectureError` (or its subclass
+    :class:`BudgetExceededError`) before queuing anything, and
+    :class:`DuplicateJobError` for a resumable job whose key is already taken.
+    """
+
+    validate_architecture(form_data.architecture, INPUT_DIM, backend="keras")
+    _check_cost(form_data)
+    key = _cache_key(form_data)
+    cached = results.get(key, load_artifacts=False) if is_cacheable(form_data.seed) else None
+    if cached is not None:
+        result = _job_result(cached)
+        if results.artifact_path(key, _MODEL_ARTIFACT) is not None:
+            result["model"] = key
+        return jobs.add_completed(result)
+    if not form_data.resumable:
+        return jobs.submit(_train_job(form_data, key))
+    with _resumable_lock:
+        if key in _resumable_keys:
+            raise DuplicateJobError(_DUPLICATE_JOB)
+        _resumable_keys.add(key)
+    try:
+        job = jobs.submit(_train_job(form_data, key))
+    except BaseException:
+        _release_resumable(key)
+        raise
+    # Also released when the job is cancelled before it starts.
+    job.future.add_done_callback(lambda _: _release_resumable(key))
+    return job
+
+
+def _default_form_data() -> FormData:
+    return FormData(
         architecture=DEFAULT_ARCHITECTURE,
         epochs=3,
         batch_size=128,
         validation_split=0.1,
         train_size=5000,
+        seed=0,
     )
 
+
+@app.route("/", methods=["GET", "POST"])
+def index():
+    error: str | None = None
+    form_data = _default_form_data()
+    job_id: str | None = request.args.get("job")
+
     if request.method == "POST":
-        form_data = _get_form_data()
+        form_data = _get_form_data(request.form)
         try:
-            result = build_and_train(
-                form_data.architecture,
-                input_dim=784,
-                epochs=form_data.epochs,
-                batch_size=form_data.batch_size,
-                validation_split=form_data.validation_split,
-                limit_train=form_data.train_size,
-                limit_test=1000,
-                verbose=0,
-            )
-            acc_plot, loss_plot = _plot_history(result)
-            view = TrainingView(
-                accuracy_plot=acc_plot,
-                loss_plot=loss_plot,
-                test_accuracy=result.test_accuracy,
-                test_loss=result.test_loss,
-            )
-        except Exception as exc:  # pragma: no cover - web runtime
+            job_id = _submit(form_data).id
+        except (ArchitectureError, DuplicateJobError, QueueFullError) as exc:
             error = str(exc)
 
-    return render_template("index.html", form_data=form_data, view=view, error=error)
+    return render_template("index.html", form_data=form_data, job_id=job_id, error=error)
+
+
+@app.post("/jobs")
+def submit_job():
+    payload = request.get_json(silent=True) or request.form
+    try:
+        job = _submit(_get_form_data(payload))
+    except ArchitectureError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except DuplicateJobError as exc:
+        return jsonify({"error": str(exc)}), 409
+    except QueueFullError as exc:
+        return jsonify({"error": str(exc)}), 503
+    return jsonify(job.to_dict()), 202
+
+
+@app.get("/jobs/<job_id>")
+def job_status(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Trabajo no encontrado"}), 404
+    return jsonify(job.to_dict())
+
+
+@app.get("/jobs/<job_id>/result")
+def job_result(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Trabajo no encontrado"}), 404
+    if job.status != DONE:
+        return jsonify(job.to_dict()), 409
+    return jsonify({**job.to_dict(), **job.result})
+
+
+def _sse(job: Job, since: int) -> Iterator[str]:
+    index = since
+    while True:
+        events = job.wait_events(index, timeout=15.0)
+        if not events:
+            if job.finished:
+                return
+            yield ": keep-alive\n\n"
+            continue
+        for event in events:
+            index += 1
+            yield f"id: {index}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        if job.finished and index >= len(job.events):
+            return
+
+
+@app.get("/jobs/<job_id>/events")
+def job_events(job_id: str):
+    """Stream the job's progress events as Server-Sent Events."""
+
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Trabajo no encontrado"}), 404
+    try:
+        since = int(request.headers.get("Last-Event-ID", "0"))
+    except ValueError:
+        since = 0
+    return Response(
+        stream_with_context(_sse(job, since)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/jobs/<job_id>/cancel", methods=["POST"])
+@app.route("/jobs/<job_id>", methods=["DELETE"])
+def cancel_job(job_id: str):
+    if not jobs.cancel(job_id):
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "Trabajo no encontrado"}), 404
+        return jsonify(job.to_dict()), 409
+    return jsonify(jobs.get(job_id).to_dict()), 202
+
+
+def _get_model(name: str):
+    batcher = models.get(name)
+    if batcher is None and MODELS_DIR is not None and _MODEL_NAME.match(name):
+        path = MODELS_DIR / f"{name}.mlpc"
+        if path.is_file():
+            batcher = models.register(name, load_mlp(path))
+    if batcher is None and _RESULT_KEY.match(name):
+        path = results.artifact_path(name, _MODEL_ARTIFACT)
+        if path is not None:
+            try:
+                batcher = models.register(name, load_mlp(path))
+            except OSError:  # evicted in between
+                return None
+    return batcher
+
+
+def _predict_rows(batcher, samples: np.ndarray) -> List[np.ndarray]:
+    return [future.result(timeout=30) for future in [batcher.submit(row) for row in samples]]
+
+
+@app.post("/predict")
+def predict():
+    """Predict with a trained model.
+
+    Expects JSON ``{"model": <job "model" field>, "input": [...]}`` for one sample or
+    ``"inputs": [[...], ...]`` for several. Every row is queued individually so
+    it can share a batch with concurrent requests.
+    """
+
+    payload = request.get_json(silent=True) or {}
+    name = str(payload.get("model", ""))
+    batcher = _get_model(name)
+    if batcher is None:
+        return jsonify({"error": "Modelo no disponible", "models": models.names()}), 404
+
+    rows = payload.get("inputs")
+    if rows is None and "input" in payload:
+        rows = [payload["input"]]
+    try:
+        samples = np.asarray(rows, dtype="float32")
+    except (TypeError, ValueError):
+        samples = np.empty((0,))
+    if samples.ndim != 2 or samples.shape[1] != INPUT_DIM:
+        return jsonify({"error": f"Se esperan filas de {INPUT_DIM} valores"}), 400
+
+    try:
+        try:
+            outputs = _predict_rows(batcher, samples)
+        except BatcherClosedError:
+            # The model was evicted (or replaced) after we fetched its batcher.
+            batcher = _get_model(name)
+            if batcher is None:
+                return jsonify({"error": "Modelo no disponible", "models": models.names()}), 404
+            outputs = _predict_rows(batcher, samples)
+    except Exception as exc:  # pragma: no cover - web runtime
+        return jsonify({"error": str(exc)}), 500
+    return jsonify(
+        {
+            "outputs": [output.tolist() for output in outputs],
+            "predictions": [int(np.argmax(output)) for output in outputs],
+        }
+    )
 
 
 if __name__ == "__main__":
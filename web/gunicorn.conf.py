@@ -0,0 +1,61 @@
+"""Gunicorn settings for the production server (``python scripts/run_web.py --production``).
+
+The master imports the application and calls :func:`web.app.preload`, so
+TensorFlow and the memory-mapped MNIST arrays are loaded once and inherited by
+every forked worker. Each worker then caps TensorFlow's thread pools so that
+``workers * threads`` does not oversubscribe the CPU.
+
+Environment variables:
+
+- ``MLP_WEB_BIND`` (``127.0.0.1:8000``)
+- ``MLP_WEB_WORKERS`` (2): server processes.
+- ``MLP_WEB_HTTP_THREADS`` (8): request threads per worker; SSE streams hold one each.
+- ``MLP_WEB_TF_THREADS`` (cores / workers): TensorFlow intra-op threads per worker.
+- ``MLP_WEB_JOBS_DIR``: job spool shared by the workers (defaults to the cache directory).
+- ``MLP_WEB_MODELS_DIR``: exported models shared by the workers, so ``/predict``
+  can serve a model trained in another worker (defaults to the cache directory).
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+for path in (PROJECT_ROOT / "src", PROJECT_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from mlp_compiler.training import default_cache_dir, limit_tf_threads
+
+bind = os.environ.get("MLP_WEB_BIND", "127.0.0.1:8000")
+workers = int(os.environ.get("MLP_WEB_WORKERS", "2"))
+worker_class = "gthread"
+threads = int(os.environ.get("MLP_WEB_HTTP_THREADS", "8"))
+preload_app = True
+# gthread workers heartbeat from their main loop, so long SSE streams and
+# trainings running on background threads do not trip this timeout.
+timeout = 120
+graceful_timeout = 30
+
+tf_threads = int(os.environ.get("MLP_WEB_TF_THREADS") or max(1, (os.cpu_count() or 1) // workers))
+
+# Must be set before the application module is imported (preload_app).
+jobs_dir = Path(os.environ.setdefault("MLP_WEB_JOBS_DIR", str(default_cache_dir() / "jobs")))
+os.environ.setdefault("MLP_WEB_MODELS_DIR", str(default_cache_dir() / "models"))
+
+
+def on_starting(server) -> None:
+    # Jobs of a previous run belong to processes that no longer exist.
+    shutil.rmtree(jobs_dir, ignore_errors=True)
+    jobs_dir.mkdir(parents=True, exist_ok=True)
+
+    from web import app as web_app
+
+    web_app.preload()
+    server.log.info("TensorFlow y MNIST precargados en el proceso maestro")
+
+
+def post_fork(server, worker) -> None:
+    limit_tf_threads(tf_threads, 1)